@@ -0,0 +1,114 @@
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Add src to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from ecy.net import http_pool
+
+
+class KeepAliveHandler(BaseHTTPRequestHandler):
+    """Tiny HTTP/1.1 endpoint standing in for Ollama / OpenRouter."""
+    protocol_version = "HTTP/1.1"
+    # Headers and body are separate writes; without this, Nagle + delayed ACK
+    # add ~40 ms to every request on a kept-alive connection.
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        body = json.dumps({"message": {"content": "ok"}}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def start_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), KeepAliveHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/"
+
+
+def timed(fn, n):
+    times = []
+    for _ in range(n):
+        start = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - start) * 1000)
+    return times
+
+
+async def timed_async(fn, n):
+    times = []
+    for _ in range(n):
+        start = time.perf_counter()
+        await fn()
+        times.append((time.perf_counter() - start) * 1000)
+    return times
+
+
+def report(label, times):
+    times = sorted(times)
+    p95 = times[int(len(times) * 0.95) - 1]
+    print(f"{label:<34} mean {statistics.mean(times):7.3f} ms   p95 {p95:7.3f} ms")
+
+
+def bench_sync(url, n):
+    import requests
+    report("requests.get (new connection)", timed(lambda: requests.get(url).content, n))
+    session = http_pool.sync_session()
+    session.get(url).content  # Warm the pool
+    report("http_pool.sync_session()", timed(lambda: session.get(url).content, n))
+
+
+async def bench_async(url, n):
+    import aiohttp
+
+    async def fresh():
+        async with aiohttp.ClientSession() as session:
+            async with session.get(url) as response:
+                await response.read()
+
+    async def pooled():
+        session = await http_pool.async_session()
+        async with session.get(url) as response:
+            await response.read()
+
+    report("aiohttp (session per request)", await timed_async(fresh, n))
+    await pooled()  # Warm the pool
+    report("http_pool.async_session()", await timed_async(pooled, n))
+    await http_pool.close_async_session()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Request latency with and without the shared HTTP pool")
+    parser.add_argument("--url", help="Endpoint to hit (default: a local keep-alive test server)")
+    parser.add_argument("-n", type=int, default=500, help="Requests per variant")
+    args = parser.parse_args()
+
+    server = None
+    url = args.url
+    if not url:
+        server, url = start_server()
+    print(f"--- HTTP pool benchmark: {args.n} sequential GETs to {url} ---")
+    try:
+        bench_sync(url, args.n)
+        asyncio.run(bench_async(url, args.n))
+    finally:
+        http_pool.close_sync_session()
+        if server:
+            server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,7 @@
 
 import sys
 import os
+import asyncio
 
 # Add src to path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
@@ -20,7 +21,7 @@ def main():
     print("\n[2] Testing Council of Wisdom (DebateCoordinator)...")
     coordinator = DebateCoordinator(provider)
     # Using a simple query for verifying flow
-    result = coordinator.conduct_debate("What is 12 * 12?", max_turns=1)
+    result = asyncio.run(coordinator.conduct_debate("What is 12 * 12?", max_turns=1))
     print(f"Final Judgment: {result['final_answer']}")
     print(f"Turns: {len(result['history'])}")
     
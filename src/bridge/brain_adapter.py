@@ -39,6 +39,16 @@ class BrainAdapter:
                 "content": content
             })
 
+    async def token_callback(self, role: str, token: str):
+        """
+        Streams tokens to the Portal as they are generated.
+        """
+        await self.manager.broadcast({
+            "type": "token",
+            "token": token,
+            "agent": role
+        })
+
     async def process_prompt(self, prompt: str):
         """
         Triggers the debate with the given prompt.
@@ -51,7 +61,8 @@ class BrainAdapter:
         result = await self.coordinator.conduct_debate(
             query=prompt,
             max_turns=2, # Shorter for demo
-            callback=self.logger_callback
+            callback=self.logger_callback,
+            token_callback=self.token_callback
         )
         
         await self.manager.broadcast({
@@ -1,15 +1,15 @@
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect, BackgroundTasks, UploadFile, File
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
-import asyncio
 import json
-import random
 import sys
 import os
 
 # Ensure src modules are found
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../')))
 from src.bridge.brain_adapter import BrainAdapter
+from src.ecy.net.broadcast import ConnectionManager
+from src.ecy.net.telemetry import TelemetryPublisher
 from src.ecy.vision.vision_adapter import VisionAdapter
 
 app = FastAPI()
@@ -23,26 +23,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-class ConnectionManager:
-    def __init__(self):
-        self.active_connections: list[WebSocket] = []
-
-    async def connect(self, websocket: WebSocket):
-        await websocket.accept()
-        self.active_connections.append(websocket)
-
-    def disconnect(self, websocket: WebSocket):
-        self.active_connections.remove(websocket)
-
-    async def broadcast(self, message: dict):
-        for connection in self.active_connections:
-            try:
-                await connection.send_json(message)
-            except Exception:
-                pass
-
-manager = ConnectionManager()
+manager = ConnectionManager(name="Bridge")
 adapter = BrainAdapter(manager)
+telemetry = TelemetryPublisher(manager, packet_type="telemetry")
 vision = VisionAdapter()
 
 class PromptRequest(BaseModel):
@@ -59,6 +42,7 @@ def ping():
 @app.websocket("/ws/brain")
 async def websocket_endpoint(websocket: WebSocket):
     await manager.connect(websocket)
+    await telemetry.welcome(websocket)
     try:
         await manager.broadcast({
             "type": "log", 
@@ -66,6 +50,10 @@ async def websocket_endpoint(websocket: WebSocket):
         })
         while True:
             data = await websocket.receive_text()
+            try:
+                await manager.handle_control(websocket, json.loads(data))
+            except (json.JSONDecodeError, AttributeError):
+                pass
     except WebSocketDisconnect:
         manager.disconnect(websocket)
 
@@ -107,21 +95,14 @@ async def trigger_vision(background_tasks: BackgroundTasks, file: UploadFile = F
     background_tasks.add_task(process_visual_input, file_bytes, file.filename)
     return {"status": "accepted", "message": "Vision processing started."}
 
-# Real System Telemetry Loop
-async def telemetry_loop():
-    while True:
-        await asyncio.sleep(5)
-        # In a real system, we'd read `psutil` here
-        await manager.broadcast({
-            "type": "telemetry",
-            "cpu": random.randint(15, 60), # fluctuating stats
-            "memory": "14.4GB",
-            "agents": 3 # Proposer, Critic, Judge
-        })
-
 @app.on_event("startup")
 async def startup_event():
-    asyncio.create_task(telemetry_loop())
+    # Real psutil telemetry from the sampler shared with the Neural Link
+    telemetry.start()
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    telemetry.stop()
 
 if __name__ == "__main__":
     import uvicorn
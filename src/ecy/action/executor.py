@@ -4,11 +4,11 @@ import shutil
 import tempfile
 import ast
 import logging
-import requests
 import json
 import subprocess
 from typing import Optional, Any
 from .tools import ToolCall
+from ..net.event_bus import publish_thought
 
 # Setup Logging
 logging.basicConfig(level=logging.INFO, format='[Executor] %(message)s')
@@ -18,17 +18,10 @@ class Executor:
     The 'Hands' of eCy OS.
     Responsible for executing file system modifications and terminal commands safely.
     """
-    def __init__(self):
-        self.brain_ws_url = "http://localhost:8000/api/inject_thought"
-        
     def broadcast_action(self, action_desc: str):
         """Broadcasts an ACTION thought to the Neural Link."""
-        try:
-            requests.post(self.brain_ws_url, json={
-                "agent": "Executor",
-                "content": f"[ACTION] {action_desc}"
-            }, timeout=0.1)
-        except: pass
+        # Non-blocking: the event bus delivers it in the background
+        publish_thought("Executor", f"[ACTION] {action_desc}")
 
     async def execute_tool(self, tool_call: ToolCall) -> str:
         """
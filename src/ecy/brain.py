@@ -13,11 +13,13 @@ It acts as the single entry point for complex reasoning tasks.
 from __future__ import annotations
 
 import logging
+import os
 from typing import Optional, Dict, Any, List
 
 # Core Modules
 from .quantum.core import QuantumCore
 from .memory.graph_rag import GraphRAG
+from .memory.retention import RetentionPolicy
 from .senses.bci import BCI
 # from .memory.healer import Healer  # Assuming Healer is ready or will be integrated
 
@@ -28,7 +30,7 @@ logger = logging.getLogger("Brain")
 class Brain:
     """The central nervous system of eCy OS."""
 
-    def __init__(self, quantum_qubits: int = 2):
+    def __init__(self, quantum_qubits: int = 2, memory_path: Optional[str] = None):
         logger.info("Initializing eCy OS Brain...")
         
         # 1. Quantum Cortex
@@ -41,8 +43,17 @@ class Brain:
 
         # 2. Graph Memory (LGM)
         try:
-            self.memory = GraphRAG()
-            logger.info("Graph Memory: ONLINE")
+            # Persistent when a store path is configured, in-memory otherwise;
+            # IVF search takes over once the store outgrows an exact scan, and
+            # repeated thoughts refresh an existing memory instead of adding one
+            memory_path = memory_path or os.environ.get("ECY_MEMORY_PATH")
+            # Bounded so a long-running daemon keeps predictable memory and latency
+            retention = RetentionPolicy(
+                max_rows=int(os.environ.get("ECY_MEMORY_MAX_ROWS", "1000000")),
+                ttl_seconds=float(os.environ["ECY_MEMORY_TTL"]) if "ECY_MEMORY_TTL" in os.environ else None,
+            )
+            self.memory = GraphRAG(path=memory_path, index="ivf", dedupe="near", retention=retention)
+            logger.info(f"Graph Memory: ONLINE ({len(self.memory)} memories)")
         except Exception as e:
             logger.error(f"Graph Memory: FAILED ({e})")
             self.memory = None
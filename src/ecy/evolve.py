@@ -3,7 +3,7 @@ import ast
 import difflib
 import time
 import shutil
-from typing import List, Dict, Optional, Tuple
+from typing import Any, List, Dict, Optional, Tuple
 from ecy.intelligence.unified_provider import UnifiedIntelligenceProvider
 
 class SelfEvolutionEngine:
@@ -84,8 +84,9 @@ class SelfEvolutionEngine:
         
         # Use a "coding" model if available, otherwise default
         refactored_code = self.brain.chat_complete(
-            model="openai/gpt-4o", 
-            messages=[{"role": "user", "content": prompt}]
+            model_alias="openai/gpt-4o",
+            messages=[{"role": "user", "content": prompt}],
+            temperature=0  # Deterministic refactor: unchanged code hits the response cache
         )
         
         # Strip potential markdown if the model ignores checking
@@ -0,0 +1,29 @@
+# src/ecy/hashing.py
+"""Process‑stable content addressing for eCy OS.
+
+Python's built‑in ``hash()`` is salted per process (``PYTHONHASHSEED``), so
+anything derived from it – pseudo‑embeddings, record IDs – differs between
+workers and across restarts. Every content‑addressed key in the system is
+derived from a BLAKE2b digest of the UTF‑8 text instead, so the same text
+maps to the same key everywhere.
+"""
+
+import hashlib
+
+#: Digest size in bytes of :func:`content_key` (128 bits).
+KEY_DIGEST_SIZE = 16
+
+
+def content_digest(text: str, digest_size: int = KEY_DIGEST_SIZE) -> bytes:
+    """Raw BLAKE2b digest of *text*."""
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=digest_size).digest()
+
+
+def content_key(text: str, digest_size: int = KEY_DIGEST_SIZE) -> str:
+    """Stable hex key for *text*, identical across processes and restarts."""
+    return content_digest(text, digest_size).hex()
+
+
+def content_seed(text: str) -> int:
+    """Stable unsigned 64‑bit integer derived from *text* (e.g. an RNG seed)."""
+    return int.from_bytes(content_digest(text, 8), "little")
@@ -1,12 +1,34 @@
+from typing import Dict, List, Optional
 from .unified_provider import UnifiedIntelligenceProvider
 from .model_router import ModelRouter
 from ..action.executor import Executor
 from ..action.tools import ToolCall
-import hashlib
+from ..hashing import content_key
+from .history import compact_history, count_message_tokens, count_tokens
+import asyncio
+import difflib
 import uuid
 import json
 import re
 
+# Structured signal a Critic emits when the solution needs no more work
+NO_OBJECTIONS = "NO FURTHER OBJECTIONS"
+
+
+def solution_similarity(a: str, b: str) -> float:
+    """Token-level similarity (0..1) between two successive solutions."""
+    return difflib.SequenceMatcher(None, a.split(), b.split(), autojunk=False).ratio()
+
+
+def has_no_objections(critique: str) -> bool:
+    """True only if the whole reply is the token; a critique that merely mentions it is a real critique."""
+    return critique.strip().strip("*`'\"").strip().upper().rstrip(".!") == NO_OBJECTIONS
+
+
+def is_error_reply(reply: str) -> bool:
+    """True for the "[Error] ..." placeholder a provider returns instead of a model's answer."""
+    return reply.lstrip().startswith("[Error]")
+
 class DebateCoordinator:
     """
     Orchestrates a Multi-Agent Debate (MAD) to find the 'Ultimate Truth'.
@@ -26,15 +48,81 @@ class DebateCoordinator:
         self.critic_model = self.router.get_model_for_role("Critic")
         self.judge_model = self.router.get_model_for_role("Judge")
 
-    async def conduct_debate(self, query: str, max_turns: int = 2, callback=None) -> Dict[str, str]:
+    async def _ask(self, model: str, messages: List[Dict[str, str]], temperature: float = 0.7, on_token=None) -> str:
+        """
+        Await one completion without blocking the event loop.
+        With on_token, tokens are streamed to it (awaited) as they arrive.
+        Providers lacking an async path are run on a worker thread.
+        """
+        if on_token is not None and hasattr(self.provider, "stream_complete_async"):
+            parts = []
+            async for token in self.provider.stream_complete_async(model, messages, temperature):
+                parts.append(token)
+                await on_token(token)
+            return "".join(parts)
+        if hasattr(self.provider, "chat_complete_async"):
+            return await self.provider.chat_complete_async(model, messages, temperature)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.provider.chat_complete, model, messages, temperature)
+
+    async def _ask_within(self, model: str, messages: List[Dict[str, str]], timeout: Optional[float], on_token=None) -> Optional[str]:
+        """
+        Like _ask(), but gives up after `timeout` seconds (None = wait forever).
+        Returns None when the model is too slow or the call fails.
+        """
+        try:
+            return await asyncio.wait_for(self._ask(model, messages, on_token=on_token), timeout)
+        except asyncio.TimeoutError:
+            print(f"[Debate] {model} missed its {timeout}s deadline; dropped.")
+        except Exception as e:
+            print(f"[Debate] {model} failed: {e}")
+        return None
+
+    async def conduct_debate(
+        self,
+        query: str,
+        max_turns: int = 2,
+        callback=None,
+        num_candidates: int = 1,
+        num_critics: int = 1,
+        critic_timeout: Optional[float] = None,
+        convergence_threshold: Optional[float] = 0.95,
+        token_callback=None,
+    ) -> Dict[str, str]:
         """
         Run the debate loop with streaming callbacks.
         callback(agent_name, content)
+        num_candidates > 1 drafts that many independent proposals concurrently;
+        the first critique weighs them all and the refinement merges the best.
+        num_critics > 1 fans each critique out to that many different models in
+        parallel and merges their findings before a single refinement. Critics
+        that miss `critic_timeout` seconds are dropped from the round.
+        The loop stops early once every critic replies NO FURTHER OBJECTIONS or
+        a refinement is at least `convergence_threshold` similar to the
+        solution it replaced (None disables the similarity check).
+        token_callback(agent_name, token), if given, receives every token as
+        it is generated, long before the finished thought reaches callback.
         """
         history = []
         
-        async def log_thought(role, content):
-            entry = {"role": role, "content": content}
+        # Prompt size of every LLM call, so compaction savings are visible
+        prompt_tokens = []
+
+        def measured(stage, messages):
+            prompt_tokens.append({"stage": stage, "tokens": count_message_tokens(messages)})
+            return messages
+        
+        def streamer(agent):
+            # Token sink bound to one agent label (None disables streaming)
+            if token_callback is None:
+                return None
+            async def on_token(token):
+                await token_callback(agent, token)
+            return on_token
+
+        async def log_thought(role, content, kind="message"):
+            # kind="status" marks progress notices that carry no argument
+            entry = {"role": role, "content": content, "kind": kind}
             history.append(entry)
             if callback:
                 await callback(role, content)
@@ -49,7 +137,8 @@ class DebateCoordinator:
         CRITIC_SYS = """You are the CRITIC (Harsh Skeptic). 
         Your goal: Tear down the Proposer's solution. Find logical fallacies, security risks, and missing edge cases.
         Style: Ruthless, direct, and analytical. Do not be polite. Focus on failure modes.
-        Output: Bulleted list of flaws."""
+        Output: Bulleted list of flaws.
+        If no substantive flaws remain, reply with exactly: NO FURTHER OBJECTIONS"""
 
         JUDGE_SYS = """You are the JUDGE (Council Chair). 
         Your goal: Synthesize the 'Ultimate Truth' from the Proposal and Critique. 
@@ -59,59 +148,98 @@ class DebateCoordinator:
 
         # 1. Proposal
         await log_thought("System", f"Initiating Council of Wisdom for: {query}")
-        await log_thought("Proposer", f"Generating initial hypothesis using {self.proposer_model}...")
+        await log_thought("Proposer", f"Generating initial hypothesis using {self.proposer_model}...", kind="status")
         
-        proposal = self.provider.chat_complete(
-            self.proposer_model, 
-            [
-                {"role": "system", "content": PROPOSER_SYS},
-                {"role": "user", "content": f"Query: {query}\nPropose a detailed solution."}
-            ]
-        )
+        proposal_messages = [
+            {"role": "system", "content": PROPOSER_SYS},
+            {"role": "user", "content": f"Query: {query}\nPropose a detailed solution."}
+        ]
+        # Candidates are independent, so they are drafted concurrently
+        proposals = await asyncio.gather(*[
+            self._ask(self.proposer_model, measured("Proposer", proposal_messages),
+                      on_token=streamer("Proposer" if num_candidates <= 1 else f"Proposer #{n}"))
+            for n in range(1, max(1, num_candidates) + 1)
+        ])
+        if len(proposals) == 1:
+            proposal = proposals[0]
+        else:
+            proposal = "\n\n".join(f"Candidate {n}:\n{p}" for n, p in enumerate(proposals, 1))
         await log_thought("Proposer", proposal)
         current_solution = proposal
+        critic_models = self.router.get_models_for_role("Critic", num_critics) if num_critics > 1 else [self.critic_model]
         
         # 2. Debate Loop
+        rounds_completed = 0
         for i in range(max_turns):
+            rounds_completed = i + 1
             await log_thought("System", f"--- Council Session {i+1} ---")
             
-            # Critic
-            await log_thought("Critic", f"Analyzing solution for flaws ({self.critic_model})...")
-            critique = self.provider.chat_complete(
-                self.critic_model,
-                [
-                    {"role": "system", "content": CRITIC_SYS},
-                    {"role": "user", "content": f"Original Query: {query}\nCurrent Solution: {current_solution}\nCritique this solution."}
-                ]
-            )
+            # Critic panel (one model per critic, queried in parallel)
+            await log_thought("Critic", f"Analyzing solution for flaws ({', '.join(critic_models)})...", kind="status")
+            critic_messages = [
+                {"role": "system", "content": CRITIC_SYS},
+                {"role": "user", "content": f"Original Query: {query}\nCurrent Solution: {current_solution}\nCritique this solution."}
+            ]
+            replies = await asyncio.gather(*[
+                self._ask_within(model, measured("Critic", critic_messages), critic_timeout,
+                                 on_token=streamer("Critic" if len(critic_models) == 1 else f"Critic ({model})"))
+                for model in critic_models
+            ])
+            critiques = []
+            for model, reply in zip(critic_models, replies):
+                if reply is not None and is_error_reply(reply):
+                    # A failed call is not a critique: keep it out of the merge and the convergence vote
+                    print(f"[Debate] {model} failed: {reply[:80]}; dropped.")
+                elif reply is not None:
+                    critiques.append((model, reply))
+            if not critiques:
+                await log_thought("System", "No critic answered; keeping the current solution.")
+                continue
+            if len(critic_models) == 1:
+                critique = critiques[0][1]
+            else:
+                critique = "\n\n".join(f"[{model}]\n{reply}" for model, reply in critiques)
             await log_thought("Critic", critique)
+            if all(has_no_objections(reply) for _, reply in critiques):
+                await log_thought("System", "Critics raise no further objections; debate converged.")
+                break
             
             # Proposer Refinement
-            await log_thought("Proposer", f"Refining solution based on critique...")
-            refinement = self.provider.chat_complete(
+            await log_thought("Proposer", f"Refining solution based on critique...", kind="status")
+            refinement = await self._ask(
                 self.proposer_model,
-                [
+                measured("Proposer", [
                     {"role": "system", "content": PROPOSER_SYS},
                     {"role": "user", "content": f"Original Query: {query}\nPrevious Solution: {current_solution}\nCritique: {critique}\nRefine your solution based on this critique."}
-                ]
+                ]),
+                on_token=streamer("Proposer")
             )
             await log_thought("Proposer", refinement)
+            similarity = solution_similarity(current_solution, refinement)
             current_solution = refinement
+            if convergence_threshold is not None and similarity >= convergence_threshold:
+                await log_thought("System", f"Solution stable (similarity {similarity:.2f}); debate converged.")
+                break
 
         # 3. Final Judgment
-        await log_thought("Judge", f"Synthesizing final truth ({self.judge_model})...")
-        verdict = self.provider.chat_complete(
+        await log_thought("Judge", f"Synthesizing final truth ({self.judge_model})...", kind="status")
+        # Rolling summary + last exchanges instead of the raw log
+        compacted = compact_history(history)
+        history_tokens = {"raw": count_tokens(str(history)), "compacted": count_tokens(compacted)}
+        print(f"[Debate] Judge history: {history_tokens['raw']} -> {history_tokens['compacted']} tokens")
+        verdict = await self._ask(
             self.judge_model,
-            [
+            measured("Judge", [
                 {"role": "system", "content": JUDGE_SYS},
-                {"role": "user", "content": f"Query: {query}\nFinal Proposal: {current_solution}\nCritique History: {history}\nProvide the absolute truth."}
-            ]
+                {"role": "user", "content": f"Query: {query}\nFinal Proposal: {current_solution}\nCritique History:\n{compacted}\nProvide the absolute truth."}
+            ]),
+            on_token=streamer("Judge")
         )
         # Store the final verdict in vector memory for future recall
         if hasattr(self.provider, "vector_memory"):
             try:
-                # Simple deterministic ID based on query hash
-                mem_id = hashlib.sha256(query.encode()).hexdigest()
+                # Stable content-addressed ID: the same query maps to the same record everywhere
+                mem_id = content_key(query)
                 # Placeholder embedding (zeros) – in real use, generate via embedding model
                 dummy_embedding = [0.0] * 1536
                 self.provider.vector_memory.upsert(
@@ -149,5 +277,9 @@ class DebateCoordinator:
         return {
             "query": query,
             "final_answer": verdict,
-            "history": history
+            "history": history,
+            "rounds_completed": rounds_completed,
+            "rounds_saved": max_turns - rounds_completed,
+            "prompt_tokens": prompt_tokens,
+            "history_tokens": history_tokens
         }
@@ -0,0 +1,88 @@
+import math
+import re
+from typing import Dict, List
+
+# tiktoken gives exact counts for OpenAI-family models; fall back to a heuristic
+try:
+    import tiktoken
+    _ENCODING = tiktoken.get_encoding("cl100k_base")
+except Exception:
+    _ENCODING = None
+
+# Roughly four characters per token for English prose
+CHARS_PER_TOKEN = 4
+
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+
+def count_tokens(text: str) -> int:
+    """
+    Number of tokens in `text` (exact with tiktoken, estimated otherwise).
+    """
+    if not text:
+        return 0
+    if _ENCODING is not None:
+        return len(_ENCODING.encode(text, disallowed_special=()))
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def count_message_tokens(messages: List[Dict[str, str]]) -> int:
+    """
+    Tokens in a chat prompt, including a small per-message framing overhead.
+    """
+    return sum(count_tokens(m.get("content", "")) + 4 for m in messages)
+
+
+def truncate_tokens(text: str, max_tokens: int) -> str:
+    """
+    Cut `text` down to at most `max_tokens` tokens.
+    """
+    if count_tokens(text) <= max_tokens:
+        return text
+    if _ENCODING is not None:
+        return _ENCODING.decode(_ENCODING.encode(text, disallowed_special=())[:max_tokens]) + "..."
+    return text[:max_tokens * CHARS_PER_TOKEN] + "..."
+
+
+def is_substantive(entry: Dict[str, str]) -> bool:
+    """
+    False for System chatter and progress notices; True for actual arguments.
+    """
+    return entry.get("role") != "System" and entry.get("kind", "message") == "message"
+
+
+def compact_history(
+    history: List[Dict[str, str]],
+    keep_last: int = 4,
+    recent_tokens: int = 2000,
+    summary_tokens: int = 500,
+    summary_line_tokens: int = 60,
+) -> str:
+    """
+    Render a debate history for a prompt within a bounded token budget.
+
+    Non-substantive entries are dropped. The last `keep_last` exchanges are
+    kept verbatim (trimmed to share `recent_tokens`); everything older is
+    folded into a rolling summary of one leading sentence per entry, capped
+    at `summary_tokens` with the oldest lines going first.
+    """
+    entries = [e for e in history if is_substantive(e)]
+    split = max(0, len(entries) - keep_last)
+    older, recent = entries[:split], entries[split:]
+
+    summary: List[str] = []
+    for entry in older:
+        lead = _SENTENCE_END.split(entry["content"].strip(), maxsplit=1)[0]
+        summary.append(f"- {entry['role']}: {truncate_tokens(lead, summary_line_tokens)}")
+    while summary and count_tokens("\n".join(summary)) > summary_tokens:
+        summary.pop(0)
+
+    sections = []
+    if summary:
+        sections.append("Summary of earlier rounds:\n" + "\n".join(summary))
+    if recent:
+        per_entry = max(1, recent_tokens // len(recent))
+        sections.append("Recent exchanges:\n" + "\n\n".join(
+            f"{e['role']}: {truncate_tokens(e['content'], per_entry)}" for e in recent
+        ))
+    return "\n\n".join(sections)
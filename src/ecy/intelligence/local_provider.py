@@ -1,6 +1,16 @@
+import asyncio
 import requests
 import json
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, Iterator, AsyncIterator
+from ..net.http_pool import sync_session, async_session
+from ..net.health import HealthMonitor
+
+# aiohttp powers the pooled async path; fall back to a worker thread without it
+try:
+    import aiohttp
+    HAS_AIOHTTP = True
+except ImportError:
+    HAS_AIOHTTP = False
 
 class LocalProvider:
     """
@@ -10,19 +20,24 @@ class LocalProvider:
     def __init__(self, base_url: str = "http://localhost:11434"):
         self.base_url = base_url
         self.active_model = "llama3" # Default, can be changed via pull
+        # Probed in the background; request paths only read the cached flag
+        self.health = HealthMonitor(self._probe, name="Local Cortex")
 
-    def is_alive(self) -> bool:
-        """Checks if the local Ollama server is running."""
+    def _probe(self) -> bool:
         try:
-            response = requests.get(f"{self.base_url}/")
+            response = sync_session().get(f"{self.base_url}/", timeout=1.0)
             return response.status_code == 200
-        except requests.exceptions.ConnectionError:
+        except requests.exceptions.RequestException:
             return False
 
+    def is_alive(self) -> bool:
+        """Checks if the local Ollama server is running (cached, non-blocking)."""
+        return self.health.is_healthy()
+
     def list_models(self) -> List[str]:
         """Lists available local models."""
         try:
-            response = requests.get(f"{self.base_url}/api/tags")
+            response = sync_session().get(f"{self.base_url}/api/tags")
             if response.status_code == 200:
                 data = response.json()
                 return [model['name'] for model in data.get('models', [])]
@@ -35,26 +50,119 @@ class LocalProvider:
         """
         Generates a chat completion using the local NPU.
         """
-        target_model = model or self.active_model
-        payload = {
-            "model": target_model,
-            "messages": messages,
-            "stream": False,
-            "options": {
-                "temperature": temperature
-            }
-        }
+        payload = self._chat_payload(messages, model, temperature)
         
         try:
-            response = requests.post(f"{self.base_url}/api/chat", json=payload)
+            response = sync_session().post(f"{self.base_url}/api/chat", json=payload)
+            self.health.record_success()
             if response.status_code == 200:
                 response_json = response.json()
                 return response_json.get('message', {}).get('content', '')
             else:
                 return f"[Error] Local Cortex returned status {response.status_code}: {response.text}"
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+            self.health.record_failure()
+            return f"[Error] Failed to connect to Local Cortex: {e}"
+        except Exception as e:
+            return f"[Error] Failed to connect to Local Cortex: {e}"
+
+    def _chat_payload(self, messages: List[Dict[str, str]], model: Optional[str], temperature: float, stream: bool = False) -> Dict[str, Any]:
+        return {
+            "model": model or self.active_model,
+            "messages": messages,
+            "stream": stream,
+            "options": {
+                "temperature": temperature
+            }
+        }
+
+    async def chat_complete_async(self, messages: List[Dict[str, str]], model: Optional[str] = None, temperature: float = 0.7) -> str:
+        """
+        Non-blocking chat completion over the shared keep-alive HTTP pool.
+        """
+        if not HAS_AIOHTTP:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(None, self.chat_complete, messages, model, temperature)
+
+        payload = self._chat_payload(messages, model, temperature)
+        try:
+            session = await async_session()
+            timeout = aiohttp.ClientTimeout(total=300)
+            async with session.post(f"{self.base_url}/api/chat", json=payload, timeout=timeout) as response:
+                self.health.record_success()
+                if response.status == 200:
+                    response_json = await response.json()
+                    return response_json.get('message', {}).get('content', '')
+                return f"[Error] Local Cortex returned status {response.status}: {await response.text()}"
+        except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+            self.health.record_failure()
+            return f"[Error] Failed to connect to Local Cortex: {e}"
         except Exception as e:
             return f"[Error] Failed to connect to Local Cortex: {e}"
 
+    @staticmethod
+    def _chunk_token(line: bytes) -> tuple:
+        """(token, done) from one NDJSON line of Ollama's streaming chat API."""
+        chunk = json.loads(line)
+        return chunk.get('message', {}).get('content', ''), chunk.get('done', False)
+
+    def stream_chat(self, messages: List[Dict[str, str]], model: Optional[str] = None, temperature: float = 0.7) -> Iterator[str]:
+        """
+        Streaming chat completion: yields content tokens as the NPU produces them.
+        """
+        payload = self._chat_payload(messages, model, temperature, stream=True)
+        try:
+            with sync_session().post(f"{self.base_url}/api/chat", json=payload, stream=True) as response:
+                self.health.record_success()
+                if response.status_code != 200:
+                    yield f"[Error] Local Cortex returned status {response.status_code}: {response.text}"
+                    return
+                for line in response.iter_lines():
+                    if not line:
+                        continue
+                    token, done = self._chunk_token(line)
+                    if token:
+                        yield token
+                    if done:
+                        break
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+            self.health.record_failure()
+            yield f"[Error] Failed to connect to Local Cortex: {e}"
+        except Exception as e:
+            # Broken stream or malformed NDJSON line: end the answer, don't raise into the caller
+            yield f"[Error] Local Cortex stream failed: {e}"
+
+    async def stream_chat_async(self, messages: List[Dict[str, str]], model: Optional[str] = None, temperature: float = 0.7) -> AsyncIterator[str]:
+        """
+        Async twin of stream_chat() over the shared keep-alive HTTP pool.
+        """
+        if not HAS_AIOHTTP:
+            yield await self.chat_complete_async(messages, model, temperature)
+            return
+
+        payload = self._chat_payload(messages, model, temperature, stream=True)
+        try:
+            session = await async_session()
+            timeout = aiohttp.ClientTimeout(total=300)
+            async with session.post(f"{self.base_url}/api/chat", json=payload, timeout=timeout) as response:
+                self.health.record_success()
+                if response.status != 200:
+                    yield f"[Error] Local Cortex returned status {response.status}: {await response.text()}"
+                    return
+                async for line in response.content:
+                    if not line.strip():
+                        continue
+                    token, done = self._chunk_token(line)
+                    if token:
+                        yield token
+                    if done:
+                        break
+        except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+            self.health.record_failure()
+            yield f"[Error] Failed to connect to Local Cortex: {e}"
+        except Exception as e:
+            yield f"[Error] Local Cortex stream failed: {e}"
+
     def pull_model(self, model_name: str) -> bool:
         """
         Pulls a model from the Ollama library.
@@ -63,7 +171,7 @@ class LocalProvider:
         print(f"[Local Cortex] Pulling model {model_name}...")
         payload = {"name": model_name}
         try:
-            response = requests.post(f"{self.base_url}/api/pull", json=payload, stream=True)
+            response = sync_session().post(f"{self.base_url}/api/pull", json=payload, stream=True)
             for line in response.iter_lines():
                 if line:
                     data = json.loads(line)
@@ -82,6 +82,27 @@ class ModelRouter:
         
         return routing_table.get(role, ModelRegistry.GPT_4O)  # Default to best reasoner
 
+    def get_models_for_role(self, role: str, k: int) -> List[str]:
+        """
+        Returns up to k distinct model IDs for a role, best first.
+        Used to fan a role out across several models (e.g. a panel of Critics).
+        """
+        panels = {
+            # Diverse vendors so critics do not share the same blind spots.
+            # Cloud-only IDs: names containing llama/mistral/phi/gemma route to local Ollama.
+            "Critic": [
+                ModelRegistry.CLAUDE_3_5_SONNET,
+                ModelRegistry.GPT_4O,
+                ModelRegistry.GEMINI_1_5_PRO,
+                ModelRegistry.DEEPSEEK_V2,
+                ModelRegistry.QWEN_110B,
+                ModelRegistry.CLAUDE_3_OPUS,
+            ],
+        }
+        primary = self.get_model_for_role(role)
+        models = [primary] + [m for m in panels.get(role, []) if m != primary]
+        return models[:max(1, k)]
+
     def resolve_model_alias(self, alias: str) -> str:
         """
         Resolves short aliases (e.g., 'gpt4', 'claude') to full OpenRouter IDs.
@@ -1,10 +1,12 @@
 
 import os
+import asyncio
 import logging
 import json
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Iterator, AsyncIterator
 import aiohttp
 from dotenv import load_dotenv
+from ..net.http_pool import async_session, sync_session
 
 load_dotenv()
 
@@ -49,21 +51,103 @@ class OpenRouterClient:
         }
         
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(url, headers=self.headers, json=payload) as response:
-                    if response.status != 200:
-                        if response.status == 401:
-                            return await self._mock_response(model)
-                        error_text = await response.text()
-                        logger.error(f"OpenRouter API Error {response.status}: {error_text}")
-                        return {"error": f"API Error {response.status}", "details": error_text}
-                    
-                    return await response.json()
-                    
+            session = await async_session()
+            async with session.post(url, headers=self.headers, json=payload) as response:
+                if response.status != 200:
+                    if response.status == 401:
+                        return await self._mock_response(model)
+                    error_text = await response.text()
+                    logger.error(f"OpenRouter API Error {response.status}: {error_text}")
+                    return {"error": f"API Error {response.status}", "details": error_text}
+                
+                return await response.json()
+                
         except Exception as e:
             logger.exception("Failed to connect to OpenRouter")
             return {"error": str(e)}
 
+    @staticmethod
+    def _sse_token(line: str) -> Optional[str]:
+        """
+        Content delta carried by one Server-Sent Events line, "" for keep-alive
+        comments and empty deltas, None once the stream is finished.
+        """
+        line = line.strip()
+        if not line.startswith("data:"):
+            return ""  # Blank separator or ": OPENROUTER PROCESSING" comment
+        data = line[len("data:"):].strip()
+        if data == "[DONE]":
+            return None
+        try:
+            chunk = json.loads(data)
+        except json.JSONDecodeError:
+            return ""
+        choices = chunk.get("choices") or [{}]
+        return (choices[0].get("delta") or {}).get("content") or ""
+
+    def _stream_payload(self, messages, model, temperature, max_tokens) -> Dict[str, Any]:
+        return {
+            "model": model,
+            "messages": messages,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+            "stream": True
+        }
+
+    async def stream_chat_completion(
+        self,
+        messages: List[Dict[str, str]],
+        model: str = "openai/gpt-4o",
+        temperature: float = 0.7,
+        max_tokens: int = 1000
+    ) -> AsyncIterator[str]:
+        """
+        Stream a chat completion from OpenRouter, yielding content tokens as they arrive.
+        """
+        url = f"{self.BASE_URL}/chat/completions"
+        payload = self._stream_payload(messages, model, temperature, max_tokens)
+        try:
+            session = await async_session()
+            async with session.post(url, headers=self.headers, json=payload) as response:
+                if response.status != 200:
+                    logger.error(f"OpenRouter API Error {response.status}: {await response.text()}")
+                    return
+                async for raw in response.content:
+                    token = self._sse_token(raw.decode("utf-8", "replace"))
+                    if token is None:
+                        break
+                    if token:
+                        yield token
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            # A stalled stream times out rather than raising ClientError
+            logger.exception("Failed to stream from OpenRouter")
+
+    def stream_chat_completion_sync(
+        self,
+        messages: List[Dict[str, str]],
+        model: str = "openai/gpt-4o",
+        temperature: float = 0.7,
+        max_tokens: int = 1000
+    ) -> Iterator[str]:
+        """
+        Blocking twin of stream_chat_completion() for non-async callers.
+        """
+        url = f"{self.BASE_URL}/chat/completions"
+        payload = self._stream_payload(messages, model, temperature, max_tokens)
+        try:
+            with sync_session().post(url, headers=self.headers, json=payload, stream=True) as response:
+                if response.status_code != 200:
+                    logger.error(f"OpenRouter API Error {response.status_code}: {response.text}")
+                    return
+                for raw in response.iter_lines(decode_unicode=True):
+                    token = self._sse_token(raw or "")
+                    if token is None:
+                        break
+                    if token:
+                        yield token
+        except Exception:
+            logger.exception("Failed to stream from OpenRouter")
+
     async def _mock_response(self, model: str) -> Dict[str, Any]:
         """Generate a deterministic mock response for testing."""
         logger.warning(f"⚠️ USING MOCK RESPONSE for {model} (Auth Failed or Debug Mode)")
@@ -85,20 +169,19 @@ class OpenRouterClient:
         """
         url = f"{self.BASE_URL}/models"
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, headers=self.headers) as response:
-                    if response.status != 200:
-                         logger.error(f"Failed to fetch models: {await response.text()}")
-                         return []
-                    data = await response.json()
-                    return data.get("data", [])
+            session = await async_session()
+            async with session.get(url, headers=self.headers) as response:
+                if response.status != 200:
+                     logger.error(f"Failed to fetch models: {await response.text()}")
+                     return []
+                data = await response.json()
+                return data.get("data", [])
         except Exception as e:
             logger.error(f"Error fetching models: {e}")
             return []
 
 if __name__ == "__main__":
     # Quick Test
-    import asyncio
     async def test():
         client = OpenRouterClient()
         if not client.api_key:
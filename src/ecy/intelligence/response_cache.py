@@ -0,0 +1,145 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from ..hashing import content_key
+
+
+class ResponseCache:
+    """
+    Content-addressed cache of chat completions, keyed by
+    (model_id, messages, temperature).
+
+    Two tiers:
+    1. In-memory LRU of at most `max_entries` responses.
+    2. Optional SQLite file at `path` holding at most `max_disk_entries`,
+       shared across restarts and processes.
+
+    Entries older than `ttl_seconds` are treated as misses. Requests above
+    `max_temperature` bypass the cache, since callers asking for real
+    randomness expect a fresh answer; near-deterministic calls (the healers
+    use 0.1) are cached. The disk tier is trimmed every `trim_every` inserts.
+    """
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        max_entries: int = 1024,
+        max_disk_entries: int = 100000,
+        ttl_seconds: Optional[float] = 7 * 24 * 3600,
+        max_temperature: float = 0.2,
+        trim_every: int = 256,
+    ):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_disk_entries = max_disk_entries
+        self.ttl_seconds = ttl_seconds
+        self.max_temperature = max_temperature
+        self.trim_every = trim_every
+        self._puts_since_trim = 0
+        self._memory: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        self.hits = 0
+        self.misses = 0
+        self.bypassed = 0
+        if path:
+            try:
+                os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+                self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+                self._db.execute("PRAGMA journal_mode=WAL")
+                self._db.execute(
+                    "CREATE TABLE IF NOT EXISTS responses "
+                    "(key TEXT PRIMARY KEY, response TEXT NOT NULL, created REAL NOT NULL)"
+                )
+                self._db.execute("CREATE INDEX IF NOT EXISTS responses_created ON responses (created)")
+            except sqlite3.Error as e:
+                print(f"[Cache] Disk tier unavailable ({e}); using memory only.")
+                self._db = None
+
+    def key(self, model_id: str, messages: List[Dict[str, str]], temperature: float) -> Optional[str]:
+        """
+        Cache key for a request, or None if the request must bypass the cache.
+        """
+        if temperature > self.max_temperature:
+            self.bypassed += 1
+            return None
+        payload = json.dumps(
+            {"model": model_id, "messages": messages, "temperature": temperature},
+            sort_keys=True, ensure_ascii=False,
+        )
+        return content_key(payload)
+
+    def _fresh(self, created: float) -> bool:
+        return self.ttl_seconds is None or time.time() - created <= self.ttl_seconds
+
+    def get(self, key: Optional[str]) -> Optional[str]:
+        if key is None:
+            return None
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None and self._fresh(entry[0]):
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT created, response FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None and self._fresh(row[0]):
+                    self._remember(key, row[0], row[1])
+                    self.hits += 1
+                    return row[1]
+            self.misses += 1
+            return None
+
+    def put(self, key: Optional[str], response: str):
+        if key is None:
+            return
+        now = time.time()
+        with self._lock:
+            self._remember(key, now, response)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO responses (key, response, created) VALUES (?, ?, ?)",
+                    (key, response, now),
+                )
+                self._puts_since_trim += 1
+                if self._puts_since_trim >= self.trim_every:
+                    self._trim_disk(now)
+
+    def _remember(self, key: str, created: float, response: str):
+        self._memory[key] = (created, response)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _trim_disk(self, now: float):
+        self._puts_since_trim = 0
+        if self.ttl_seconds is not None:
+            self._db.execute("DELETE FROM responses WHERE created < ?", (now - self.ttl_seconds,))
+        (count,) = self._db.execute("SELECT COUNT(*) FROM responses").fetchone()
+        if count > self.max_disk_entries:
+            # Oldest first; trim 10% below the cap so this runs rarely
+            excess = count - int(self.max_disk_entries * 0.9)
+            self._db.execute(
+                "DELETE FROM responses WHERE key IN "
+                "(SELECT key FROM responses ORDER BY created LIMIT ?)", (excess,)
+            )
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM responses")
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "entries": len(self._memory),
+            "hits": self.hits,
+            "misses": self.misses,
+            "bypassed": self.bypassed,
+        }
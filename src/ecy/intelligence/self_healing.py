@@ -44,7 +44,8 @@ class Healer:
             [
                 {"role": "system", "content": SYSTEM_PROMPT},
                 {"role": "user", "content": USER_PROMPT}
-            ]
+            ],
+            temperature=0  # Deterministic fixes: identical errors hit the response cache
         )
         
         # Simple parsing logic (in a real system, use structured output or a parser)
@@ -0,0 +1,114 @@
+import re
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from ..memory.embeddings import Embedder, default_embedder
+
+_WS = re.compile(r"\s+")
+
+
+def normalize_query(query: str) -> str:
+    """Case/whitespace-insensitive form of a query, so trivial variants embed alike."""
+    return _WS.sub(" ", query.strip().lower())
+
+
+class SemanticCache:
+    """
+    Embedding-similarity cache over past Council verdicts.
+
+    Each archived (query, verdict) pair is embedded once; an incoming query is
+    answered from the closest past query when their cosine similarity reaches
+    `threshold`, so the Council is not convened again for a question it has
+    already settled. How well paraphrases match depends on the `embedder`: the
+    default placeholder encoder only matches queries that normalise to the same
+    text, a real sentence encoder (Embedder(encoder=...)) catches rewordings.
+    A debate whose query matches an indexed one replaces it, so lookups serve
+    the newest verdict.
+    """
+    def __init__(self, archive=None, threshold: float = 0.92, embedder: Optional[Embedder] = None, limit: int = 1000):
+        self.archive = archive
+        self.threshold = threshold
+        self.embedder = embedder or default_embedder()
+        self.limit = limit
+        self._queries: List[str] = []
+        self._verdicts: List[str] = []
+        # Preallocated, grown geometrically; only the first len(self._queries) rows are valid
+        self._matrix = np.empty((16, self.embedder.dim), dtype=np.float32)
+        self._loaded = False
+        self.hits = 0
+        self.misses = 0
+
+    def _load(self):
+        # Deferred so constructing the cache never touches the archive
+        self._loaded = True
+        if self.archive is None:
+            return
+        past = [d for d in self.archive.load_debates(self.limit) if d.get("query") and d.get("final_answer")]
+        if past:
+            self.add_many([d["query"] for d in past], [d["final_answer"] for d in past])
+
+    def __len__(self) -> int:
+        if not self._loaded:
+            self._load()
+        return len(self._queries)
+
+    def _match(self, vec: np.ndarray):
+        """(row, similarity) of the closest indexed query, or (None, 0.0) when empty."""
+        if not self._queries:
+            return None, 0.0
+        scores = self._matrix[:len(self._queries)] @ vec
+        best = int(np.argmax(scores))
+        return best, float(scores[best])
+
+    def add_many(self, queries: List[str], verdicts: List[str]):
+        """
+        Index settled debates (oldest first) so later paraphrases can reuse their verdicts.
+        A debate matching an indexed query overwrites it in place.
+        """
+        vecs = self.embedder.embed_many([normalize_query(q) for q in queries])
+        for query, verdict, vec in zip(queries, verdicts, vecs):
+            row, similarity = self._match(vec)
+            if row is None or similarity < self.threshold:
+                row = len(self._queries)
+                if row == self._matrix.shape[0]:
+                    grown = np.empty((2 * row, self._matrix.shape[1]), dtype=np.float32)
+                    grown[:row] = self._matrix
+                    self._matrix = grown
+                self._queries.append(query)
+                self._verdicts.append(verdict)
+            else:
+                # Same question settled again: the newer verdict replaces the old one
+                self._queries[row] = query
+                self._verdicts[row] = verdict
+            self._matrix[row] = vec
+
+    def add(self, query: str, verdict: str):
+        self.add_many([query], [verdict])
+
+    def lookup(self, query: str) -> Optional[Dict[str, object]]:
+        """
+        Closest past debate if it is similar enough, else None.
+        The hit carries the original query, its verdict and the similarity.
+        """
+        if not self._loaded:
+            self._load()
+        best, similarity = self._match(self.embedder.embed(normalize_query(query)))
+        if best is not None and similarity >= self.threshold:
+            self.hits += 1
+            return {
+                "query": self._queries[best],
+                "final_answer": self._verdicts[best],
+                "similarity": similarity,
+            }
+        self.misses += 1
+        return None
+
+    def stats(self) -> Dict[str, float]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._queries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
@@ -1,16 +1,16 @@
 import os
 import json
 import subprocess
-import requests
-import threading
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, Iterator, AsyncIterator, Tuple
 from .model_router import ModelRouter, ModelRegistry
 from .local_provider import LocalProvider
 from .vector_memory import VectorMemory
+from .response_cache import ResponseCache
+from ..net.event_bus import publish_thought
 
 # Try importing openai, handle if missing
 try:
-    from openai import OpenAI
+    from openai import OpenAI, AsyncOpenAI
     from openai import APIError
     HAS_OPENAI = True
 except ImportError:
@@ -29,8 +29,15 @@ class UnifiedIntelligenceProvider:
         self.api_key = api_key or os.environ.get("OPENROUTER_API_KEY") or os.environ.get("OPENAI_API_KEY")
         self.base_url = base_url
         self.client = None
+        self.async_client = None
         self.router = ModelRouter()
         self.local_brain = LocalProvider()
+        # Exact-match response cache; ECY_RESPONSE_CACHE="" keeps it in memory only
+        cache_path = os.environ.get("ECY_RESPONSE_CACHE", os.path.join(os.path.expanduser("~"), ".ecy", "response_cache.db"))
+        self.response_cache = ResponseCache(
+            path=cache_path or None,
+            max_temperature=float(os.environ.get("ECY_CACHE_MAX_TEMPERATURE", "0.2")),
+        )
         
         # Initialize Memory
         try:
@@ -53,6 +60,12 @@ class UnifiedIntelligenceProvider:
                     api_key=self.api_key,
                     default_headers=extra_headers
                 )
+                # Async twin for the event loop; keeps its own pooled connections
+                self.async_client = AsyncOpenAI(
+                    base_url=self.base_url,
+                    api_key=self.api_key,
+                    default_headers=extra_headers
+                )
                 print("[Brain] Connection established.")
             except Exception as e:
                 print(f"[Brain] Cloud connection failed: {e}")
@@ -68,52 +81,80 @@ class UnifiedIntelligenceProvider:
     def _broadcast_thought(self, agent: str, content: str):
         """
         Transmits a 'Thought Token' to the Neural Link (WebSocket).
-        Fire-and-forget to avoid blocking.
+        Queued on the event bus, which batches delivery on its own thread.
         """
-        def send():
-            try:
-                requests.post(
-                    "http://localhost:8000/api/inject_thought",
-                    json={"agent": agent, "content": content},
-                    timeout=0.2
-                )
-            except Exception: pass
-        
-        threading.Thread(target=send, daemon=True).start()
+        publish_thought(agent, content)
 
-    def chat_complete(self, model_alias: str, messages: List[Dict[str, str]], temperature: float = 0.7) -> str:
+    @staticmethod
+    def _is_local_model(model_id: str) -> bool:
+        return model_id == "local" or any(m in model_id for m in ["phi", "mistral", "llama", "gemma"])
+
+    @staticmethod
+    def _local_model_name(model_id: str) -> Optional[str]:
+        # Strip 'local/' prefix if present for clean Ollama mapping
+        return model_id.replace("local/", "") if "/" in model_id else None
+
+    def _route(self, model_alias: str, messages: List[Dict[str, str]], temperature: float,
+               cloud: Any, streaming: bool = False) -> Tuple[str, str, str, Optional[str]]:
         """
-        Send a chat completion request with Hybrid Routing.
-        Resolves aliases (e.g., 'deep_thinker') to real IDs (e.g., 'openai/gpt-4o').
+        Hybrid Routing shared by the chat/stream entry points.
+        Returns (route, model_id, cache_key, cached) where route is 'cache',
+        'local', 'cloud' (when *cloud* is a client) or 'mock'.
         """
-        # Resolve Alias
+        # Resolve Alias (e.g., 'deep_thinker' -> 'openai/gpt-4o')
         model_id = self.router.resolve_model_alias(model_alias)
-        
+
+        # Identical request answered before? Zero tokens, no round-trip.
+        cache_key = self.response_cache.key(model_id, messages, temperature)
+        cached = self.response_cache.get(cache_key)
+        if cached is not None:
+            self._broadcast_thought("System", f"[CACHE] '{model_alias}' answered from cache")
+            return "cache", model_id, cache_key, cached
+
         # Broadcast the "Thinking" state
-        last_msg = messages[-1]['content']
-        self._broadcast_thought("System", f"[THINK] Routing '{model_alias}' -> '{model_id}'")
-        
-        # --- LOCAL ROUTING ---
+        mode = " (streaming)" if streaming else ""
+        self._broadcast_thought("System", f"[THINK] Routing '{model_alias}' -> '{model_id}'{mode}")
+
         # If explicitly local or falls into local family
-        if model_id == "local" or any(m in model_id for m in ["phi", "mistral", "llama", "gemma"]):
-            # Strip 'local/' prefix if present for clean Ollama mapping
-            local_model_name = model_id.replace("local/", "") if "/" in model_id else None
-            
+        if self._is_local_model(model_id):
+            # Cached health flag: no network I/O on the request path
             if self.local_brain.is_alive():
-                print(f"[Brain] Routing to Local Cortex (Model: {model_id})...")
-                # Force low temp for code
-                final_temp = 0.1 if "code" in model_id else temperature
-                response = self.local_brain.chat_complete(messages, local_model_name, final_temp)
-                self._broadcast_thought("Local Cortex", response[:100] + "...")
-                return response
-            else:
-                print("[Brain] Local Cortex unavailable. Attempting Cloud Fallback...")
-                # Fallback to Cloud if intended model was something like 'llama-3-70b' which exists on cloud too
-                if "llama" in model_id:
-                     model_id = ModelRegistry.LLAMA_3_70B
-        
+                return "local", model_id, cache_key, None
+            print("[Brain] Local Cortex unavailable. Attempting Cloud Fallback...")
+            # Fallback to Cloud if intended model was something like 'llama-3-70b' which exists on cloud too
+            if "llama" in model_id:
+                model_id = ModelRegistry.LLAMA_3_70B
+
+        if cloud is not None:
+            return "cloud", model_id, cache_key, None
+        return "mock", model_id, cache_key, None
+
+    @staticmethod
+    def _local_temperature(model_id: str, temperature: float) -> float:
+        # Force low temp for code
+        return 0.1 if "code" in model_id else temperature
+
+    def chat_complete(self, model_alias: str, messages: List[Dict[str, str]], temperature: float = 0.7) -> str:
+        """
+        Send a chat completion request with Hybrid Routing.
+        Resolves aliases (e.g., 'deep_thinker') to real IDs (e.g., 'openai/gpt-4o').
+        """
+        route, model_id, cache_key, cached = self._route(model_alias, messages, temperature, self.client)
+        if route == "cache":
+            return cached
+
+        # --- LOCAL ROUTING ---
+        if route == "local":
+            print(f"[Brain] Routing to Local Cortex (Model: {model_id})...")
+            response = self.local_brain.chat_complete(
+                messages, self._local_model_name(model_id), self._local_temperature(model_id, temperature))
+            self._broadcast_thought("Local Cortex", response[:100] + "...")
+            if not response.startswith("[Error]"):
+                self.response_cache.put(cache_key, response)
+            return response
+
         # --- CLOUD ROUTING ---
-        if self.client:
+        if route == "cloud":
             try:
                 print(f"[Brain] Routing to Cloud Hive Mind (Model: {model_id})...")
                 response = self.client.chat.completions.create(
@@ -123,6 +164,7 @@ class UnifiedIntelligenceProvider:
                 )
                 content = response.choices[0].message.content
                 self._broadcast_thought("Hive Mind", "Response received.")
+                self.response_cache.put(cache_key, content)
                 return content
             except APIError as e:
                 print(f"[Brain] API Error: {e}")
@@ -133,6 +175,146 @@ class UnifiedIntelligenceProvider:
         print(f"[Brain] Fallback to Mock Simulation for {model_id}")
         return self._mock_response(model_id, messages)
 
+    async def chat_complete_async(self, model_alias: str, messages: List[Dict[str, str]], temperature: float = 0.7) -> str:
+        """
+        Non-blocking twin of chat_complete() for use inside the event loop.
+        Same Hybrid Routing; requests go through pooled async clients so several
+        completions can be in flight at once without stalling other tasks.
+        """
+        route, model_id, cache_key, cached = self._route(model_alias, messages, temperature, self.async_client)
+        if route == "cache":
+            return cached
+
+        # --- LOCAL ROUTING ---
+        if route == "local":
+            print(f"[Brain] Routing to Local Cortex (Model: {model_id})...")
+            response = await self.local_brain.chat_complete_async(
+                messages, self._local_model_name(model_id), self._local_temperature(model_id, temperature))
+            self._broadcast_thought("Local Cortex", response[:100] + "...")
+            if not response.startswith("[Error]"):
+                self.response_cache.put(cache_key, response)
+            return response
+
+        # --- CLOUD ROUTING ---
+        if route == "cloud":
+            try:
+                print(f"[Brain] Routing to Cloud Hive Mind (Model: {model_id})...")
+                response = await self.async_client.chat.completions.create(
+                    model=model_id,
+                    messages=messages,
+                    temperature=temperature,
+                )
+                content = response.choices[0].message.content
+                self._broadcast_thought("Hive Mind", "Response received.")
+                self.response_cache.put(cache_key, content)
+                return content
+            except APIError as e:
+                print(f"[Brain] API Error: {e}")
+            except Exception as e:
+                print(f"[Brain] Unexpected Cloud Error: {e}")
+
+        # --- MOCK / FALLBACK ---
+        print(f"[Brain] Fallback to Mock Simulation for {model_id}")
+        return self._mock_response(model_id, messages)
+
+    def stream_complete(self, model_alias: str, messages: List[Dict[str, str]], temperature: float = 0.7) -> Iterator[str]:
+        """
+        Streaming twin of chat_complete(): yields tokens as soon as the model
+        produces them. Same Hybrid Routing; the full text is cached at the end.
+        """
+        route, model_id, cache_key, cached = self._route(model_alias, messages, temperature, self.client, streaming=True)
+        if route == "cache":
+            yield cached
+            return
+
+        # --- LOCAL ROUTING ---
+        if route == "local":
+            parts = []
+            for token in self.local_brain.stream_chat(
+                    messages, self._local_model_name(model_id), self._local_temperature(model_id, temperature)):
+                parts.append(token)
+                yield token
+            # A failed stream ends with an [Error] part, possibly after some tokens
+            if parts and not parts[-1].startswith("[Error]"):
+                self.response_cache.put(cache_key, "".join(parts))
+            return
+
+        # --- CLOUD ROUTING ---
+        if route == "cloud":
+            parts = []
+            try:
+                stream = self.client.chat.completions.create(
+                    model=model_id,
+                    messages=messages,
+                    temperature=temperature,
+                    stream=True,
+                )
+                for chunk in stream:
+                    token = chunk.choices[0].delta.content if chunk.choices else None
+                    if token:
+                        parts.append(token)
+                        yield token
+                self.response_cache.put(cache_key, "".join(parts))
+                return
+            except Exception as e:
+                print(f"[Brain] Cloud stream error: {e}")
+                if parts:
+                    return  # Tokens already delivered; cannot fall back mid-answer
+
+        # --- MOCK / FALLBACK ---
+        yield self._mock_response(model_id, messages)
+
+    async def stream_complete_async(self, model_alias: str, messages: List[Dict[str, str]], temperature: float = 0.7) -> AsyncIterator[str]:
+        """
+        Async twin of stream_complete() over the pooled async clients.
+        """
+        route, model_id, cache_key, cached = self._route(model_alias, messages, temperature, self.async_client, streaming=True)
+        if route == "cache":
+            yield cached
+            return
+
+        # --- LOCAL ROUTING ---
+        if route == "local":
+            parts = []
+            async for token in self.local_brain.stream_chat_async(
+                    messages, self._local_model_name(model_id), self._local_temperature(model_id, temperature)):
+                parts.append(token)
+                yield token
+            # A failed stream ends with an [Error] part, possibly after some tokens
+            if parts and not parts[-1].startswith("[Error]"):
+                self.response_cache.put(cache_key, "".join(parts))
+            return
+
+        # --- CLOUD ROUTING ---
+        if route == "cloud":
+            parts = []
+            try:
+                stream = await self.async_client.chat.completions.create(
+                    model=model_id,
+                    messages=messages,
+                    temperature=temperature,
+                    stream=True,
+                )
+                async for chunk in stream:
+                    token = chunk.choices[0].delta.content if chunk.choices else None
+                    if token:
+                        parts.append(token)
+                        yield token
+                self.response_cache.put(cache_key, "".join(parts))
+                return
+            except Exception as e:
+                print(f"[Brain] Cloud stream error: {e}")
+                if parts:
+                    return
+
+        # --- MOCK / FALLBACK ---
+        yield self._mock_response(model_id, messages)
+
+    async def aclose(self):
+        """Release the async cloud client (the shared HTTP pool is closed by the app)."""
+        if self.async_client is not None:
+            await self.async_client.close()
+
     def _mock_response(self, model: str, messages: List[Dict[str, str]]) -> str:
         """
         Mock response for testing or when API is unavailable.
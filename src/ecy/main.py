@@ -1,5 +1,6 @@
 
 import sys
+import asyncio
 import argparse
 import os
 import subprocess
@@ -15,6 +16,8 @@ from ecy.ui.prompt import Prompt
 from ecy.session_manager import SessionManager
 from ecy.intelligence import DebateCoordinator, UnifiedIntelligenceProvider
 from ecy.memory import GalacticArchive
+from ecy.intelligence.semantic_cache import SemanticCache
+from ecy.net.http_pool import close_async_session
 
 def start_terminal(args):
     """Launch the interactive eCy Terminal."""
@@ -37,12 +40,33 @@ def run_think(args):
     print(f"[eCy] Query: {query}")
     
     # Initialize Brain & Memory
-    brain = UnifiedIntelligenceProvider()
     memory = GalacticArchive()
+
+    # Settled before? Reuse the archived verdict instead of convening the Council.
+    cache = SemanticCache(memory, threshold=args.cache_threshold)
+    if not args.no_cache:
+        hit = cache.lookup(query)
+        print(f"[eCy] Semantic cache: {cache.stats()}")
+        if hit:
+            print("\n" + "="*40)
+            print(f"FINAL ANSWER (cached, similarity {hit['similarity']:.2f} to: {hit['query']}):")
+            print(hit['final_answer'])
+            print("="*40)
+            return
+
+    brain = UnifiedIntelligenceProvider()
     council = DebateCoordinator(provider=brain)
     
     # Run Debate
-    result = council.conduct_debate(query, max_turns=args.turns)
+    async def debate():
+        try:
+            return await council.conduct_debate(query, max_turns=args.turns, num_candidates=args.candidates,
+                num_critics=args.critics, critic_timeout=args.critic_timeout)
+        finally:
+            # The pooled aiohttp session is bound to this loop; close it before asyncio.run closes the loop
+            await close_async_session()
+
+    result = asyncio.run(debate())
     
     # Store in Memory
     saved = memory.store_debate(result['query'], result['final_answer'], result['history'])
@@ -51,6 +75,8 @@ def run_think(args):
     print(f"FINAL ANSWER (Verified by {len(result['history'])} turns):")
     print(result['final_answer'])
     print("="*40)
+    if result.get('rounds_saved'):
+        print(f"[eCy] Converged after {result['rounds_completed']} round(s); {result['rounds_saved']} skipped.")
     
     if saved:
         print("[eCy] Debate archived in Galactic Memory.")
@@ -105,6 +131,11 @@ def main():
     parser_think = subparsers.add_parser("think", help="Consult the AI Council of Wisdom")
     parser_think.add_argument("query", nargs="+", help="The question to ponder")
     parser_think.add_argument("--turns", type=int, default=3, help="Number of debate turns")
+    parser_think.add_argument("--candidates", type=int, default=1, help="Independent proposals drafted in parallel")
+    parser_think.add_argument("--critics", type=int, default=1, help="Critics (distinct models) consulted in parallel per turn")
+    parser_think.add_argument("--critic-timeout", type=float, default=None, help="Seconds before a slow critic is dropped")
+    parser_think.add_argument("--no-cache", action="store_true", help="Always convene the Council, even for settled queries")
+    parser_think.add_argument("--cache-threshold", type=float, default=0.92, help="Similarity needed to reuse an archived verdict")
     parser_think.set_defaults(func=run_think)
 
     # Command: portal
@@ -0,0 +1,165 @@
+# src/ecy/memory/ann.py
+"""Approximate nearest‑neighbour search for :class:`~ecy.memory.graph_rag.GraphRAG`.
+
+Implements an inverted‑file index (IVF) with a spherical k‑means coarse
+quantiser, in plain NumPy. Every stored row is assigned to its closest
+centroid; a query scores the centroids, then scans only the ``nprobe``
+closest inverted lists instead of the whole matrix. ``nprobe`` is the
+recall/latency knob: ``nprobe == nlist`` degenerates to the exact search.
+
+Inverted lists are kept as CSR‑style arrays (``list_ptr`` / ``list_ids``) so
+probing a list is a slice, not a Python container walk. Rows ingested after
+the last (re)build sit in an unindexed tail that is scanned exactly until it
+is folded into the lists.
+"""
+
+from __future__ import annotations
+
+from typing import Optional, Tuple
+
+import numpy as np
+
+
+def top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Return indices of the *k* largest entries of *scores* (last axis), best first."""
+    k = min(k, scores.shape[-1])
+    if k <= 0:
+        return np.empty(scores.shape[:-1] + (0,), dtype=np.intp)
+    if k < scores.shape[-1]:
+        idx = np.argpartition(scores, -k, axis=-1)[..., -k:]
+    else:
+        idx = np.broadcast_to(np.arange(k), scores.shape[:-1] + (k,))
+    order = np.argsort(-np.take_along_axis(scores, idx, axis=-1), axis=-1, kind="stable")
+    return np.take_along_axis(idx, order, axis=-1)
+
+
+def spherical_kmeans(
+    data: np.ndarray, k: int, iters: int = 10, seed: int = 0
+) -> np.ndarray:
+    """Cluster L2‑normalised *data* into *k* unit‑norm centroids (cosine k‑means)."""
+    rng = np.random.default_rng(seed)
+    centroids = data[rng.choice(data.shape[0], size=k, replace=False)].astype(np.float32)
+    for _ in range(iters):
+        labels = np.argmax(data @ centroids.T, axis=1)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, labels, data)
+        norms = np.linalg.norm(sums, axis=1, keepdims=True)
+        empty = norms[:, 0] == 0
+        # Re‑seed empty clusters from random points so k stays effective
+        if empty.any():
+            sums[empty] = data[rng.choice(data.shape[0], size=int(empty.sum()))]
+            norms[empty] = 1.0
+        centroids = (sums / norms).astype(np.float32)
+    return centroids
+
+
+class IVFIndex:
+    """Inverted‑file ANN index over an externally owned embedding matrix.
+
+    The index never copies the embeddings; it stores centroids, one label
+    per row and the CSR inverted lists, and is handed the matrix on every
+    call so it works unchanged over in‑memory and memory‑mapped stores.
+
+    Parameters
+    ----------
+    nlist:
+        Number of coarse clusters. ``None`` picks ``sqrt(n)`` at train time.
+    nprobe:
+        Number of inverted lists scanned per query.
+    train_sample:
+        Maximum number of rows used to train the quantiser.
+    """
+
+    #: Fold the unindexed tail into the lists once it exceeds this fraction.
+    TAIL_FRACTION = 0.1
+    #: Retrain the quantiser once the corpus has grown by this factor.
+    RETRAIN_GROWTH = 4.0
+
+    def __init__(
+        self, nlist: Optional[int] = None, nprobe: int = 8, train_sample: int = 65536
+    ) -> None:
+        self.nlist = nlist
+        self.nprobe = nprobe
+        self.train_sample = train_sample
+        self.centroids: Optional[np.ndarray] = None
+        self.labels = np.empty(0, dtype=np.int32)
+        self.list_ptr = np.zeros(1, dtype=np.int64)
+        self.list_ids = np.empty(0, dtype=np.int64)
+        self._trained_size = 0
+
+    @property
+    def is_trained(self) -> bool:
+        return self.centroids is not None
+
+    @property
+    def indexed(self) -> int:
+        """Number of rows covered by the inverted lists."""
+        return int(self.labels.shape[0])
+
+    def reset(self) -> None:
+        """Forget the quantiser and lists (e.g. after rows were removed)."""
+        self.__init__(self.nlist, self.nprobe, self.train_sample)
+
+    def train(self, matrix: np.ndarray) -> None:
+        """Fit the coarse quantiser on *matrix* and index every row."""
+        n = matrix.shape[0]
+        nlist = self.nlist or max(1, int(np.sqrt(n)))
+        nlist = min(nlist, n)
+        rng = np.random.default_rng(n)
+        sample = matrix
+        if n > self.train_sample:
+            sample = matrix[np.sort(rng.choice(n, size=self.train_sample, replace=False))]
+        self.centroids = spherical_kmeans(np.asarray(sample, dtype=np.float32), nlist)
+        self.labels = np.empty(0, dtype=np.int32)
+        self._trained_size = n
+        self.add(matrix)
+
+    def add(self, matrix: np.ndarray, chunk: int = 65536) -> None:
+        """Assign rows ``indexed..len(matrix)`` to centroids and rebuild the lists."""
+        start = self.indexed
+        n = matrix.shape[0]
+        if start >= n:
+            return
+        new_labels = [
+            np.argmax(matrix[i : min(i + chunk, n)] @ self.centroids.T, axis=1).astype(np.int32)
+            for i in range(start, n, chunk)
+        ]
+        self.labels = np.concatenate([self.labels] + new_labels)
+        self.list_ids = np.argsort(self.labels, kind="stable").astype(np.int64)
+        counts = np.bincount(self.labels, minlength=self.centroids.shape[0])
+        self.list_ptr = np.concatenate([[0], np.cumsum(counts)]).astype(np.int64)
+
+    def sync(self, matrix: np.ndarray) -> None:
+        """Bring the index up to date with *matrix* (train, retrain or fold the tail)."""
+        n = matrix.shape[0]
+        if not self.is_trained or n >= self._trained_size * self.RETRAIN_GROWTH:
+            self.train(matrix)
+        elif n - self.indexed > max(1024, self.TAIL_FRACTION * self.indexed):
+            self.add(matrix)
+
+    def search(
+        self, matrix: np.ndarray, queries: np.ndarray, k: int, nprobe: Optional[int] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Return ``(ids, scores)`` of shape ``(len(queries), <=k)`` for each query.
+
+        Rows past :attr:`indexed` (the unindexed tail) are always scanned.
+        """
+        nprobe = min(nprobe or self.nprobe, self.centroids.shape[0])
+        n = matrix.shape[0]
+        tail = np.arange(self.indexed, n, dtype=np.int64)
+        probes = top_k(queries @ self.centroids.T, nprobe)
+        k = min(k, n)
+        ids = np.full((queries.shape[0], k), -1, dtype=np.int64)
+        scores = np.full((queries.shape[0], k), -np.inf, dtype=np.float32)
+        for qi, (q, lists) in enumerate(zip(queries, probes)):
+            cand = np.concatenate(
+                [self.list_ids[self.list_ptr[c] : self.list_ptr[c + 1]] for c in lists] + [tail]
+            )
+            if not cand.size:
+                continue
+            cand.sort()  # ascending row order keeps memmap reads sequential
+            cand_scores = matrix[cand] @ q
+            best = top_k(cand_scores, k)
+            ids[qi, : best.size] = cand[best]
+            scores[qi, : best.size] = cand_scores[best]
+        return ids, scores
@@ -0,0 +1,103 @@
+# src/ecy/memory/dedupe.py
+"""Ingest‑time duplicate detection for :class:`~ecy.memory.graph_rag.GraphRAG`.
+
+Two modes are supported:
+
+- ``"exact"`` – documents are keyed by their stable content key
+  (:func:`ecy.hashing.content_key`); only byte‑identical text collapses.
+- ``"near"``  – documents are additionally fingerprinted with a 64‑bit
+  SimHash over word shingles; two documents whose fingerprints differ in at
+  most ``max_distance`` bits are treated as the same memory. Candidates are
+  found through LSH banding (the fingerprint is split into
+  ``max_distance + 1`` bands, at least one of which must match exactly), so a
+  lookup touches a few buckets rather than every stored document.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from ..hashing import content_digest, content_key
+
+_TOKEN_RE = re.compile(r"\w+")
+_MASK64 = (1 << 64) - 1
+
+
+def simhash(text: str, shingle: int = 3) -> int:
+    """64‑bit SimHash of *text* over lower‑cased word *shingle*‑grams."""
+    tokens = _TOKEN_RE.findall(text.lower())
+    if len(tokens) >= shingle:
+        features = [" ".join(tokens[i : i + shingle]) for i in range(len(tokens) - shingle + 1)]
+    else:
+        features = [" ".join(tokens)]
+    hashes = np.array(
+        [int.from_bytes(content_digest(f, 8), "little") for f in features], dtype="<u8"
+    )
+    bits = np.unpackbits(hashes.view(np.uint8).reshape(-1, 8), axis=1, bitorder="little")
+    votes = bits.sum(axis=0, dtype=np.int64) * 2 - len(features)
+    return int(np.packbits(votes > 0, bitorder="little").view("<u8")[0])
+
+
+def hamming(a: int, b: int) -> int:
+    return bin((a ^ b) & _MASK64).count("1")
+
+
+class DuplicateIndex:
+    """Maps document content to the row that already holds it.
+
+    Parameters
+    ----------
+    mode:
+        ``"exact"`` or ``"near"`` (see module docstring).
+    max_distance:
+        Largest SimHash Hamming distance still considered a duplicate in
+        ``"near"`` mode.
+    """
+
+    def __init__(self, mode: str = "exact", max_distance: int = 3) -> None:
+        if mode not in ("exact", "near"):
+            raise ValueError(f"Unknown dedupe mode: {mode!r} (expected 'exact' or 'near').")
+        self.mode = mode
+        self.max_distance = max_distance
+        self._bands = max_distance + 1
+        self._band_bits = 64 // self._bands
+        self._exact: Dict[str, int] = {}
+        self._fingerprints: Dict[int, int] = {}
+        self._buckets: List[Dict[int, List[int]]] = [{} for _ in range(self._bands)]
+
+    def __len__(self) -> int:
+        return len(self._exact)
+
+    def reset(self) -> None:
+        self.__init__(self.mode, self.max_distance)
+
+    def _band_keys(self, fingerprint: int) -> Iterable[int]:
+        mask = (1 << self._band_bits) - 1
+        for band in range(self._bands):
+            yield (fingerprint >> (band * self._band_bits)) & mask
+
+    def find(self, text: str) -> Optional[int]:
+        """Row holding *text* (or a near duplicate of it), else ``None``."""
+        row = self._exact.get(content_key(text))
+        if row is not None or self.mode == "exact":
+            return row
+        fingerprint = simhash(text)
+        best, best_distance = None, self.max_distance + 1
+        for band, key in enumerate(self._band_keys(fingerprint)):
+            for candidate in self._buckets[band].get(key, ()):
+                distance = hamming(fingerprint, self._fingerprints[candidate])
+                if distance < best_distance:
+                    best, best_distance = candidate, distance
+        return best
+
+    def add(self, text: str, row: int) -> None:
+        """Record that *row* holds *text*."""
+        self._exact[content_key(text)] = row
+        if self.mode == "near":
+            fingerprint = simhash(text)
+            self._fingerprints[row] = fingerprint
+            for band, key in enumerate(self._band_keys(fingerprint)):
+                self._buckets[band].setdefault(key, []).append(row)
@@ -0,0 +1,180 @@
+# src/ecy/memory/embeddings.py
+"""Batched, cached text embedding for the memory subsystem.
+
+:class:`Embedder` turns lists of texts into ``(n, dim)`` ``float32`` matrices
+through a pluggable *encoder* – any callable ``List[str] -> np.ndarray`` – and
+keeps the results in a content‑hash‑keyed LRU cache, optionally spilling
+evicted vectors to disk. Repeated texts (a thought that is ingested and then
+queried, a document ingested twice) are therefore encoded once, and a real
+model can be dropped in later as a batched encoder without touching callers.
+"""
+
+from __future__ import annotations
+
+import os
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+from ..hashing import content_key, content_seed
+
+Encoder = Callable[[List[str]], np.ndarray]
+
+#: Dimensionality of the placeholder :func:`hash_encoder`.
+DEFAULT_DIM = 128
+
+
+def _pseudo_embedding(text: str, dim: int) -> np.ndarray:
+    """Deterministic pseudo‑embedding for *text* (placeholder for a real model)."""
+    # Stable content digest → float array (identical in every process)
+    rng = np.random.default_rng(content_seed(text))
+    return rng.random(dim, dtype=np.float32)
+
+
+def hash_encoder(texts: List[str], dim: int = DEFAULT_DIM) -> np.ndarray:
+    """Placeholder batched encoder: L2‑normalised pseudo‑embeddings of *texts*."""
+    out = np.empty((len(texts), dim), dtype=np.float32)
+    for i, text in enumerate(texts):
+        out[i] = _pseudo_embedding(text, dim)
+    # L2 normalise for cosine similarity
+    out /= np.linalg.norm(out, axis=1, keepdims=True) + 1e-10
+    return out
+
+
+class EmbeddingCache:
+    """LRU map from content key to embedding, with optional on‑disk spill.
+
+    At most *max_entries* vectors are held in memory. When *spill_dir* is set,
+    vectors evicted from memory are written there as ``<key>.npy`` and read
+    back (and promoted) on the next hit, so the disk tier survives restarts.
+    """
+
+    def __init__(self, max_entries: int = 10000, spill_dir: Optional[str] = None) -> None:
+        self.max_entries = max_entries
+        self.spill_dir = spill_dir
+        self._entries: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        if spill_dir:
+            os.makedirs(spill_dir, exist_ok=True)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _spill_path(self, key: str) -> str:
+        return os.path.join(self.spill_dir, f"{key}.npy")
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        vec = self._entries.get(key)
+        if vec is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return vec
+        if self.spill_dir and os.path.exists(self._spill_path(key)):
+            try:
+                vec = np.load(self._spill_path(key))
+            except (OSError, ValueError):
+                vec = None
+            if vec is not None:
+                self.hits += 1
+                self.put(key, vec)
+                return vec
+        self.misses += 1
+        return None
+
+    def put(self, key: str, vec: np.ndarray) -> None:
+        self._entries[key] = vec
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            old_key, old_vec = self._entries.popitem(last=False)
+            if self.spill_dir and not os.path.exists(self._spill_path(old_key)):
+                try:
+                    np.save(self._spill_path(old_key), old_vec)
+                except OSError:
+                    pass
+
+    def stats(self) -> Dict[str, int]:
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+class Embedder:
+    """Batched embedding front‑end with a content‑addressed cache.
+
+    Parameters
+    ----------
+    encoder:
+        Batched encoder ``List[str] -> (n, dim) np.ndarray`` of L2‑normalised
+        rows. Defaults to the placeholder :func:`hash_encoder`.
+    dim:
+        Output dimensionality of *encoder*.
+    cache_size:
+        Maximum number of vectors kept in memory; ``0`` disables caching.
+    spill_dir:
+        Optional directory for vectors evicted from the in‑memory cache.
+    """
+
+    def __init__(
+        self,
+        encoder: Optional[Encoder] = None,
+        dim: int = DEFAULT_DIM,
+        cache_size: int = 10000,
+        spill_dir: Optional[str] = None,
+    ) -> None:
+        self.encoder: Encoder = encoder or (lambda texts: hash_encoder(texts, dim))
+        self.dim = dim
+        self.cache: Optional[EmbeddingCache] = (
+            EmbeddingCache(cache_size, spill_dir) if cache_size > 0 else None
+        )
+
+    def embed(self, text: str) -> np.ndarray:
+        """Embed a single *text*; returns a ``(dim,)`` vector."""
+        return self.embed_many([text])[0]
+
+    def embed_many(self, texts: List[str]) -> np.ndarray:
+        """Embed *texts* into an ``(n, dim)`` ``float32`` matrix.
+
+        Cached texts are looked up; the remaining distinct texts are encoded in
+        a single encoder call.
+        """
+        out = np.empty((len(texts), self.dim), dtype=np.float32)
+        if not texts:
+            return out
+        if self.cache is None:
+            out[:] = self.encoder(list(texts))
+            return out
+        pending: Dict[str, List[int]] = {}
+        keys: Dict[str, str] = {}
+        for i, text in enumerate(texts):
+            if text in pending:
+                pending[text].append(i)
+                continue
+            key = keys[text] = content_key(text)
+            vec = self.cache.get(key)
+            if vec is None:
+                pending[text] = [i]
+            else:
+                out[i] = vec
+        if pending:
+            misses = list(pending)
+            encoded = np.asarray(self.encoder(misses), dtype=np.float32)
+            for text, vec in zip(misses, encoded):
+                out[pending[text]] = vec
+                self.cache.put(keys[text], vec.copy())
+        return out
+
+
+_default_embedder: Optional[Embedder] = None
+
+
+def default_embedder() -> Embedder:
+    """Process‑wide :class:`Embedder` shared by memory components by default."""
+    global _default_embedder
+    if _default_embedder is None:
+        _default_embedder = Embedder()
+    return _default_embedder
+
+
+def embed_many(texts: List[str]) -> np.ndarray:
+    """Embed *texts* with the :func:`default_embedder`; returns ``(n, dim)``."""
+    return default_embedder().embed_many(texts)
@@ -0,0 +1,224 @@
+# src/ecy/memory/graph.py
+"""Document graph for :class:`~ecy.memory.graph_rag.GraphRAG`.
+
+Documents are linked when they mention the same entity or when their
+embeddings are close. Edges are accumulated as COO triples while documents
+are ingested and compacted into CSR arrays (``indptr`` / ``indices`` /
+``weights``) on demand, so multi‑hop retrieval is a handful of vectorized
+sparse mat‑vec products rather than a Python graph walk.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Dict, List, Set
+
+import numpy as np
+
+_ENTITY_RE = re.compile(r"#\w+|\b[A-Z][A-Za-z0-9_]*[A-Za-z0-9]\b")
+_NON_ENTITIES = {
+    "a", "an", "and", "are", "as", "at", "but", "can", "do", "does", "for", "from",
+    "he", "her", "his", "how", "i", "if", "in", "is", "it", "its", "my", "no", "not",
+    "of", "on", "or", "our", "please", "she", "so", "that", "the", "their", "then",
+    "there", "these", "they", "this", "to", "was", "we", "what", "when", "where",
+    "which", "who", "why", "will", "with", "you", "your",
+}
+
+
+def extract_entities(text: str) -> Set[str]:
+    """Return the lower‑cased entity mentions in *text*.
+
+    A lightweight heuristic stands in for a real NER model: capitalised words,
+    acronyms, CamelCase identifiers and ``#tags``, minus common function words.
+    """
+    found = set()
+    for match in _ENTITY_RE.findall(text):
+        token = match.lstrip("#").lower()
+        if token and token not in _NON_ENTITIES:
+            found.add(token)
+    return found
+
+
+class CSRGraph:
+    """Undirected weighted graph in compressed sparse row form.
+
+    Attributes
+    ----------
+    indptr: np.ndarray
+        ``(n + 1,)`` row pointers; the neighbours of ``i`` are
+        ``indices[indptr[i]:indptr[i + 1]]``.
+    indices: np.ndarray
+        Neighbour ids.
+    weights: np.ndarray
+        Edge weights, aligned with :attr:`indices`.
+    """
+
+    def __init__(self, indptr: np.ndarray, indices: np.ndarray, weights: np.ndarray) -> None:
+        self.indptr = indptr
+        self.indices = indices
+        self.weights = weights
+        self.n = int(indptr.shape[0] - 1)
+        counts = np.diff(indptr)
+        self._rows = np.repeat(np.arange(self.n, dtype=np.int64), counts)
+        self.degree = np.bincount(self._rows, weights=weights, minlength=self.n)
+
+    @classmethod
+    def from_edges(
+        cls, n: int, src: np.ndarray, dst: np.ndarray, weights: np.ndarray
+    ) -> "CSRGraph":
+        """Build a symmetric graph over *n* nodes from directed COO triples.
+
+        Both directions of every edge are stored; parallel edges are merged by
+        summing their weights and self‑loops are dropped.
+        """
+        rows = np.concatenate([src, dst]).astype(np.int64)
+        cols = np.concatenate([dst, src]).astype(np.int64)
+        w = np.concatenate([weights, weights]).astype(np.float32)
+        keep = rows != cols
+        rows, cols, w = rows[keep], cols[keep], w[keep]
+        if rows.size:
+            key = rows * n + cols
+            uniq, inverse = np.unique(key, return_inverse=True)
+            w = np.bincount(inverse, weights=w).astype(np.float32)
+            rows, cols = uniq // n, uniq % n
+        indptr = np.concatenate([[0], np.cumsum(np.bincount(rows, minlength=n))]).astype(np.int64)
+        return cls(indptr, cols, w)
+
+    @property
+    def num_edges(self) -> int:
+        """Number of undirected edges."""
+        return int(self.indices.shape[0] // 2)
+
+    def neighbors(self, node: int) -> np.ndarray:
+        return self.indices[self.indptr[node] : self.indptr[node + 1]]
+
+    def propagate(self, mass: np.ndarray) -> np.ndarray:
+        """One random‑walk step: spread each node's *mass* over its edges by weight.
+
+        Nodes without edges keep their mass. Only edges leaving nodes that
+        currently hold mass are touched, so a walk started from a few seeds
+        costs in proportion to the neighbourhood it has reached, not to the
+        size of the graph.
+        """
+        degree = self.degree
+        active = np.flatnonzero(mass)
+        if active.size * 4 >= self.n:
+            share = np.divide(mass, degree, out=np.zeros_like(mass), where=degree > 0)
+            out = np.bincount(
+                self._rows, weights=self.weights * share[self.indices], minlength=self.n
+            )
+        else:
+            starts = self.indptr[active]
+            counts = self.indptr[active + 1] - starts
+            # Flat edge positions for every active row: start + 0..count-1
+            offsets = np.repeat(starts - np.cumsum(counts) + counts, counts)
+            edges = offsets + np.arange(offsets.size)
+            share = np.divide(
+                mass[active], degree[active], out=np.zeros(active.size), where=degree[active] > 0
+            )
+            out = np.bincount(
+                self.indices[edges],
+                weights=self.weights[edges] * np.repeat(share, counts),
+                minlength=self.n,
+            )
+        # bincount yields int64 when there are no edges at all
+        out = out.astype(np.float64, copy=False)
+        out[degree == 0] += mass[degree == 0]
+        return out
+
+    def personalized_pagerank(
+        self, seeds: np.ndarray, seed_weights: np.ndarray, hops: int, alpha: float = 0.5
+    ) -> np.ndarray:
+        """Personalized PageRank truncated to *hops* propagation steps.
+
+        Mass only travels one edge per step, so nodes further than *hops* from
+        every seed score zero (a bounded BFS). *alpha* is the probability of
+        following an edge rather than restarting at a seed.
+        """
+        restart = np.zeros(self.n, dtype=np.float64)
+        np.add.at(restart, seeds, np.clip(seed_weights, 0.0, None))
+        total = restart.sum()
+        if total <= 0:
+            restart[seeds] = 1.0
+            total = restart.sum()
+        restart /= total
+        scores = restart.copy()
+        for _ in range(hops):
+            scores = (1.0 - alpha) * restart + alpha * self.propagate(scores)
+        return scores
+
+
+class EdgeBuilder:
+    """Accumulates edges incrementally as documents are ingested.
+
+    Parameters
+    ----------
+    similarity_threshold:
+        Minimum cosine similarity for a nearest‑neighbour edge.
+    max_neighbors:
+        Nearest neighbours considered per new document.
+    max_entity_links:
+        Most recent earlier mentions of an entity a new document links to,
+        which keeps very common entities from creating quadratic hubs.
+    """
+
+    def __init__(
+        self,
+        similarity_threshold: float = 0.85,
+        max_neighbors: int = 8,
+        max_entity_links: int = 32,
+    ) -> None:
+        self.similarity_threshold = similarity_threshold
+        self.max_neighbors = max_neighbors
+        self.max_entity_links = max_entity_links
+        self._src: List[np.ndarray] = []
+        self._dst: List[np.ndarray] = []
+        self._w: List[np.ndarray] = []
+        self._postings: Dict[str, List[int]] = {}
+        self.linked = 0
+        self._csr: CSRGraph = CSRGraph.from_edges(0, *(np.empty(0),) * 3)
+
+    def reset(self) -> None:
+        self.__init__(self.similarity_threshold, self.max_neighbors, self.max_entity_links)
+
+    def add_entity_edges(self, start: int, texts: List[str]) -> None:
+        """Link rows ``start..start+len(texts)`` to earlier rows sharing an entity."""
+        src, dst = [], []
+        for row, text in enumerate(texts, start):
+            for entity in extract_entities(text):
+                posting = self._postings.setdefault(entity, [])
+                if posting:
+                    recent = posting[-self.max_entity_links :]
+                    src.extend([row] * len(recent))
+                    dst.extend(recent)
+                posting.append(row)
+        if src:
+            self._append(np.asarray(src), np.asarray(dst), np.ones(len(src), dtype=np.float32))
+
+    def add_similarity_edges(self, ids: np.ndarray, neighbor_ids: np.ndarray, scores: np.ndarray) -> None:
+        """Add edges from each of *ids* to its earlier nearest neighbours above the threshold.
+
+        *neighbor_ids* / *scores* are ``(len(ids), k)`` search results.
+        """
+        src = np.broadcast_to(ids[:, None], neighbor_ids.shape)
+        # Only link back to earlier rows: pairs within one batch would otherwise
+        # be added from both ends and double their weight.
+        keep = (scores >= self.similarity_threshold) & (neighbor_ids >= 0) & (neighbor_ids < src)
+        if keep.any():
+            self._append(src[keep], neighbor_ids[keep], scores[keep].astype(np.float32))
+
+    def _append(self, src: np.ndarray, dst: np.ndarray, w: np.ndarray) -> None:
+        self._src.append(src.astype(np.int64))
+        self._dst.append(dst.astype(np.int64))
+        self._w.append(w)
+
+    def graph(self, n: int) -> CSRGraph:
+        """Compact the accumulated edges into a :class:`CSRGraph` over *n* nodes."""
+        if self._csr.n != n or len(self._src) > 1:
+            src = np.concatenate(self._src) if self._src else np.empty(0, dtype=np.int64)
+            dst = np.concatenate(self._dst) if self._dst else np.empty(0, dtype=np.int64)
+            w = np.concatenate(self._w) if self._w else np.empty(0, dtype=np.float32)
+            # Keep the merged COO so later rebuilds only concatenate new chunks
+            self._src, self._dst, self._w = [src], [dst], [w]
+            self._csr = CSRGraph.from_edges(n, src, dst, w)
+        return self._csr
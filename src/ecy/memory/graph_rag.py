@@ -4,8 +4,9 @@
 Provides a simple in‑memory graph‑based retrieval‑augmented generation (RAG) interface.
 The full production implementation will later integrate Supabase for persistence and
 Pinecone (or another vector DB) for similarity search. For now we implement a
-lightweight fallback that stores documents, computes embeddings using a placeholder
-function, and performs cosine similarity search.
+lightweight fallback that stores documents, computes embeddings through a batched,
+cached :class:`~ecy.memory.embeddings.Embedder` (placeholder encoder), and performs
+cosine similarity search.
 
 The design follows the MIT/Google engineering standards:
 - Type‑annotated public API
@@ -16,71 +17,375 @@ The design follows the MIT/Google engineering standards:
 
 from __future__ import annotations
 
+import time
+
 import numpy as np
 import torch
-from typing import List, Tuple, Any
-
-# Placeholder embedding function – in production replace with a real model.
-def _embed(text: str) -> np.ndarray:
-    """Return a deterministic pseudo‑embedding for *text*.
+from typing import List, Optional, Tuple, Any
 
-    The function creates a 128‑dimensional vector by hashing the text and
-    normalising it. This is sufficient for the verification script and keeps the
-    module self‑contained.
-    """
-    # Simple deterministic hash → float array
-    rng = np.random.default_rng(abs(hash(text)) % (2**32))
-    vec = rng.random(128).astype(np.float32)
-    # L2 normalise for cosine similarity
-    norm = np.linalg.norm(vec) + 1e-10
-    return vec / norm
+from .ann import IVFIndex, top_k as _top_k
+from .dedupe import DuplicateIndex
+from .embeddings import Embedder, default_embedder
+from .graph import CSRGraph, EdgeBuilder
+from .mmap_store import MmapStore, new_row_state
+from .retention import RetentionPolicy, plan_eviction
 
 
 class GraphRAG:
     """In‑memory Graph‑based Retrieval‑Augmented Generation.
 
+    Embeddings live in a single contiguous ``float32`` matrix that is
+    preallocated and grown geometrically, so a query is one matrix‑vector
+    product followed by an ``argpartition`` top‑k selection instead of a
+    Python loop over every stored document.
+
     Attributes
     ----------
-    _documents: List[Tuple[str, np.ndarray]]
-        Stored documents together with their embeddings.
+    _texts: List[str]
+        Stored documents, row‑aligned with :attr:`_matrix` (a read‑only
+        :class:`~ecy.memory.mmap_store.TextLog` when backed by a store).
+    _matrix: np.ndarray
+        ``(capacity, dim)`` embedding matrix; only the first :attr:`_size`
+        rows are valid.
+    _size: int
+        Number of ingested documents.
+    _store: Optional[MmapStore]
+        On‑disk backing store when the instance was created with a *path*
+        (see :meth:`load` / :meth:`save`); ``None`` for a purely in‑memory
+        index.
+    _ann: Optional[IVFIndex]
+        Approximate index used by :meth:`query` when ``index="ivf"`` and the
+        store holds at least :attr:`ANN_MIN_ROWS` documents.
+    _embedder: Embedder
+        Batched, cached text encoder; the process‑wide
+        :func:`~ecy.memory.embeddings.default_embedder` unless one is passed in.
+    _edges: EdgeBuilder
+        Document graph linking rows that share an entity or whose embeddings
+        are at least ``similarity_threshold`` apart. New rows are linked
+        lazily, the first time the graph is needed.
+    _dedupe: Optional[DuplicateIndex]
+        Ingest‑time duplicate detector (``dedupe="exact"`` or ``"near"``).
+        A duplicate bumps the existing row's :attr:`_refcounts` entry and
+        :attr:`_last_seen` timestamp instead of adding a row.
+    _refcounts: np.ndarray
+        How many times each row's content has been ingested.
+    _last_seen: np.ndarray
+        Unix timestamp of the latest ingest of each row's content.
+    _last_retrieved: np.ndarray
+        Unix timestamp of the latest time each row was returned by a query
+        (its ingest time until then).
+
+        With a persistent store these three are views of
+        :attr:`MmapStore.state <ecy.memory.mmap_store.MmapStore.state>`, so
+        retention picks up where it left off after a restart.
+    _retention: Optional[RetentionPolicy]
+        Bounds enforced after every :meth:`ingest` (see :meth:`evict`).
     """
 
-    def __init__(self) -> None:
-        self._documents: List[Tuple[str, np.ndarray]] = []
+    #: Initial number of preallocated rows.
+    INITIAL_CAPACITY = 1024
+    #: Below this many rows the exact scan is cheaper than maintaining an ANN index.
+    ANN_MIN_ROWS = 4096
+
+    def __init__(
+        self,
+        capacity: int = INITIAL_CAPACITY,
+        path: Optional[str] = None,
+        index: str = "exact",
+        nlist: Optional[int] = None,
+        nprobe: int = 8,
+        similarity_threshold: float = 0.85,
+        max_neighbors: int = 8,
+        embedder: Optional[Embedder] = None,
+        dedupe: str = "off",
+        near_distance: int = 3,
+        retention: Optional[RetentionPolicy] = None,
+    ) -> None:
+        if index not in ("exact", "ivf"):
+            raise ValueError(f"Unknown GraphRAG index mode: {index!r} (expected 'exact' or 'ivf').")
+        self._embedder = embedder or default_embedder()
+        self.dim = self._embedder.dim
+        self._texts: List[str] = []
+        self._matrix: np.ndarray = np.empty((max(1, capacity), self.dim), dtype=np.float32)
+        self._size: int = 0
+        self._store: Optional[MmapStore] = None
+        self._ann: Optional[IVFIndex] = IVFIndex(nlist=nlist, nprobe=nprobe) if index == "ivf" else None
+        self._edges = EdgeBuilder(similarity_threshold=similarity_threshold, max_neighbors=max_neighbors)
+        self._dedupe: Optional[DuplicateIndex] = (
+            DuplicateIndex(dedupe, max_distance=near_distance) if dedupe != "off" else None
+        )
+        self._deduped_rows = 0
+        self._refcounts = np.zeros(0, dtype=np.int64)
+        self._last_seen = np.zeros(0, dtype=np.float64)
+        self._last_retrieved = np.zeros(0, dtype=np.float64)
+        self._retention = retention
+        if path is not None:
+            self._attach(MmapStore(path, self.dim))
+
+    @classmethod
+    def load(cls, path: str, **kwargs: Any) -> "GraphRAG":
+        """Open (or create) the persistent store at *path*.
+
+        The embedding matrix is memory‑mapped, so opening is O(1) regardless
+        of how many documents the store holds, and subsequent :meth:`ingest`
+        calls append to the files in place. *kwargs* are forwarded to the
+        constructor (e.g. ``index="ivf"``).
+        """
+        return cls(path=path, **kwargs)
+
+    @property
+    def nprobe(self) -> int:
+        """Inverted lists scanned per ANN query (recall/latency knob)."""
+        return self._ann.nprobe if self._ann is not None else 0
+
+    @nprobe.setter
+    def nprobe(self, value: int) -> None:
+        if self._ann is None:
+            raise RuntimeError("nprobe only applies to index='ivf'.")
+        self._ann.nprobe = max(1, int(value))
+
+    def save(self, path: str) -> None:
+        """Write the current contents to a new store at *path* and attach to it.
+
+        After saving, further :meth:`ingest` calls append to *path*.
+        """
+        store = MmapStore(path, self.dim)
+        if len(store):
+            raise FileExistsError(f"GraphRAG store at {path} is not empty.")
+        self._grow_row_state(time.time())
+        state = new_row_state(self._size, 0.0)
+        state["refcount"] = self._refcounts[: self._size]
+        state["last_seen"] = self._last_seen[: self._size]
+        state["last_retrieved"] = self._last_retrieved[: self._size]
+        store.append(list(self._texts), self._matrix[: self._size], state)
+        self._attach(store)
+
+    def _attach(self, store: MmapStore) -> None:
+        self._store = store
+        self._matrix = store.matrix
+        self._texts = store.texts  # type: ignore[assignment]  # never extended: ingest appends to the store
+        self._size = len(store)
+        # Writable views: updates go straight to the store's row-state file
+        self._refcounts = store.state["refcount"]
+        self._last_seen = store.state["last_seen"]
+        self._last_retrieved = store.state["last_retrieved"]
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _reserve(self, extra: int) -> None:
+        """Grow :attr:`_matrix` so that *extra* more rows fit without copying again."""
+        needed = self._size + extra
+        capacity = self._matrix.shape[0]
+        if needed <= capacity:
+            return
+        while capacity < needed:
+            capacity *= 2
+        grown = np.empty((capacity, self.dim), dtype=np.float32)
+        grown[: self._size] = self._matrix[: self._size]
+        self._matrix = grown
+
+    def _grow_row_state(self, now: float) -> None:
+        """Extend per‑row bookkeeping to cover every stored row."""
+        missing = self._size - self._refcounts.shape[0]
+        if missing > 0:
+            self._refcounts = np.concatenate([self._refcounts, np.ones(missing, dtype=np.int64)])
+            self._last_seen = np.concatenate([self._last_seen, np.full(missing, now)])
+            self._last_retrieved = np.concatenate([self._last_retrieved, np.full(missing, now)])
+
+    def _split_duplicates(self, docs: List[str]) -> Tuple[List[str], List[int]]:
+        """Partition *docs* into new content and rows that already hold it."""
+        # Rows loaded from disk are indexed on first use
+        for row in range(self._deduped_rows, self._size):
+            self._dedupe.add(self._texts[row], row)
+        fresh: List[str] = []
+        seen: List[int] = []
+        for doc in docs:
+            row = self._dedupe.find(doc)
+            if row is None:
+                # Register now so duplicates later in the same batch collapse too
+                self._dedupe.add(doc, self._size + len(fresh))
+                fresh.append(doc)
+            else:
+                seen.append(row)
+        self._deduped_rows = self._size + len(fresh)
+        return fresh, seen
 
     def ingest(self, docs: List[str]) -> None:
         """Ingest a list of *docs* into the memory store.
 
-        Each document is embedded with :func:`_embed` and stored alongside the
-        original text.
+        The batch is embedded in one :meth:`Embedder.embed_many` call and
+        written into the next free rows of the embedding matrix. With dedupe
+        enabled, documents whose content is already stored only refresh the
+        existing row's reference count and timestamp. The retention policy, if
+        any, is enforced afterwards.
         """
-        for doc in docs:
-            embedding = _embed(doc)
-            self._documents.append((doc, embedding))
+        if not docs:
+            return
+        now = time.time()
+        seen: List[int] = []
+        if self._dedupe is not None:
+            docs, seen = self._split_duplicates(docs)
+        if docs:
+            vectors = self._embedder.embed_many(docs)
+            if self._store is not None:
+                self._store.append(docs, vectors, new_row_state(len(docs), now))
+                self._attach(self._store)
+            else:
+                self._reserve(len(docs))
+                self._matrix[self._size : self._size + len(docs)] = vectors
+                self._texts.extend(docs)
+                self._size += len(docs)
+        self._grow_row_state(now)
+        if seen:
+            np.add.at(self._refcounts, seen, 1)
+            self._last_seen[seen] = now
+        if self._retention is not None:
+            self.evict(now)
+
+    def evict(self, now: Optional[float] = None) -> int:
+        """Apply the retention policy; returns the number of rows removed.
+
+        Survivors are compacted to the front of the embedding matrix in one
+        bulk gather (or one file rewrite for a persistent store), and derived
+        structures – ANN lists, graph edges, dedupe index – are rebuilt
+        lazily on next use.
+        """
+        if self._retention is None or not self._size:
+            return 0
+        now = time.time() if now is None else now
+        self._grow_row_state(now)
+        keep = plan_eviction(
+            self._retention,
+            self.dim * self._matrix.itemsize,
+            self._last_seen[: self._size],
+            self._last_retrieved[: self._size],
+            now,
+        )
+        if keep is None:
+            return 0
+        rows = np.flatnonzero(keep)
+        texts = [self._texts[i] for i in rows]
+        if self._store is not None:
+            self._store.rewrite(texts, self._matrix[rows], self._store.state[rows])
+            self._attach(self._store)
+        else:
+            self._matrix[: rows.size] = self._matrix[rows]
+            self._texts = texts
+            self._size = rows.size
+            self._refcounts = self._refcounts[rows]
+            self._last_seen = self._last_seen[rows]
+            self._last_retrieved = self._last_retrieved[rows]
+        if self._ann is not None:
+            self._ann.reset()
+        self._edges.reset()
+        if self._dedupe is not None:
+            self._dedupe.reset()
+            self._deduped_rows = 0
+        return int(keep.size - rows.size)
 
-    def _similarity(self, query_vec: np.ndarray) -> List[Tuple[str, float]]:
-        """Return a list of ``(document, score)`` sorted by descending similarity.
+    def _search(self, q_mat: np.ndarray, top_k: int, exact: bool = False):
+        """Return ``(ids, scores)`` arrays of shape ``(len(q_mat), k)``, best first.
+
+        Uses the IVF index when one is configured and the store is large
+        enough, otherwise one matrix‑matrix product over every row.
+        """
+        matrix = self._matrix[: self._size]
+        if not exact and self._ann is not None and self._size >= self.ANN_MIN_ROWS:
+            self._ann.sync(matrix)
+            return self._ann.search(matrix, q_mat, top_k)
+        # Cosine similarity (vectors are L2‑normalised) for every row at once
+        scores = q_mat @ matrix.T
+        ids = _top_k(scores, top_k)
+        return ids, np.take_along_axis(scores, ids, axis=-1)
+
+    def _similarity(self, query_vec: np.ndarray, top_k: int) -> List[Tuple[str, float]]:
+        """Return the *top_k* ``(document, score)`` pairs sorted by descending similarity.
         """
-        results: List[Tuple[str, float]] = []
-        for doc, emb in self._documents:
-            # Cosine similarity (vectors are L2‑normalised)
-            score = float(np.dot(query_vec, emb))
-            results.append((doc, score))
-        results.sort(key=lambda x: x[1], reverse=True)
-        return results
-
-    def query(self, query: str, top_k: int = 3) -> List[Tuple[str, float]]:
+        ids, scores = self._search(query_vec[None, :], top_k)
+        self._touch(ids)
+        return [(self._texts[i], float(s)) for i, s in zip(ids[0], scores[0]) if i >= 0]
+
+    def _touch(self, ids: np.ndarray) -> None:
+        """Record that rows *ids* were just retrieved (for LRU retention)."""
+        ids = ids[ids >= 0]
+        now = time.time()
+        self._grow_row_state(now)
+        self._last_retrieved[ids] = now
+
+    @property
+    def graph(self) -> CSRGraph:
+        """The document graph in CSR form, covering every ingested row."""
+        self._link()
+        return self._edges.graph(self._size)
+
+    def _link(self, chunk: int = 4096) -> None:
+        """Compute entity and nearest‑neighbour edges for rows not yet linked."""
+        start = self._edges.linked
+        if start >= self._size:
+            return
+        self._edges.add_entity_edges(start, self._texts[start : self._size])
+        k = self._edges.max_neighbors + 1  # +1: a row is its own nearest neighbour
+        for lo in range(start, self._size, chunk):
+            hi = min(lo + chunk, self._size)
+            ids, scores = self._search(np.asarray(self._matrix[lo:hi]), k)
+            self._edges.add_similarity_edges(np.arange(lo, hi), ids, scores)
+        self._edges.linked = self._size
+
+    def query(self, query: str, top_k: int = 3, hops: int = 0) -> List[Tuple[str, float]]:
         """Query the memory store and return the *top_k* most similar documents.
+
+        With ``hops > 0`` the *top_k* similarity hits seed a personalized
+        PageRank over the document graph, truncated to *hops* steps, and the
+        result is the *top_k* documents by that score (which then replaces the
+        cosine similarity).
         """
-        if not self._documents:
+        if not self._size:
             raise RuntimeError("GraphRAG store is empty – ingest documents first.")
-        q_vec = _embed(query)
-        return self._similarity(q_vec)[:top_k]
+        q_vec = self._embedder.embed(query)
+        if hops <= 0:
+            return self._similarity(q_vec, top_k)
+        ids, scores = self._search(q_vec[None, :], top_k)
+        valid = ids[0] >= 0
+        ranks = self.graph.personalized_pagerank(ids[0][valid], scores[0][valid], hops)
+        best = _top_k(ranks, top_k)
+        best = best[ranks[best] > 0]
+        self._touch(best)
+        return [(self._texts[i], float(ranks[i])) for i in best]
+
+    def query_many(self, queries: List[str], top_k: int = 3) -> List[List[Tuple[str, float]]]:
+        """Batched :meth:`query`: score all *queries* with one matrix‑matrix product.
+        """
+        if not self._size:
+            raise RuntimeError("GraphRAG store is empty – ingest documents first.")
+        if not queries:
+            return []
+        q_mat = self._embedder.embed_many(queries)
+        ids, scores = self._search(q_mat, top_k)
+        self._touch(ids)
+        return [
+            [(self._texts[i], float(s)) for i, s in zip(row_ids, row_scores) if i >= 0]
+            for row_ids, row_scores in zip(ids, scores)
+        ]
+
+    def recall_at_k(self, queries: List[str], top_k: int = 10) -> float:
+        """Mean recall@k of the configured search path against the exact scan.
+
+        Returns ``1.0`` for ``index="exact"`` (or while the store is below
+        :attr:`ANN_MIN_ROWS`); use it to tune :attr:`nprobe`.
+        """
+        if not self._size or not queries:
+            return 1.0
+        q_mat = self._embedder.embed_many(queries)
+        approx, _ = self._search(q_mat, top_k)
+        exact, _ = self._search(q_mat, top_k, exact=True)
+        hits = [len(set(a[a >= 0]) & set(e)) / max(1, len(e)) for a, e in zip(approx, exact)]
+        return float(np.mean(hits))
 
     # Future extension points -------------------------------------------------
-    # - integrate Supabase for persistent storage
-    # - replace _embed with a real transformer‑based encoder (e.g. sentence‑bert)
-    # - add metadata handling, graph edges, and reasoning utilities
+    # - integrate Supabase for shared remote storage (local persistence: MmapStore)
+    # - plug a real transformer‑based encoder (e.g. sentence‑bert) into Embedder
+    # - add metadata handling and reasoning utilities over the document graph
 
 if __name__ == "__main__":
     # Simple manual demo when the module is executed directly.
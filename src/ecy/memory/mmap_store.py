@@ -0,0 +1,230 @@
+# src/ecy/memory/mmap_store.py
+"""On‑disk, memory‑mapped storage for :class:`~ecy.memory.graph_rag.GraphRAG`.
+
+A store is a directory holding four append‑only files:
+
+- ``embeddings.f32`` – raw little‑endian ``float32`` rows of width ``dim``
+- ``offsets.i64``    – cumulative end offset (in bytes) of every document in
+  the text log, one ``int64`` per row
+- ``texts.log``      – UTF‑8 document bodies, concatenated
+- ``rowstate.bin``   – per‑row retention bookkeeping (:data:`ROW_STATE_DTYPE`:
+  reference count, last ingest and last retrieval time), mapped writable so
+  updates land on disk in place and survive a restart
+
+plus a small ``meta.json`` with the embedding dimensionality. Opening a store
+is O(1): the embedding matrix and the offsets are exposed through
+:class:`numpy.memmap`, so nothing is read until it is touched and the pages
+are shared between every process that maps the same files. Appends only
+extend the files; the offsets file is written last and acts as the commit
+record, so a torn append is discarded the next time the store is opened.
+:meth:`MmapStore.rewrite` is the one operation that replaces the files (used
+to compact the store after eviction).
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import time
+from typing import Iterator, List, Optional, Sequence
+
+import numpy as np
+
+EMBEDDINGS_FILE = "embeddings.f32"
+OFFSETS_FILE = "offsets.i64"
+TEXTS_FILE = "texts.log"
+META_FILE = "meta.json"
+STATE_FILE = "rowstate.bin"
+
+_EMB_DTYPE = np.dtype("<f4")
+_OFF_DTYPE = np.dtype("<i8")
+
+#: One record per row of ``rowstate.bin``.
+ROW_STATE_DTYPE = np.dtype(
+    [("refcount", "<i8"), ("last_seen", "<f8"), ("last_retrieved", "<f8")]
+)
+
+
+def new_row_state(n: int, now: float) -> np.ndarray:
+    """Bookkeeping for *n* rows first ingested at *now*."""
+    state = np.empty(n, dtype=ROW_STATE_DTYPE)
+    state["refcount"] = 1
+    state["last_seen"] = now
+    state["last_retrieved"] = now
+    return state
+
+
+def _map(path: str, dtype: np.dtype, shape: tuple, mode: str = "r") -> np.ndarray:
+    """Memmap of *path* (read‑only by default); an empty array when there is nothing to map."""
+    if not shape[0]:
+        return np.empty(shape, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode=mode, shape=shape)
+
+
+class TextLog(Sequence[str]):
+    """Lazy, read‑only view of the documents in ``texts.log``.
+
+    Documents are decoded on access, so a million‑row store costs two
+    memmaps, not a million Python strings.
+    """
+
+    def __init__(self, texts: np.ndarray, offsets: np.ndarray) -> None:
+        self._texts = texts
+        self._offsets = offsets
+
+    def __len__(self) -> int:
+        return int(self._offsets.shape[0])
+
+    def __getitem__(self, index):  # type: ignore[override]
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("TextLog index out of range")
+        start = int(self._offsets[index - 1]) if index else 0
+        end = int(self._offsets[index])
+        return bytes(self._texts[start:end]).decode("utf-8")
+
+    def __iter__(self) -> Iterator[str]:
+        for i in range(len(self)):
+            yield self[i]
+
+
+class MmapStore:
+    """Append‑only embedding matrix + text log backed by memory‑mapped files."""
+
+    def __init__(self, path: str, dim: int) -> None:
+        self.path = path
+        self.dim = dim
+        os.makedirs(path, exist_ok=True)
+        meta_path = self._file(META_FILE)
+        if os.path.exists(meta_path):
+            with open(meta_path, "r", encoding="utf-8") as f:
+                stored_dim = int(json.load(f)["dim"])
+            if stored_dim != dim:
+                raise ValueError(
+                    f"Store at {path} has dim={stored_dim}, expected dim={dim}."
+                )
+        else:
+            with open(meta_path, "w", encoding="utf-8") as f:
+                json.dump({"dim": dim, "version": 1}, f)
+        for name in (EMBEDDINGS_FILE, OFFSETS_FILE, TEXTS_FILE, STATE_FILE):
+            open(self._file(name), "ab").close()
+        self._recover()
+        self._remap()
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+    def _file(self, name: str) -> str:
+        return os.path.join(self.path, name)
+
+    def _recover(self) -> None:
+        """Drop any partially written tail left by an interrupted append."""
+        off_path = self._file(OFFSETS_FILE)
+        off_bytes = os.path.getsize(off_path)
+        count = off_bytes // _OFF_DTYPE.itemsize
+        row_bytes = self.dim * _EMB_DTYPE.itemsize
+        count = min(count, os.path.getsize(self._file(EMBEDDINGS_FILE)) // row_bytes)
+        text_end = 0
+        if count:
+            offsets = np.memmap(off_path, dtype=_OFF_DTYPE, mode="r", shape=(count,))
+            text_end = int(offsets[-1])
+            del offsets
+        for name, size in (
+            (OFFSETS_FILE, count * _OFF_DTYPE.itemsize),
+            (EMBEDDINGS_FILE, count * row_bytes),
+            (TEXTS_FILE, text_end),
+        ):
+            if os.path.getsize(self._file(name)) != size:
+                os.truncate(self._file(name), size)
+        # Row state is written before the offsets, so it is never short after
+        # a torn append; it is short for stores created before it existed.
+        state_path = self._file(STATE_FILE)
+        state_rows = min(count, os.path.getsize(state_path) // ROW_STATE_DTYPE.itemsize)
+        os.truncate(state_path, state_rows * ROW_STATE_DTYPE.itemsize)
+        if state_rows < count:
+            with open(state_path, "ab") as f:
+                f.write(new_row_state(count - state_rows, time.time()).tobytes())
+        self._count = count
+        self._text_end = text_end
+
+    def _remap(self) -> None:
+        n = self._count
+        self.matrix = _map(self._file(EMBEDDINGS_FILE), _EMB_DTYPE, (n, self.dim))
+        offsets = _map(self._file(OFFSETS_FILE), _OFF_DTYPE, (n,))
+        texts = _map(self._file(TEXTS_FILE), np.dtype(np.uint8), (self._text_end,))
+        self.texts = TextLog(texts, offsets)
+        self.state = _map(self._file(STATE_FILE), ROW_STATE_DTYPE, (n,), mode="r+")
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+    def __len__(self) -> int:
+        return self._count
+
+    def append(
+        self, docs: List[str], embeddings: np.ndarray, state: Optional[np.ndarray] = None
+    ) -> None:
+        """Append *docs* and their ``(len(docs), dim)`` *embeddings*.
+
+        *state* is the rows' :data:`ROW_STATE_DTYPE` bookkeeping (fresh rows
+        stamped with the current time when omitted). Existing bytes are never
+        rewritten; the mapped views are refreshed to cover the new rows.
+        """
+        if not docs:
+            return
+        if state is None:
+            state = new_row_state(len(docs), time.time())
+        encoded = [doc.encode("utf-8") for doc in docs]
+        ends = self._text_end + np.cumsum([len(b) for b in encoded], dtype=np.int64)
+        with open(self._file(EMBEDDINGS_FILE), "ab") as f:
+            f.write(np.ascontiguousarray(embeddings, dtype=_EMB_DTYPE).tobytes())
+        with open(self._file(TEXTS_FILE), "ab") as f:
+            f.write(b"".join(encoded))
+        with open(self._file(STATE_FILE), "ab") as f:
+            f.write(np.ascontiguousarray(state, dtype=ROW_STATE_DTYPE).tobytes())
+        # Offsets last: they are the commit record for the rows above.
+        with open(self._file(OFFSETS_FILE), "ab") as f:
+            f.write(ends.astype(_OFF_DTYPE).tobytes())
+        self._count += len(docs)
+        self._text_end = int(ends[-1])
+        self._remap()
+
+    def rewrite(
+        self, docs: Sequence[str], embeddings: np.ndarray, state: Optional[np.ndarray] = None
+    ) -> None:
+        """Replace the whole store with *docs* / *embeddings* / *state* (bulk compaction).
+
+        The new files are written next to the old ones and swapped in with
+        :func:`os.replace`. The offsets file is emptied first and restored
+        last, so an interruption leaves an empty store rather than rows whose
+        text and embedding disagree.
+        """
+        encoded = [doc.encode("utf-8") for doc in docs]
+        ends = np.cumsum([len(b) for b in encoded], dtype=np.int64)
+        if state is None:
+            state = new_row_state(len(encoded), time.time())
+        payloads = (
+            (EMBEDDINGS_FILE, np.ascontiguousarray(embeddings, dtype=_EMB_DTYPE).tobytes()),
+            (TEXTS_FILE, b"".join(encoded)),
+            (STATE_FILE, np.ascontiguousarray(state, dtype=ROW_STATE_DTYPE).tobytes()),
+            (OFFSETS_FILE, ends.astype(_OFF_DTYPE).tobytes()),
+        )
+        for name, payload in payloads:
+            with open(self._file(name + ".tmp"), "wb") as f:
+                f.write(payload)
+        # Drop the mapped views before touching the files they point at
+        self.matrix = np.empty((0, self.dim), dtype=_EMB_DTYPE)
+        self.texts = TextLog(np.empty(0, dtype=np.uint8), np.empty(0, dtype=_OFF_DTYPE))
+        self.state = np.empty(0, dtype=ROW_STATE_DTYPE)
+        # A fresh empty inode rather than truncate(): other processes may still
+        # map the old file and must keep seeing consistent (if stale) data.
+        open(self._file(OFFSETS_FILE + ".empty"), "wb").close()
+        os.replace(self._file(OFFSETS_FILE + ".empty"), self._file(OFFSETS_FILE))
+        for name, _ in payloads:
+            os.replace(self._file(name + ".tmp"), self._file(name))
+        self._count = len(encoded)
+        self._text_end = int(ends[-1]) if len(encoded) else 0
+        self._remap()
@@ -0,0 +1,81 @@
+# src/ecy/memory/retention.py
+"""Retention policies for long‑running :class:`~ecy.memory.graph_rag.GraphRAG` stores.
+
+A :class:`RetentionPolicy` bounds a store by row count, embedding bytes and
+age. :func:`plan_eviction` turns the policy plus the per‑row timestamps into
+a single boolean keep‑mask, which the store then applies as one bulk
+compaction of its embedding matrix. When a size limit is hit the store is
+trimmed to ``low_watermark`` of the limit, so compactions are rare instead
+of happening on every ingest once the store is full.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+
+@dataclass
+class RetentionPolicy:
+    """Bounds applied to a GraphRAG store.
+
+    Attributes
+    ----------
+    max_rows:
+        Maximum number of stored documents.
+    max_bytes:
+        Maximum size of the embedding matrix in bytes.
+    ttl_seconds:
+        Documents neither ingested nor retrieved for this long are dropped.
+    lru:
+        When trimming to a size limit, evict the least recently retrieved
+        documents first; otherwise the oldest rows go first.
+    low_watermark:
+        Fraction of a size limit to trim down to once it is exceeded.
+    """
+
+    max_rows: Optional[int] = None
+    max_bytes: Optional[int] = None
+    ttl_seconds: Optional[float] = None
+    lru: bool = True
+    low_watermark: float = 0.9
+
+    def row_limit(self, row_bytes: int) -> Optional[int]:
+        """Effective row cap combining :attr:`max_rows` and :attr:`max_bytes`."""
+        limits = []
+        if self.max_rows is not None:
+            limits.append(self.max_rows)
+        if self.max_bytes is not None:
+            limits.append(self.max_bytes // max(1, row_bytes))
+        return min(limits) if limits else None
+
+
+def plan_eviction(
+    policy: RetentionPolicy,
+    row_bytes: int,
+    last_seen: np.ndarray,
+    last_retrieved: np.ndarray,
+    now: float,
+) -> Optional[np.ndarray]:
+    """Return a keep‑mask over the rows, or ``None`` when nothing must go."""
+    n = last_seen.shape[0]
+    last_active = np.maximum(last_seen, last_retrieved)
+    keep = np.ones(n, dtype=bool)
+    if policy.ttl_seconds is not None:
+        keep &= (now - last_active) <= policy.ttl_seconds
+    limit = policy.row_limit(row_bytes)
+    kept = int(keep.sum())
+    if limit is not None and kept > limit:
+        target = int(limit * policy.low_watermark)
+        survivors = np.flatnonzero(keep)
+        if policy.lru:
+            # Most recently retrieved last; stable so ties fall back to row age
+            order = np.argsort(last_retrieved[survivors], kind="stable")
+        else:
+            order = np.arange(survivors.size)
+        keep[survivors[order[: kept - target]]] = False
+    if keep.all():
+        return None
+    return keep
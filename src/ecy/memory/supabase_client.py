@@ -54,6 +54,35 @@ class GalacticArchive:
             # Local Fallback
             return self._log_to_file("debates.jsonl", data)
 
+    def load_debates(self, limit: int = 1000) -> List[Dict]:
+        """
+        Return up to `limit` of the most recent archived debates, oldest first.
+        """
+        if self.client:
+            try:
+                resp = (
+                    self.client.table("debates")
+                    .select("query, final_answer, timestamp")
+                    .order("timestamp", desc=True)
+                    .limit(limit)
+                    .execute()
+                )
+                return list(reversed(resp.data or []))
+            except Exception as e:
+                print(f"[Memory] DB Select Error: {e}")
+                return []
+        debates = []
+        try:
+            with open("debates.jsonl", "r") as f:
+                for line in f:
+                    try:
+                        debates.append(json.loads(line))
+                    except json.JSONDecodeError:
+                        continue
+        except FileNotFoundError:
+            pass
+        return debates[-limit:]
+
     def store_log(self, level: str, message: str, source: str = "System") -> bool:
         """
         Store a system log.
@@ -5,6 +5,8 @@ from typing import List, Dict, Any, Optional
 import vecs
 from dotenv import load_dotenv
 
+from ..hashing import content_key
+
 load_dotenv()
 
 logger = logging.getLogger(__name__)
@@ -47,7 +49,7 @@ class VectorMemory:
     def upsert_text(self, text: str, metadata: Dict[str, Any], vector: List[float]):
         """
         Store text and its embedding vector.
-        ID is auto-generated or can be passed in metadata['id'].
+        ID is the text's content key or can be passed in metadata['id'].
         """
         if not self.collection:
             logger.warning("Vector collection not initialized.")
@@ -55,8 +57,9 @@ class VectorMemory:
 
         try:
             # vecs expects records as (id, vector, metadata)
-            # We'll use a hash of the text as ID if provided, or metadata ID
-            record_id = metadata.get("id") or str(hash(text))
+            # Metadata ID if provided, else a stable content key so the same
+            # text upserts onto the same record from any process
+            record_id = metadata.get("id") or content_key(text)
             
             # Make sure metadata contains the raw text for retrieval
             metadata["text"] = text
@@ -0,0 +1,2 @@
+from .health import HealthMonitor
+from .http_pool import async_session, close_async_session, close_sync_session, sync_session
@@ -0,0 +1,425 @@
+# src/ecy/net/broadcast.py
+"""WebSocket fan‑out shared by the Neural Link servers.
+
+:meth:`ConnectionManager.broadcast` serialises a message once and only
+enqueues the resulting text on every connection; each connection has its own
+bounded queue drained by its own writer task. A slow dashboard therefore only
+delays itself, and a broadcast costs O(clients) appends regardless of how
+fast the sockets are. When a connection's queue is full the manager applies
+its *slow‑consumer policy*:
+
+- ``"drop_oldest"`` – discard the oldest queued message;
+- ``"coalesce"``    – messages sent with a ``coalesce_key`` (e.g. telemetry)
+  replace a still‑queued message with the same key, so a lagging client gets
+  the latest state instead of a backlog; otherwise drop the oldest;
+- ``"disconnect"``  – close the connection; the client is expected to
+  reconnect and resynchronise.
+
+Connections whose sends fail or time out are removed automatically.
+
+Clients may narrow what they receive with a control message::
+
+    {"type": "SUBSCRIBE", "topics": ["telemetry", "thoughts.Judge"],
+     "rates": {"telemetry": 2}}
+
+Topics are dotted paths (``telemetry``, ``thoughts.<agent>``,
+``tokens.<agent>``, ``executor``, ``code``, ``logs``) derived from each packet
+by :func:`topic_for`; subscribing to a prefix (``thoughts``) covers every
+topic below it and ``*`` restores the default of receiving everything.
+``rates`` caps messages per second per subscription; messages over the cap
+are skipped for that client. Subscribers are indexed by topic, so a
+broadcast only touches the clients interested in it.
+
+``{"type": "SET_ENCODING", "encoding": "msgpack"}`` switches a client to
+binary MessagePack frames (when ``msgpack`` is installed); each broadcast is
+then packed once for all binary clients.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional, Set, Tuple, Union
+
+try:
+    import msgpack
+    HAS_MSGPACK = True
+except ImportError:
+    HAS_MSGPACK = False
+
+POLICIES = ("drop_oldest", "coalesce", "disconnect")
+
+# asyncio.timeout (3.11+) bounds a send without wait_for's extra task per call
+_timeout = getattr(asyncio, "timeout", None)
+
+
+#: Subscription matching every topic.
+ALL_TOPICS = "*"
+
+
+def topic_for(message: Dict) -> str:
+    """Topic of a Neural Link packet, from its ``type`` and ``agent``."""
+    kind = str(message.get("type", "")).lower()
+    # "Proposer #2" / "Critic (gpt-4o)" -> "Proposer" / "Critic"
+    agent = str(message.get("agent") or "").split(" ", 1)[0].strip(".")
+    if kind == "telemetry":
+        return "telemetry"
+    if kind in ("thought", "token"):
+        if agent == "Executor":
+            return "executor"
+        base = "thoughts" if kind == "thought" else "tokens"
+        return f"{base}.{agent}" if agent else base
+    if kind == "terminal":
+        return "executor"
+    if kind in ("code", "ghost_text"):
+        return "code"
+    return "logs"
+
+
+def _topic_prefixes(topic: str) -> List[str]:
+    """``a.b.c`` -> ``["a.b.c", "a.b", "a"]`` (most specific first)."""
+    parts = topic.split(".")
+    return [".".join(parts[:i]) for i in range(len(parts), 0, -1)]
+
+
+class _RateLimit:
+    """Token bucket: at most ``rate`` messages per second, bursts up to ``rate``."""
+
+    def __init__(self, rate: float) -> None:
+        self.rate = rate
+        self.capacity = max(1.0, rate)
+        self.tokens = self.capacity
+        self.stamp = time.monotonic()
+
+    def allow(self) -> bool:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.stamp) * self.rate)
+        self.stamp = now
+        if self.tokens >= 1.0:
+            self.tokens -= 1.0
+            return True
+        return False
+
+
+def encode(message: Dict) -> str:
+    """Compact JSON text of *message* (same encoding as ``send_json``)."""
+    return json.dumps(message, separators=(",", ":"), ensure_ascii=False)
+
+
+def encode_binary(message: Dict) -> bytes:
+    """MessagePack frame of *message* (requires ``msgpack``)."""
+    return msgpack.packb(message, use_bin_type=True)
+
+
+Payload = Union[str, bytes]
+Merge = Callable[[Dict, Dict], Dict]
+
+
+class _Client:
+    """Send queue + writer task for one WebSocket."""
+
+    def __init__(self, manager: "ConnectionManager", websocket: Any) -> None:
+        self.manager = manager
+        self.websocket = websocket
+        # (coalesce key, encoded payload, message kept for merging or None)
+        self.queue: Deque[Tuple[Optional[str], Payload, Optional[Dict]]] = deque()
+        self.ready = asyncio.Event()
+        self.task: Optional[asyncio.Task] = None
+        # None = legacy firehose; otherwise subscription -> optional rate limit
+        self.subscriptions: Optional[Dict[str, Optional[_RateLimit]]] = None
+        self.binary = False
+        # Coalesce keys whose messages were throttled or dropped for this client
+        self.missed: Set[str] = set()
+        self.sent = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self.throttled = 0
+
+    def allow(self, subscription: str) -> bool:
+        if self.subscriptions is None:
+            return True
+        limit = self.subscriptions.get(subscription)
+        if limit is None or limit.allow():
+            return True
+        self.throttled += 1
+        return False
+
+    def encode(self, message: Dict) -> Payload:
+        return encode_binary(message) if self.binary else encode(message)
+
+    def offer(
+        self, text: Payload, key: Optional[str], message: Optional[Dict] = None, merge: Optional[Merge] = None
+    ) -> bool:
+        """Queue *text* (str or bytes); returns False if the client must be disconnected.
+
+        With *merge*, a still‑queued message under the same *key* is combined
+        with *message* (``merge(queued, message)``) instead of being replaced,
+        so fields carried only by the older message survive coalescing.
+        """
+        manager = self.manager
+        kept = message if merge is not None else None
+        if key is not None and manager.policy == "coalesce":
+            for i, (queued_key, _, queued) in enumerate(self.queue):
+                if queued_key == key:
+                    if kept is not None and queued is not None:
+                        kept = merge(queued, kept)
+                        text = self.encode(kept)
+                    self.queue[i] = (key, text, kept)
+                    self.coalesced += 1
+                    return True
+        if len(self.queue) >= manager.queue_size:
+            if manager.policy == "disconnect":
+                return False
+            dropped_key, _, _ = self.queue.popleft()
+            if dropped_key is not None:
+                self.missed.add(dropped_key)
+            self.dropped += 1
+        self.queue.append((key, text, kept))
+        self.ready.set()
+        return True
+
+    async def run(self) -> None:
+        try:
+            while True:
+                if not self.queue:
+                    self.ready.clear()
+                    await self.ready.wait()
+                    continue
+                _, payload, _ = self.queue.popleft()
+                if isinstance(payload, bytes):
+                    sending = self.websocket.send_bytes(payload)
+                else:
+                    sending = self.websocket.send_text(payload)
+                if _timeout is not None:
+                    async with _timeout(self.manager.send_timeout):
+                        await sending
+                else:
+                    await asyncio.wait_for(sending, self.manager.send_timeout)
+                self.sent += 1
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"[{self.manager.name}] Dropping synapse {getattr(self.websocket, 'client', '?')}: {e!r}")
+            self.manager.disconnect(self.websocket)
+
+
+class ConnectionManager:
+    """
+    Manages active WebSocket connections (Neural Synapses).
+    Broadcasts telemetry and thought streams to all connected clients.
+
+    Parameters
+    ----------
+    queue_size:
+        Messages buffered per connection before the policy applies.
+    policy:
+        Slow‑consumer policy, one of :data:`POLICIES`.
+    send_timeout:
+        Seconds a single send may take before the connection is dropped.
+    name:
+        Label used in log lines.
+    """
+
+    def __init__(
+        self,
+        queue_size: int = 256,
+        policy: str = "coalesce",
+        send_timeout: float = 10.0,
+        name: str = "Neural Link",
+    ) -> None:
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown slow-consumer policy: {policy!r} (expected one of {POLICIES}).")
+        self.queue_size = queue_size
+        self.policy = policy
+        self.send_timeout = send_timeout
+        self.name = name
+        self.active_connections: List[Any] = []
+        self._clients: Dict[Any, _Client] = {}
+        # Topic index: subscription -> clients; ALL_TOPICS holds the firehose
+        self._subscribers: Dict[str, Set[_Client]] = {ALL_TOPICS: set()}
+        self.disconnected = 0
+
+    async def connect(self, websocket: Any) -> None:
+        await websocket.accept()
+        client = _Client(self, websocket)
+        client.task = asyncio.create_task(client.run())
+        self._clients[websocket] = client
+        self._subscribers[ALL_TOPICS].add(client)
+        self.active_connections.append(websocket)
+        print(f"[{self.name}] Synapse connected: {websocket.client}")
+
+    def disconnect(self, websocket: Any) -> None:
+        """Forget *websocket*; safe to call more than once."""
+        client = self._clients.pop(websocket, None)
+        if client is None:
+            return
+        self.active_connections.remove(websocket)
+        self._unindex(client, list(client.subscriptions or [ALL_TOPICS]))
+        if client.task is not None and client.task is not asyncio.current_task():
+            client.task.cancel()
+        self.disconnected += 1
+        print(f"[{self.name}] Synapse disconnected: {websocket.client}")
+
+    async def _close(self, websocket: Any) -> None:
+        self.disconnect(websocket)
+        try:
+            await websocket.close(code=1013)  # Try again later
+        except Exception:
+            pass
+
+    async def broadcast(
+        self,
+        message: Dict,
+        coalesce_key: Optional[str] = None,
+        topic: Optional[str] = None,
+        merge: Optional[Merge] = None,
+        resync: Optional[Dict] = None,
+    ) -> None:
+        """Queue *message* for every client subscribed to its topic.
+
+        The message is serialised once, and not at all when nobody listens.
+        For incremental streams (e.g. telemetry deltas) pass *merge* to
+        combine coalesced messages, and *resync* – the full state – which is
+        sent instead of *message* to clients that missed an earlier message
+        under *coalesce_key* (throttled by a rate limit or dropped).
+        """
+        self._fanout(
+            self._recipients(topic or topic_for(message)), coalesce_key,
+            message=message, merge=merge, resync=resync,
+        )
+
+    async def send(self, websocket: Any, message: Dict) -> None:
+        """Queue *message* for one client, ordered with its broadcasts."""
+        client = self._clients.get(websocket)
+        if client is not None and not client.offer(client.encode(message), None):
+            await self._close(websocket)
+
+    def broadcast_text(self, text: str, coalesce_key: Optional[str] = None, topic: str = ALL_TOPICS) -> None:
+        """Queue pre‑serialised JSON *text* for every client subscribed to *topic*.
+
+        Binary (msgpack) clients still get binary frames: the text is parsed
+        once and packed for them.
+        """
+        self._fanout(self._recipients(topic), coalesce_key, text=text)
+
+    def _fanout(
+        self,
+        recipients: List[Tuple[_Client, str]],
+        coalesce_key: Optional[str],
+        message: Optional[Dict] = None,
+        text: Optional[str] = None,
+        merge: Optional[Merge] = None,
+        resync: Optional[Dict] = None,
+    ) -> None:
+        # Each wire format is produced at most once, and only if someone needs it
+        packed: Optional[bytes] = None
+        for client, subscription in recipients:
+            if not client.allow(subscription):
+                if coalesce_key is not None:
+                    client.missed.add(coalesce_key)
+                continue
+            if resync is not None and coalesce_key in client.missed:
+                # This client lost part of the stream: send it the full state
+                client.missed.discard(coalesce_key)
+                if not client.offer(client.encode(resync), coalesce_key, resync, merge):
+                    asyncio.create_task(self._close(client.websocket))
+                continue
+            if client.binary:
+                if message is None:
+                    message = json.loads(text)
+                if packed is None:
+                    packed = encode_binary(message)
+                payload: Payload = packed
+            else:
+                if text is None:
+                    text = encode(message)
+                payload = text
+            if not client.offer(payload, coalesce_key, message, merge):
+                asyncio.create_task(self._close(client.websocket))
+
+    def _recipients(self, topic: str) -> List[Tuple[_Client, str]]:
+        """Interested clients, each with the most specific subscription that matched."""
+        seen: Set[_Client] = set()
+        out: List[Tuple[_Client, str]] = []
+        keys = [] if topic == ALL_TOPICS else _topic_prefixes(topic)
+        for key in keys + [ALL_TOPICS]:
+            for client in self._subscribers.get(key, ()):
+                if client not in seen:
+                    seen.add(client)
+                    out.append((client, key))
+        return out
+
+    # ------------------------------------------------------------------
+    # Subscriptions
+    # ------------------------------------------------------------------
+    def _unindex(self, client: _Client, topics: Iterable[str]) -> None:
+        for topic in topics:
+            subscribers = self._subscribers.get(topic)
+            if subscribers is not None:
+                subscribers.discard(client)
+                if not subscribers and topic != ALL_TOPICS:
+                    del self._subscribers[topic]
+
+    def subscribe(self, websocket: Any, topics: Iterable[str], rates: Optional[Dict[str, float]] = None) -> List[str]:
+        """Add *topics* (optionally rate limited) to a client's subscriptions."""
+        client = self._clients.get(websocket)
+        if client is None:
+            return []
+        rates = rates or {}
+        if client.subscriptions is None:
+            # First SUBSCRIBE: leave the firehose for explicit topics
+            self._unindex(client, [ALL_TOPICS])
+            client.subscriptions = {}
+        for topic in topics:
+            rate = rates.get(topic)
+            client.subscriptions[topic] = _RateLimit(float(rate)) if rate else None
+            self._subscribers.setdefault(topic, set()).add(client)
+        return sorted(client.subscriptions)
+
+    def unsubscribe(self, websocket: Any, topics: Iterable[str]) -> List[str]:
+        client = self._clients.get(websocket)
+        if client is None or client.subscriptions is None:
+            return []
+        topics = [t for t in topics if t in client.subscriptions]
+        for topic in topics:
+            del client.subscriptions[topic]
+        self._unindex(client, topics)
+        return sorted(client.subscriptions)
+
+    def interested(self, topic: str) -> int:
+        """Number of clients that would receive a broadcast on *topic*."""
+        return len(self._recipients(topic))
+
+    async def handle_control(self, websocket: Any, message: Dict) -> bool:
+        """Apply a SUBSCRIBE / UNSUBSCRIBE / SET_ENCODING message; False if *message* is not one."""
+        kind = message.get("type")
+        if kind == "SET_ENCODING":
+            client = self._clients.get(websocket)
+            binary = message.get("encoding") == "msgpack" and HAS_MSGPACK
+            # Acknowledge in the old encoding, then switch
+            await self.send(websocket, {"type": "ENCODING", "encoding": "msgpack" if binary else "json"})
+            if client is not None:
+                client.binary = binary
+            return True
+        if kind == "SUBSCRIBE":
+            topics = self.subscribe(websocket, message.get("topics") or [ALL_TOPICS], message.get("rates"))
+        elif kind == "UNSUBSCRIBE":
+            topics = self.unsubscribe(websocket, message.get("topics") or [])
+        else:
+            return False
+        await self.send(websocket, {"type": "SUBSCRIBED", "topics": topics})
+        return True
+
+    def stats(self) -> Dict[str, int]:
+        clients = list(self._clients.values())
+        return {
+            "connections": len(clients),
+            "queued": sum(len(c.queue) for c in clients),
+            "sent": sum(c.sent for c in clients),
+            "dropped": sum(c.dropped for c in clients),
+            "coalesced": sum(c.coalesced for c in clients),
+            "throttled": sum(c.throttled for c in clients),
+            "disconnected": self.disconnected,
+        }
@@ -0,0 +1,173 @@
+# src/ecy/net/event_bus.py
+"""In‑process event bus for thoughts and actions streamed to the Neural Link.
+
+Producers (the provider, the executor, the orchestrator) call
+:meth:`EventBus.publish`, which only appends to a bounded in‑memory queue and
+never blocks. A single flusher thread drains the queue in batches and hands
+each batch to a *sink*:
+
+- when the WebSocket server runs in the same process it attaches an
+  in‑process sink (:meth:`EventBus.attach_sink`) and events go straight to its
+  ``ConnectionManager``;
+- otherwise each batch is one POST to ``/api/inject_thoughts`` over the
+  shared keep‑alive pool.
+
+When producers outpace delivery the oldest queued events are dropped and
+counted, so telemetry can fall behind but can never slow the brain down.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, List, Optional
+
+from .http_pool import sync_session
+
+#: Where batches go when no in‑process sink is attached.
+DEFAULT_ENDPOINT = "http://localhost:8000/api/inject_thoughts"
+
+Sink = Callable[[List[Dict]], None]
+
+
+class EventBus:
+    """Bounded, batching, drop‑oldest event queue with one flusher thread.
+
+    Parameters
+    ----------
+    endpoint:
+        URL that accepts a JSON list of events (used without a sink).
+    max_queue:
+        Events held before the oldest are dropped.
+    batch_size:
+        Maximum events per delivery.
+    flush_interval:
+        Seconds the flusher waits for more events before delivering a
+        partial batch.
+    timeout:
+        HTTP timeout per batch; a failed batch is counted and discarded.
+    """
+
+    def __init__(
+        self,
+        endpoint: str = DEFAULT_ENDPOINT,
+        max_queue: int = 1000,
+        batch_size: int = 64,
+        flush_interval: float = 0.05,
+        timeout: float = 0.5,
+    ) -> None:
+        self.endpoint = endpoint
+        self.max_queue = max_queue
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.timeout = timeout
+        self._queue: Deque[Dict] = deque()
+        self._cond = threading.Condition()
+        self._sink: Optional[Sink] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = False
+        self.published = 0
+        self.delivered = 0
+        self.dropped = 0
+        self.failed = 0
+        self.batches = 0
+
+    # ------------------------------------------------------------------
+    # Producers
+    # ------------------------------------------------------------------
+    def publish(self, event: Dict) -> None:
+        """Queue *event* for delivery; O(1) and never blocks on I/O."""
+        with self._cond:
+            if len(self._queue) >= self.max_queue:
+                self._queue.popleft()
+                self.dropped += 1
+            self._queue.append(event)
+            self.published += 1
+            self._cond.notify()
+        if self._thread is None:
+            self._start()
+
+    def attach_sink(self, sink: Optional[Sink]) -> None:
+        """Deliver batches to *sink* in‑process instead of over HTTP (None to detach)."""
+        self._sink = sink
+
+    # ------------------------------------------------------------------
+    # Flusher
+    # ------------------------------------------------------------------
+    def _start(self) -> None:
+        with self._cond:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="event-bus", daemon=True)
+                self._thread.start()
+
+    def _next_batch(self) -> List[Dict]:
+        with self._cond:
+            while not self._queue and not self._stopped:
+                self._cond.wait()
+            # Give a burst a moment to accumulate into one delivery
+            deadline = time.monotonic() + self.flush_interval
+            while len(self._queue) < self.batch_size and not self._stopped:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            count = min(len(self._queue), self.batch_size)
+            return [self._queue.popleft() for _ in range(count)]
+
+    def _run(self) -> None:
+        while True:
+            batch = self._next_batch()
+            if not batch:
+                if self._stopped:
+                    return
+                continue
+            self._deliver(batch)
+
+    def _deliver(self, batch: List[Dict]) -> None:
+        try:
+            sink = self._sink
+            if sink is not None:
+                sink(batch)
+            else:
+                sync_session().post(self.endpoint, json=batch, timeout=self.timeout)
+            self.delivered += len(batch)
+        except Exception:
+            # Server offline or sink failed: telemetry is best‑effort
+            self.failed += len(batch)
+        self.batches += 1
+
+    def stop(self) -> None:
+        """Stop the flusher after delivering what is already queued."""
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "queued": len(self._queue),
+            "published": self.published,
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+            "failed": self.failed,
+            "batches": self.batches,
+        }
+
+
+_default_bus: Optional[EventBus] = None
+_default_lock = threading.Lock()
+
+
+def default_bus() -> EventBus:
+    """Process‑wide :class:`EventBus` shared by every publisher."""
+    global _default_bus
+    if _default_bus is None:
+        with _default_lock:
+            if _default_bus is None:
+                _default_bus = EventBus()
+    return _default_bus
+
+
+def publish_thought(agent: str, content: str, role: str = "assistant") -> None:
+    """Queue a thought for the Neural Link on the :func:`default_bus`."""
+    default_bus().publish({"agent": agent, "content": content, "role": role})
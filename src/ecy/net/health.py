@@ -0,0 +1,145 @@
+# src/ecy/net/health.py
+"""Cached health state for a remote dependency (e.g. the local Ollama server).
+
+:class:`HealthMonitor` owns a single daemon thread that probes the dependency
+in the background, so request paths read an in‑memory flag instead of doing
+network I/O. While the dependency is up it is re‑probed every ``ttl`` seconds;
+once it is down the probe interval backs off exponentially up to
+``max_backoff``. Callers can also report the outcome of real requests:
+``failure_threshold`` consecutive failures open the circuit immediately
+(without waiting for the next probe) and the first success closes it again.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+
+class HealthMonitor:
+    """Background prober + circuit breaker around a ``probe() -> bool`` callable.
+
+    Parameters
+    ----------
+    probe:
+        Cheap, bounded‑time check; returns ``True`` when healthy. Exceptions
+        count as failures.
+    ttl:
+        Seconds between probes while healthy.
+    base_backoff, max_backoff:
+        First and largest probe interval while unhealthy.
+    failure_threshold:
+        Consecutive request failures (see :meth:`record_failure`) that open
+        the circuit.
+    name:
+        Label used in log lines.
+    """
+
+    def __init__(
+        self,
+        probe: Callable[[], bool],
+        ttl: float = 5.0,
+        base_backoff: float = 1.0,
+        max_backoff: float = 60.0,
+        failure_threshold: int = 3,
+        name: str = "Health",
+    ) -> None:
+        self.probe = probe
+        self.ttl = ttl
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.failure_threshold = failure_threshold
+        self.name = name
+        self._healthy: Optional[bool] = None
+        self._failures = 0
+        self._backoff = base_backoff
+        self._checked_at = 0.0
+        self._probes = 0
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    # ------------------------------------------------------------------
+    # Request path
+    # ------------------------------------------------------------------
+    def is_healthy(self) -> bool:
+        """Current cached status; never blocks once the first probe has run."""
+        self._ensure_started()
+        if self._healthy is None:
+            # Very first call: nothing cached yet, probe once inline
+            self.check()
+        return bool(self._healthy)
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._backoff = self.base_backoff
+            if not self._healthy:
+                print(f"[{self.name}] Circuit closed: dependency is back.")
+            self._healthy = True
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._healthy and self._failures >= self.failure_threshold:
+                print(f"[{self.name}] Circuit opened after {self._failures} consecutive failures.")
+                self._healthy = False
+                self._backoff = self.base_backoff
+                self._wake.set()
+
+    # ------------------------------------------------------------------
+    # Prober
+    # ------------------------------------------------------------------
+    def check(self) -> bool:
+        """Run the probe now and update the cached status."""
+        try:
+            ok = bool(self.probe())
+        except Exception:
+            ok = False
+        with self._lock:
+            self._probes += 1
+            self._checked_at = time.time()
+            if ok:
+                self._failures = 0
+                self._backoff = self.base_backoff
+                if self._healthy is False:
+                    print(f"[{self.name}] Circuit closed: dependency is back.")
+            else:
+                # A failed probe is authoritative: the circuit opens at once
+                self._failures = max(self._failures, self.failure_threshold)
+                if self._healthy is False:
+                    self._backoff = min(self._backoff * 2, self.max_backoff)
+            self._healthy = ok
+        return ok
+
+    def _ensure_started(self) -> None:
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name=f"{self.name}-prober", daemon=True)
+                    self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            interval = self.ttl if self._healthy else self._backoff
+            self._wake.wait(interval)
+            self._wake.clear()
+            if self._stop.is_set():
+                break
+            self.check()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._wake.set()
+
+    def stats(self) -> Dict[str, object]:
+        state = "unknown" if self._healthy is None else ("up" if self._healthy else "open")
+        return {
+            "state": state,
+            "consecutive_failures": self._failures,
+            "backoff": self._backoff,
+            "checked_at": self._checked_at,
+            "probes": self._probes,
+        }
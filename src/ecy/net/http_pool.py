@@ -0,0 +1,106 @@
+# src/ecy/net/http_pool.py
+"""Process‑wide pooled HTTP clients shared by every eCy component.
+
+Opening a client per request pays TCP (and for the cloud, TLS) setup on every
+call. This module instead hands out one keep‑alive pool per flavour:
+
+- :func:`sync_session` – a :class:`requests.Session` whose adapter keeps up to
+  ``POOL_MAXSIZE`` idle connections per host.
+- :func:`async_session` – an :class:`aiohttp.ClientSession` with a bounded
+  connector (``LIMIT`` sockets in total, ``LIMIT_PER_HOST`` per host).
+
+aiohttp sessions are bound to the event loop that created them, so a new
+session is created transparently when called from a different loop (e.g. a
+second ``asyncio.run``); the previous one is closed first so its sockets are
+not leaked. The app closes the pools on shutdown through
+:func:`close_async_session` / :func:`close_sync_session`.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from typing import Optional
+
+#: Idle keep‑alive connections retained per host by the sync pool.
+POOL_MAXSIZE = 32
+#: Distinct hosts the sync pool keeps connections for.
+POOL_CONNECTIONS = 16
+#: Concurrent sockets allowed by the async pool, in total and per host.
+LIMIT = 100
+LIMIT_PER_HOST = 32
+#: Seconds an idle async connection is kept open.
+KEEPALIVE_TIMEOUT = 30.0
+
+_sync_lock = threading.Lock()
+_sync_session = None
+_async_session = None
+_async_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def sync_session():
+    """Shared :class:`requests.Session` with a keep‑alive connection pool."""
+    global _sync_session
+    if _sync_session is None:
+        with _sync_lock:
+            if _sync_session is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                _sync_session = session
+    return _sync_session
+
+
+async def _retire(session, loop: Optional[asyncio.AbstractEventLoop]) -> None:
+    """Close *session*, which was created on *loop* (not the running one)."""
+    if session is None or session.closed:
+        return
+    try:
+        if loop is not None and loop.is_running():
+            # Still in use by another thread: its connections close on that loop
+            asyncio.run_coroutine_threadsafe(session.close(), loop)
+        else:
+            await session.close()
+    except Exception as e:
+        print(f"[HTTP] Failed to close stale session: {e}")
+
+
+async def async_session():
+    """Shared :class:`aiohttp.ClientSession` for the running event loop."""
+    global _async_session, _async_loop
+    loop = asyncio.get_running_loop()
+    if _async_session is None or _async_session.closed or _async_loop is not loop:
+        import aiohttp
+
+        if _async_loop is not loop:
+            await _retire(_async_session, _async_loop)
+        connector = aiohttp.TCPConnector(
+            limit=LIMIT,
+            limit_per_host=LIMIT_PER_HOST,
+            keepalive_timeout=KEEPALIVE_TIMEOUT,
+            ttl_dns_cache=300,
+        )
+        _async_session = aiohttp.ClientSession(connector=connector)
+        _async_loop = loop
+    return _async_session
+
+
+async def close_async_session() -> None:
+    """Close the async pool (call from the owning loop, e.g. app shutdown)."""
+    global _async_session, _async_loop
+    if _async_session is not None and not _async_session.closed:
+        await _async_session.close()
+    _async_session = None
+    _async_loop = None
+
+
+def close_sync_session() -> None:
+    global _sync_session
+    with _sync_lock:
+        if _sync_session is not None:
+            _sync_session.close()
+        _sync_session = None
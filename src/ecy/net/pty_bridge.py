@@ -0,0 +1,269 @@
+# src/ecy/net/pty_bridge.py
+"""Event‑loop driven PTY bridge for the ``/ws/terminal`` endpoint.
+
+The shell's master fd is switched to non‑blocking mode and watched with
+``loop.add_reader``, so terminal output costs no executor threads: the
+reader callback drains everything the kernel has (up to ``read_size`` per
+call) into one buffer and a pump task sends it after a short
+``flush_window``, so a flood of small writes leaves as a few large frames.
+While a send is in flight and the buffer is above ``high_water`` the reader
+is paused, which back‑pressures the shell through the PTY instead of
+growing memory.
+
+Frames are binary and end on a UTF‑8 character boundary, so a multi‑byte
+character split across two reads is never corrupted; text mode decodes with
+an incremental UTF‑8 decoder for the same reason. Only a valid lead byte still
+waiting for its continuation bytes is held back, and only for
+``hold_timeout``: bytes that can never form a character are sent as they are.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import codecs
+import errno
+import fcntl
+import os
+import pty
+import signal
+import struct
+import termios
+from typing import Awaitable, Callable, Optional, Tuple, Union
+
+Sink = Callable[[Union[bytes, str]], Awaitable[None]]
+
+
+def spawn_shell(shell: Optional[str] = None) -> Tuple[int, int]:
+    """Fork a login shell on a new PTY; returns ``(pid, master_fd)``."""
+    # Use $SHELL (zsh on macOS), fallback to sh
+    shell = shell or os.environ.get("SHELL", "sh")
+    master_fd, slave_fd = pty.openpty()
+    pid = os.fork()
+    if pid == 0:
+        # Child process: session leader with the PTY as stdio
+        os.setsid()
+        os.dup2(slave_fd, 0)
+        os.dup2(slave_fd, 1)
+        os.dup2(slave_fd, 2)
+        if slave_fd > 2:
+            os.close(slave_fd)
+        os.close(master_fd)
+        # Set TERM to xterm-256color for nice formatting
+        os.environ["TERM"] = "xterm-256color"
+        os.execvp(shell, [shell])
+    os.close(slave_fd)
+    return pid, master_fd
+
+
+def utf8_split(data: Union[bytes, bytearray]) -> int:
+    """Length of *data* without a trailing, still incomplete UTF‑8 character.
+
+    Only a valid lead byte followed by fewer continuation bytes than it needs
+    (at most three bytes in all) is excluded; invalid bytes, which can never
+    complete, are part of the prefix.
+    """
+    n = len(data)
+    # A held-back tail is at most a 4-byte lead plus two continuation bytes
+    for back in range(1, min(3, n) + 1):
+        byte = data[n - back]
+        if 0x80 <= byte < 0xC0:
+            continue  # continuation byte
+        if 0xC2 <= byte <= 0xDF:
+            need = 2
+        elif 0xE0 <= byte <= 0xEF:
+            need = 3
+        elif 0xF0 <= byte <= 0xF4:
+            need = 4
+        else:
+            return n  # ASCII or a byte that can never start a character
+        return n - back if back < need else n
+    return n
+
+
+class PtyBridge:
+    """Non‑blocking reader / writer around one PTY master fd.
+
+    Parameters
+    ----------
+    master_fd:
+        The PTY master (switched to non‑blocking here).
+    sink:
+        ``async sink(frame)`` receiving ``bytes`` (binary) or ``str`` (text).
+    binary:
+        Send raw UTF‑8 bytes instead of decoded text.
+    read_size:
+        Maximum bytes per ``os.read``.
+    flush_window:
+        Seconds output may accumulate before it is sent.
+    high_water:
+        Buffered bytes above which reading pauses until the sink catches up.
+    hold_timeout:
+        Seconds an incomplete trailing character waits for the rest of its
+        bytes before it is sent anyway.
+    """
+
+    def __init__(
+        self,
+        master_fd: int,
+        sink: Sink,
+        binary: bool = True,
+        read_size: int = 65536,
+        flush_window: float = 0.005,
+        high_water: int = 1 << 20,
+        hold_timeout: float = 0.05,
+    ) -> None:
+        self.fd = master_fd
+        self.sink = sink
+        self.binary = binary
+        self.read_size = read_size
+        self.flush_window = flush_window
+        self.high_water = high_water
+        self.hold_timeout = hold_timeout
+        self.loop = asyncio.get_running_loop()
+        self.buffer = bytearray()
+        self.closed = False
+        self.bytes_in = 0
+        self.frames = 0
+        self._decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        self._ready = asyncio.Event()
+        self._reading = False
+        self._pump: Optional[asyncio.Task] = None
+        os.set_blocking(master_fd, False)
+
+    # ------------------------------------------------------------------
+    # Output (PTY -> sink)
+    # ------------------------------------------------------------------
+    def start(self) -> None:
+        self._resume()
+        self._pump = asyncio.create_task(self._run())
+
+    def _resume(self) -> None:
+        if not self._reading and not self.closed:
+            self.loop.add_reader(self.fd, self._on_readable)
+            self._reading = True
+
+    def _pause(self) -> None:
+        if self._reading:
+            self.loop.remove_reader(self.fd)
+            self._reading = False
+
+    def _on_readable(self) -> None:
+        try:
+            data = os.read(self.fd, self.read_size)
+        except BlockingIOError:
+            return
+        except OSError as e:
+            # EIO: the shell exited and the slave side is gone
+            if e.errno not in (errno.EIO, errno.EBADF):
+                print(f"[Terminal] Read Error: {e}")
+            data = b""
+        if not data:
+            self.closed = True
+            self._pause()
+        else:
+            self.buffer += data
+            self.bytes_in += len(data)
+            if len(self.buffer) >= self.high_water:
+                self._pause()
+        self._ready.set()
+
+    def _held(self) -> bool:
+        """Whether an incomplete trailing character is waiting for more bytes."""
+        if self.binary:
+            return bool(self.buffer)
+        return bool(self._decoder.getstate()[0])
+
+    def _take(self, final: bool = False) -> Union[bytes, str]:
+        if self.binary:
+            # Hold back a trailing partial character until the rest arrives
+            cut = len(self.buffer) if final else utf8_split(self.buffer)
+            chunk = bytes(self.buffer[:cut])
+            del self.buffer[:cut]
+            return chunk
+        chunk = self._decoder.decode(bytes(self.buffer), final=final)
+        self.buffer.clear()
+        return chunk
+
+    async def _run(self) -> None:
+        try:
+            while True:
+                flush = False
+                if self._held():
+                    # Give the rest of the character a moment, then send what there is
+                    try:
+                        await asyncio.wait_for(self._ready.wait(), self.hold_timeout)
+                    except asyncio.TimeoutError:
+                        flush = True
+                else:
+                    await self._ready.wait()
+                self._ready.clear()
+                if not flush and not self.closed and self.flush_window:
+                    # Coalesce a burst of small reads into one frame
+                    await asyncio.sleep(self.flush_window)
+                frame = self._take(final=flush or self.closed)
+                if frame:
+                    await self.sink(frame)
+                    self.frames += 1
+                if self.closed:
+                    return
+                if len(self.buffer) < self.high_water:
+                    self._resume()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"[Terminal] Send Error: {e}")
+
+    async def wait_closed(self) -> None:
+        """Return once the shell has exited (or the sink failed)."""
+        if self._pump is not None:
+            await asyncio.shield(self._pump)
+
+    # ------------------------------------------------------------------
+    # Input (client -> PTY)
+    # ------------------------------------------------------------------
+    async def write(self, data: bytes) -> None:
+        """Write *data* to the shell, waiting for room instead of blocking."""
+        view = memoryview(data)
+        while view:
+            try:
+                view = view[os.write(self.fd, view):]
+            except BlockingIOError:
+                writable = self.loop.create_future()
+                self.loop.add_writer(self.fd, writable.set_result, None)
+                try:
+                    await writable
+                finally:
+                    self.loop.remove_writer(self.fd)
+
+    def resize(self, rows: int, cols: int) -> None:
+        # struct winsize { unsigned short ws_row; unsigned short ws_col; ... }
+        winsize = struct.pack("HHHH", rows, cols, 0, 0)
+        fcntl.ioctl(self.fd, termios.TIOCSWINSZ, winsize)
+
+    def close(self) -> None:
+        self._pause()
+        self.closed = True
+        if self._pump is not None:
+            self._pump.cancel()
+        try:
+            os.close(self.fd)
+        except OSError:
+            pass
+
+
+def terminate(pid: int, loop: Optional[asyncio.AbstractEventLoop] = None) -> None:
+    """SIGTERM the shell and reap it without blocking the loop."""
+    try:
+        os.kill(pid, signal.SIGTERM)
+    except ProcessLookupError:
+        return
+
+    def reap(attempt: int = 0) -> None:
+        try:
+            done, _ = os.waitpid(pid, os.WNOHANG)
+        except ChildProcessError:
+            return
+        if not done and attempt < 20 and loop is not None:
+            loop.call_later(0.25, reap, attempt + 1)
+
+    reap()
@@ -0,0 +1,358 @@
+# src/ecy/net/telemetry.py
+"""Shared hardware / process telemetry for the Neural Link servers.
+
+One :class:`TelemetrySampler` per process (see :func:`default_sampler`) reads
+``psutil`` on a daemon thread and hands each snapshot to its listeners, so
+every server in the process shares a single sampling loop. The sampling rate
+adapts to demand:
+
+- ``fast_interval`` while somebody watches and the machine is busy;
+- ``interval`` while somebody watches and the machine is quiet;
+- ``idle_interval`` while nobody is subscribed to telemetry at all.
+
+Each server wraps its ``ConnectionManager`` in a :class:`TelemetryPublisher`,
+which delta‑encodes snapshots: a packet only carries the fields that moved
+beyond their threshold since they were last sent, and nothing is sent when
+nothing moved. A full keyframe goes out every ``keyframe_interval`` seconds
+(and to each newly connected client). Deltas never go missing for a client:
+when a lagging socket coalesces two of them they are merged, and a client
+whose delta was skipped by its rate limit or dropped from its queue gets the
+full state with its next packet.
+
+Binary MessagePack frames are negotiated per client by the connection
+manager (``SET_ENCODING``).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+try:
+    import psutil
+    HAS_PSUTIL = True
+except ImportError:
+    HAS_PSUTIL = False
+
+#: Command-line fragments identifying the processes reported under ``processes``.
+DEFAULT_PROCESSES: Dict[str, Tuple[str, ...]] = {
+    "brain": ("ecy.main", "ecy/main.py", "ecy.socket_server", "ecy/socket_server.py", "bridge/server.py"),
+    "healer": ("healer_v2",),
+}
+
+#: Minimum change before a field is re‑sent (applies to every number inside it).
+DEFAULT_THRESHOLDS: Dict[str, float] = {
+    "cpu": 1.0,
+    "cpu_cores": 5.0,
+    "ram": 0.5,
+    "activity_score": 2.0,
+    "processes": 1.0,
+}
+
+Snapshot = Dict[str, Any]
+Listener = Callable[[Snapshot], None]
+
+
+def merge_packets(older: Dict[str, Any], newer: Dict[str, Any]) -> Dict[str, Any]:
+    """Combine two queued telemetry packets into one carrying both sets of fields."""
+    # A full packet plus later deltas is still the full state, and vice versa
+    return {**older, **newer, "full": bool(older.get("full") or newer.get("full"))}
+
+
+def changed(old: Any, new: Any, threshold: float) -> bool:
+    """Whether *new* differs from *old* by at least *threshold* (recursively)."""
+    if isinstance(new, bool) or isinstance(old, bool):
+        return old != new
+    if isinstance(new, (int, float)) and isinstance(old, (int, float)):
+        return abs(new - old) >= threshold if threshold else new != old
+    if isinstance(new, dict) and isinstance(old, dict):
+        return new.keys() != old.keys() or any(changed(old[k], new[k], threshold) for k in new)
+    if isinstance(new, (list, tuple)) and isinstance(old, (list, tuple)):
+        return len(new) != len(old) or any(changed(a, b, threshold) for a, b in zip(old, new))
+    return old != new
+
+
+class TelemetrySampler:
+    """Adaptive‑rate sampling thread shared by every publisher in the process.
+
+    Parameters
+    ----------
+    fast_interval, interval, idle_interval:
+        Seconds between samples when watched and busy, watched and quiet,
+        and unwatched.
+    active_cpu:
+        CPU percentage (machine or a tracked process) that counts as busy.
+    processes:
+        Name -> command-line fragments of the processes to report.
+    rescan_interval:
+        Seconds between scans of the process table for those processes.
+    """
+
+    def __init__(
+        self,
+        fast_interval: float = 0.5,
+        interval: float = 2.0,
+        idle_interval: float = 10.0,
+        active_cpu: float = 30.0,
+        processes: Optional[Dict[str, Sequence[str]]] = None,
+        rescan_interval: float = 10.0,
+    ) -> None:
+        self.fast_interval = fast_interval
+        self.interval = interval
+        self.idle_interval = idle_interval
+        self.active_cpu = active_cpu
+        self.processes = dict(DEFAULT_PROCESSES if processes is None else processes)
+        self.rescan_interval = rescan_interval
+        self.latest: Optional[Snapshot] = None
+        self.samples = 0
+        self._listeners: List[Tuple[Listener, Callable[[], int]]] = []
+        self._tracked: Dict[str, List[Any]] = {}
+        self._scanned_at = 0.0
+        self._active = False
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    # ------------------------------------------------------------------
+    # Listeners
+    # ------------------------------------------------------------------
+    def add_listener(self, listener: Listener, watchers: Callable[[], int] = lambda: 1) -> None:
+        """Call *listener* with every snapshot; *watchers* reports its audience size."""
+        with self._lock:
+            self._listeners.append((listener, watchers))
+        self._ensure_started()
+        self.wake()
+
+    def remove_listener(self, listener: Listener) -> None:
+        with self._lock:
+            self._listeners = [(l, w) for l, w in self._listeners if l is not listener]
+
+    def wake(self) -> None:
+        """Sample now (e.g. a client just subscribed)."""
+        self._wake.set()
+
+    def watching(self) -> int:
+        total = 0
+        for _, watchers in list(self._listeners):
+            try:
+                total += watchers()
+            except Exception:
+                pass
+        return total
+
+    def next_interval(self) -> float:
+        if not self.watching():
+            return self.idle_interval
+        return self.fast_interval if self._active else self.interval
+
+    # ------------------------------------------------------------------
+    # Sampling
+    # ------------------------------------------------------------------
+    def _rescan(self) -> None:
+        tracked: Dict[str, List[Any]] = {name: [] for name in self.processes}
+        for proc in psutil.process_iter(["cmdline"]):
+            cmdline = " ".join(proc.info.get("cmdline") or ())
+            for name, fragments in self.processes.items():
+                if any(fragment in cmdline for fragment in fragments):
+                    # Keep the Process objects: cpu_percent() measures since the last call
+                    known = next((p for p in self._tracked.get(name, ()) if p.pid == proc.pid), None)
+                    tracked[name].append(known or proc)
+        self._tracked = tracked
+        self._scanned_at = time.monotonic()
+
+    def _process_metrics(self) -> Dict[str, Optional[Dict[str, Any]]]:
+        if time.monotonic() - self._scanned_at >= self.rescan_interval:
+            self._rescan()
+        metrics: Dict[str, Optional[Dict[str, Any]]] = {}
+        for name, procs in self._tracked.items():
+            cpu = rss = 0.0
+            threads = 0
+            pids = []
+            for proc in procs:
+                try:
+                    with proc.oneshot():
+                        cpu += proc.cpu_percent(interval=None)
+                        rss += proc.memory_info().rss
+                        threads += proc.num_threads()
+                    pids.append(proc.pid)
+                except (psutil.NoSuchProcess, psutil.AccessDenied):
+                    continue
+            metrics[name] = {
+                "pids": pids,
+                "cpu": round(cpu, 1),
+                "rss_mb": round(rss / 2 ** 20, 1),
+                "threads": threads,
+            } if pids else None
+        return metrics
+
+    def sample(self) -> Snapshot:
+        """Take one snapshot now."""
+        if HAS_PSUTIL:
+            cores = psutil.cpu_percent(interval=None, percpu=True)
+            cpu = round(sum(cores) / len(cores), 1) if cores else 0.0
+            snapshot: Snapshot = {
+                "cpu": cpu,
+                "cpu_cores": [round(c) for c in cores],
+                "ram": psutil.virtual_memory().percent,
+                "processes": self._process_metrics(),
+            }
+        else:
+            # Without psutil the load average is the best we have
+            load = os.getloadavg()[0] if hasattr(os, "getloadavg") else 0.0
+            cpu = round(min(100.0, 100.0 * load / (os.cpu_count() or 1)), 1)
+            snapshot = {"cpu": cpu}
+        snapshot["activity_score"] = min(100, int(cpu * 1.5))
+        snapshot["agents"] = 3  # Proposer, Critic, Judge
+        busiest = max([cpu] + [p["cpu"] for p in (snapshot.get("processes") or {}).values() if p])
+        self._active = busiest >= self.active_cpu
+        self.latest = snapshot
+        self.samples += 1
+        return snapshot
+
+    def _ensure_started(self) -> None:
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name="telemetry-sampler", daemon=True)
+                    self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                snapshot = self.sample()
+            except Exception as e:
+                print(f"[Telemetry] Sampling error: {e}")
+                snapshot = None
+            if snapshot is not None:
+                for listener, _ in list(self._listeners):
+                    try:
+                        listener(snapshot)
+                    except Exception as e:
+                        print(f"[Telemetry] Listener error: {e}")
+            self._wake.wait(self.next_interval())
+            self._wake.clear()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._wake.set()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "samples": self.samples,
+            "watching": self.watching(),
+            "active": self._active,
+            "interval": self.next_interval(),
+        }
+
+
+_default_sampler: Optional[TelemetrySampler] = None
+_default_lock = threading.Lock()
+
+
+def default_sampler() -> TelemetrySampler:
+    """Process‑wide :class:`TelemetrySampler` shared by every server."""
+    global _default_sampler
+    if _default_sampler is None:
+        with _default_lock:
+            if _default_sampler is None:
+                _default_sampler = TelemetrySampler()
+    return _default_sampler
+
+
+class TelemetryPublisher:
+    """Delta‑encodes sampler snapshots onto one ``ConnectionManager``.
+
+    Parameters
+    ----------
+    manager:
+        The server's :class:`~ecy.net.broadcast.ConnectionManager`.
+    packet_type:
+        ``type`` field of the packets (``"TELEMETRY"`` / ``"telemetry"``).
+    sampler:
+        Shared sampler; defaults to :func:`default_sampler`.
+    thresholds:
+        Per‑field minimum change, see :data:`DEFAULT_THRESHOLDS`.
+    keyframe_interval:
+        Seconds between full packets.
+    """
+
+    topic = "telemetry"
+
+    def __init__(
+        self,
+        manager: Any,
+        packet_type: str = "TELEMETRY",
+        sampler: Optional[TelemetrySampler] = None,
+        thresholds: Optional[Dict[str, float]] = None,
+        keyframe_interval: float = 30.0,
+    ) -> None:
+        self.manager = manager
+        self.packet_type = packet_type
+        self.sampler = sampler or default_sampler()
+        self.thresholds = dict(DEFAULT_THRESHOLDS, **(thresholds or {}))
+        self.keyframe_interval = keyframe_interval
+        self.sent_state: Snapshot = {}
+        self.seq = 0
+        self.keyframes = 0
+        self.deltas = 0
+        self.skipped = 0
+        self._keyframe_at = 0.0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def start(self) -> None:
+        """Attach to the sampler; call from the server's event loop."""
+        self._loop = asyncio.get_running_loop()
+        self.sampler.add_listener(self._on_sample, lambda: self.manager.interested(self.topic))
+
+    def stop(self) -> None:
+        self.sampler.remove_listener(self._on_sample)
+
+    def _on_sample(self, snapshot: Snapshot) -> None:
+        # Sampler thread -> server loop
+        if self._loop is not None and self.manager.interested(self.topic):
+            asyncio.run_coroutine_threadsafe(self.publish(snapshot), self._loop)
+
+    def delta(self, snapshot: Snapshot) -> Snapshot:
+        """Fields of *snapshot* that moved beyond their threshold since last sent."""
+        return {
+            key: value
+            for key, value in snapshot.items()
+            if key not in self.sent_state or changed(self.sent_state[key], value, self.thresholds.get(key, 0.0))
+        }
+
+    def packet(self, fields: Snapshot, full: bool) -> Dict[str, Any]:
+        self.seq += 1
+        return {"type": self.packet_type, "seq": self.seq, "full": full, "ts": round(time.time(), 3), **fields}
+
+    async def publish(self, snapshot: Snapshot) -> None:
+        now = time.monotonic()
+        full = now - self._keyframe_at >= self.keyframe_interval
+        fields = dict(snapshot) if full else self.delta(snapshot)
+        if not fields:
+            self.skipped += 1
+            return
+        if full:
+            self._keyframe_at = now
+            self.keyframes += 1
+        else:
+            self.deltas += 1
+        self.sent_state.update(fields)
+        packet = self.packet(fields, full)
+        resync = packet if full else {**packet, **self.sent_state, "full": True}
+        await self.manager.broadcast(
+            packet, coalesce_key=self.packet_type, topic=self.topic, merge=merge_packets, resync=resync
+        )
+
+    async def welcome(self, websocket: Any) -> None:
+        """Send the full current state to a newly connected client."""
+        state = dict(self.sent_state) or (self.sampler.latest or {})
+        if state:
+            await self.manager.send(websocket, self.packet(state, True))
+        self.sampler.wake()
+
+    def stats(self) -> Dict[str, Any]:
+        return {"seq": self.seq, "keyframes": self.keyframes, "deltas": self.deltas, "skipped": self.skipped}
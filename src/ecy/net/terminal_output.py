@@ -0,0 +1,168 @@
+# src/ecy/net/terminal_output.py
+"""Per‑viewer output pipeline between a terminal session and its WebSocket.
+
+Session output is appended to the pipeline without waiting on the socket;
+a flusher task sends it as at most one frame per ``tick`` (~one display
+frame), capped at ``max_rate`` bytes per second. A viewer that cannot keep
+up therefore never slows the shell or the other viewers. Its backlog is
+bounded instead: once more than ``max_buffer`` bytes are pending, the middle
+of the backlog is dropped. The next ``keep_head`` bytes stay so the line
+being drawn can finish, and the last ``keep_tail`` bytes stay because they
+are the latest screen region. A dim marker replaces what was skipped.
+Frames end on a character boundary (:func:`~ecy.net.pty_bridge.utf8_split`);
+an incomplete trailing character waits for its remaining bytes without
+ticking, and is sent as it is after ``hold_timeout``.
+``stats()`` reports bytes in / sent / dropped.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Awaitable, Callable, Dict, Optional
+
+from .pty_bridge import utf8_split
+
+Send = Callable[[bytes], Awaitable[None]]
+
+SKIPPED = "\r\n\x1b[0m\x1b[2m[... {} bytes skipped ...]\x1b[0m\r\n"
+
+
+def _line_start(data: bytearray, start: int, limit: int) -> int:
+    """First line start at or after *start* (within *limit*), else a character start."""
+    newline = data.find(b"\n", start, start + limit)
+    if newline != -1:
+        return newline + 1
+    while start < len(data) and data[start] & 0xC0 == 0x80:
+        start += 1
+    return start
+
+
+class OutputPipeline:
+    """Coalescing, rate‑capped, lossy‑when‑behind sender for one viewer.
+
+    Parameters
+    ----------
+    send:
+        ``async send(frame)`` writing one frame to the viewer.
+    tick:
+        Minimum seconds between frames.
+    max_rate:
+        Bytes per second sent to the viewer.
+    max_buffer:
+        Pending bytes that trigger dropping the middle.
+    keep_head, keep_tail:
+        Bytes kept from the start / end of the backlog when dropping.
+    hold_timeout:
+        Seconds an incomplete trailing character waits for the rest of its
+        bytes before it is sent anyway.
+    """
+
+    def __init__(
+        self,
+        send: Send,
+        tick: float = 0.016,
+        max_rate: int = 2 * 1024 * 1024,
+        max_buffer: int = 512 * 1024,
+        keep_head: int = 4096,
+        keep_tail: int = 64 * 1024,
+        hold_timeout: float = 0.05,
+    ) -> None:
+        self.send = send
+        self.tick = tick
+        self.max_rate = max_rate
+        self.max_buffer = max_buffer
+        self.keep_head = keep_head
+        self.keep_tail = keep_tail
+        self.hold_timeout = hold_timeout
+        self.buffer = bytearray()
+        self.bytes_in = 0
+        self.bytes_sent = 0
+        self.bytes_dropped = 0
+        self.frames = 0
+        self.drops = 0
+        self.closed = asyncio.Event()
+        self._allowance = float(max_rate * tick)
+        self._last_send = 0.0
+        self._ready = asyncio.Event()
+        self._task: Optional[asyncio.Task] = asyncio.create_task(self._run())
+
+    def write(self, data: bytes) -> None:
+        """Queue *data*; never waits on the socket."""
+        if self.closed.is_set():
+            return
+        self.buffer += data
+        self.bytes_in += len(data)
+        if len(self.buffer) > self.max_buffer:
+            self._drop_middle()
+        self._ready.set()
+
+    def _drop_middle(self) -> None:
+        head = _line_start(self.buffer, min(self.keep_head, len(self.buffer)), self.keep_head)
+        tail = _line_start(self.buffer, max(head, len(self.buffer) - self.keep_tail), self.keep_tail)
+        dropped = tail - head
+        if dropped <= 0:
+            return
+        self.buffer[head:tail] = SKIPPED.format(dropped).encode()
+        self.bytes_dropped += dropped
+        self.drops += 1
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        # Allow short bursts of a few ticks' worth after idling
+        cap = self.max_rate * self.tick * 4
+        self._allowance = min(cap, self._allowance + (now - self._last_send) * self.max_rate)
+
+    async def _run(self) -> None:
+        try:
+            while True:
+                flush = False
+                if not self.buffer:
+                    self._ready.clear()
+                    await self._ready.wait()
+                elif not utf8_split(self.buffer):
+                    # Only an incomplete character is pending: wait for the rest, then send it anyway
+                    self._ready.clear()
+                    try:
+                        await asyncio.wait_for(self._ready.wait(), self.hold_timeout)
+                    except asyncio.TimeoutError:
+                        flush = True
+                # Coalesce everything that arrives within one tick into one frame
+                delay = self._last_send + self.tick - time.monotonic()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                self._refill()
+                self._last_send = time.monotonic()
+                chunk = self.buffer[: int(self._allowance)]
+                size = len(chunk) if flush else utf8_split(chunk)
+                if size <= 0:
+                    continue
+                frame = bytes(self.buffer[:size])
+                del self.buffer[:size]
+                self._allowance -= size
+                await self.send(frame)
+                self.bytes_sent += size
+                self.frames += 1
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            # Socket gone: the session detaches this viewer via ``closed``
+            pass
+        finally:
+            self.closed.set()
+
+    def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        self.closed.set()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "bytes_in": self.bytes_in,
+            "bytes_sent": self.bytes_sent,
+            "bytes_dropped": self.bytes_dropped,
+            "pending": len(self.buffer),
+            "frames": self.frames,
+            "drops": self.drops,
+        }
@@ -0,0 +1,227 @@
+# src/ecy/net/terminal_sessions.py
+"""Reattachable, multi‑viewer terminal sessions for ``/ws/terminal``.
+
+A :class:`TerminalSession` owns one shell + :class:`~ecy.net.pty_bridge.PtyBridge`
+and outlives the WebSockets that view it. Output is fanned out to every
+attached viewer's :class:`~ecy.net.terminal_output.OutputPipeline` and
+appended to a bounded ring‑buffer scrollback; a viewer that (re)attaches
+first receives that scrollback, so a browser reload is a dictionary lookup
+and a replay instead of a fork+exec of a login shell. Fan‑out never waits on
+a socket, so a slow viewer cannot stall the shell or the other viewers.
+
+When the last viewer leaves, the shell is kept for ``grace`` seconds before
+it is terminated. Viewers control the session with the actions named in
+:mod:`ecy.keybindings` – ``detach_session`` (``C-b d``) leaves the shell
+running, ``close_pane`` (``C-b c``) ends it.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+import uuid
+from collections import deque
+from typing import Any, Deque, Dict, Optional, Tuple, Union
+
+from .pty_bridge import PtyBridge, spawn_shell, terminate
+from .terminal_output import OutputPipeline
+
+
+def _sender(websocket: Any, binary: bool):
+    async def send(frame: bytes) -> None:
+        if binary:
+            await websocket.send_bytes(frame)
+        else:
+            # Frames end on character boundaries, so this never splits a character
+            await websocket.send_text(frame.decode("utf-8", errors="replace"))
+    return send
+
+
+class TerminalSession:
+    """A shell shared by any number of viewers, with scrollback.
+
+    Parameters
+    ----------
+    session_id:
+        Registry key, handed to the client for reattaching.
+    scrollback:
+        Bytes of recent output kept for replay.
+    grace:
+        Seconds the shell survives without viewers.
+    """
+
+    def __init__(
+        self, session_id: str, scrollback: int = 256 * 1024, grace: float = 300.0, shell: Optional[str] = None
+    ) -> None:
+        self.id = session_id
+        self.grace = grace
+        self.scrollback_limit = scrollback
+        self.scrollback: Deque[bytes] = deque()
+        self.scrollback_bytes = 0
+        self.viewers: Dict[Any, OutputPipeline] = {}
+        self.created = time.time()
+        self.detached_at: Optional[float] = None
+        self.closed = asyncio.Event()
+        self._grace: Optional[asyncio.TimerHandle] = None
+        self.pid, master_fd = spawn_shell(shell)
+        self.bridge = PtyBridge(master_fd, self._fanout, binary=True)
+        self.bridge.start()
+        # Kept so it is neither garbage-collected while running nor left behind by close()
+        self._watcher: Optional[asyncio.Task] = asyncio.create_task(self._watch())
+
+    # ------------------------------------------------------------------
+    # Output
+    # ------------------------------------------------------------------
+    def _remember(self, frame: bytes) -> None:
+        self.scrollback.append(frame)
+        self.scrollback_bytes += len(frame)
+        excess = self.scrollback_bytes - self.scrollback_limit
+        while excess > 0:
+            oldest = self.scrollback.popleft()
+            if len(oldest) > excess:
+                # Trim the oldest frame, starting the replay on a character boundary
+                start = excess
+                while start < len(oldest) and oldest[start] & 0xC0 == 0x80:
+                    start += 1
+                self.scrollback.appendleft(oldest[start:])
+                self.scrollback_bytes -= start
+                break
+            self.scrollback_bytes -= len(oldest)
+            excess -= len(oldest)
+
+    async def _fanout(self, frame: bytes) -> None:
+        self._remember(frame)
+        for websocket, pipeline in list(self.viewers.items()):
+            if pipeline.closed.is_set():
+                self.detach(websocket)
+            else:
+                pipeline.write(frame)
+
+    async def _watch(self) -> None:
+        await self.bridge.wait_closed()
+        self.close()
+
+    # ------------------------------------------------------------------
+    # Viewers
+    # ------------------------------------------------------------------
+    def claim(self) -> None:
+        """Stop the grace timer (a viewer is about to attach)."""
+        if self._grace is not None:
+            self._grace.cancel()
+            self._grace = None
+        self.detached_at = None
+
+    async def attach(self, websocket: Any, binary: bool = True) -> None:
+        """Add a viewer and replay the scrollback to it."""
+        self.claim()
+        pipeline = OutputPipeline(_sender(websocket, binary))
+        # Replay goes through the same pipeline, so live output queues behind it
+        pipeline.write(b"".join(self.scrollback))
+        self.viewers[websocket] = pipeline
+
+    def detach(self, websocket: Any) -> None:
+        """Remove a viewer; the last one out starts the grace timer."""
+        pipeline = self.viewers.pop(websocket, None)
+        if pipeline is None:
+            return
+        pipeline.close()
+        if self.viewers or self.closed.is_set():
+            return
+        self.detached_at = time.time()
+        self._grace = asyncio.get_running_loop().call_later(self.grace, self.close)
+
+    async def write(self, data: bytes) -> None:
+        await self.bridge.write(data)
+
+    def resize(self, rows: int, cols: int) -> None:
+        self.bridge.resize(rows, cols)
+
+    def close(self) -> None:
+        """Terminate the shell and release its PTY."""
+        if self.closed.is_set():
+            return
+        if self._grace is not None:
+            self._grace.cancel()
+        self.bridge.close()
+        for pipeline in self.viewers.values():
+            pipeline.close()
+        terminate(self.pid, asyncio.get_running_loop())
+        if self._watcher is not None and self._watcher is not asyncio.current_task():
+            self._watcher.cancel()
+        self.closed.set()
+        print(f"[Terminal] Session {self.id} closed")
+
+    async def wait_closed(self) -> None:
+        """Close the session and wait for its watcher task to finish."""
+        self.close()
+        watcher, self._watcher = self._watcher, None
+        if watcher is not None and watcher is not asyncio.current_task():
+            # wait() rather than await: a cancelled watcher must not cancel the caller
+            await asyncio.wait([watcher])
+
+    @property
+    def finished(self) -> bool:
+        """Whether the watcher task is done (it always is once :meth:`wait_closed` returns)."""
+        return self._watcher is None or self._watcher.done()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "pid": self.pid,
+            "viewers": len(self.viewers),
+            "scrollback_bytes": self.scrollback_bytes,
+            "bytes_in": self.bridge.bytes_in,
+            "detached_at": self.detached_at,
+            "output": [pipeline.stats() for pipeline in self.viewers.values()],
+        }
+
+
+class TerminalSessionRegistry:
+    """Terminal sessions by ID.
+
+    Parameters
+    ----------
+    grace:
+        Seconds a session without viewers survives before its shell is killed.
+    max_sessions:
+        Live sessions allowed at once; further new sessions are refused.
+    scrollback:
+        Per‑session scrollback in bytes.
+    """
+
+    def __init__(self, grace: float = 300.0, max_sessions: int = 16, scrollback: int = 256 * 1024) -> None:
+        self.grace = grace
+        self.max_sessions = max_sessions
+        self.scrollback = scrollback
+        self.sessions: Dict[str, TerminalSession] = {}
+
+    def _prune(self) -> None:
+        # Closed sessions whose watcher is still unwinding are dropped on a later call
+        for session_id in [s.id for s in self.sessions.values() if s.closed.is_set() and s.finished]:
+            del self.sessions[session_id]
+
+    def open(self, session_id: Optional[str] = None) -> Tuple[Optional[TerminalSession], bool]:
+        """Live session *session_id*, or a new shell if there is none.
+
+        Returns ``(session, reattached)``; ``session`` is None when the
+        registry is full.
+        """
+        self._prune()
+        session = self.sessions.get(session_id) if session_id else None
+        if session is not None:
+            session.claim()
+            return session, True
+        if len(self.sessions) >= self.max_sessions:
+            return None, False
+        session = TerminalSession(uuid.uuid4().hex, scrollback=self.scrollback, grace=self.grace)
+        self.sessions[session.id] = session
+        return session, False
+
+    async def close_all(self) -> None:
+        for session in list(self.sessions.values()):
+            await session.wait_closed()
+        self.sessions.clear()
+
+    def stats(self) -> Dict[str, Union[int, list]]:
+        self._prune()
+        return {"sessions": len(self.sessions), "detail": [s.stats() for s in self.sessions.values()]}
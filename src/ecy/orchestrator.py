@@ -1,5 +1,4 @@
 import asyncio
-import aiohttp
 import json
 from typing import Optional, Dict
 from src.ecy.intelligence.unified_provider import UnifiedIntelligenceProvider
@@ -7,6 +6,7 @@ from src.ecy.intelligence.debate_coordinator import DebateCoordinator
 from src.ecy.intelligence.self_healing import Healer
 from src.ecy.math_core import MathCore
 from src.ecy.action.executor import Executor
+from src.ecy.net.event_bus import publish_thought
 
 class Orchestrator:
     """
@@ -37,16 +37,10 @@ class Orchestrator:
         """
         Stream internal monologue to the Neural Uplink (WebSocket Server).
         """
-        try:
-            async with aiohttp.ClientSession() as session:
-                payload = {"agent": agent, "content": content, "role": "assistant"}
-                # Fire and forget - don't block main thread too long
-                await session.post("http://localhost:8000/api/inject_thought", json=payload)
-        except Exception as e:
-            # Silent fail if server is offline, don't crash the brain
-            print(f"[Orchestrator] Uplink failed: {e}")
+        # Queued on the event bus: never waits on the uplink, drops if it falls behind
+        publish_thought(agent, content)
 
-    async def construct_feature(self, goal: str):
+    async def construct_feature(self, goal: str, token_callback=None):
         """
         Main Execution Loop: "The Supervisor Pattern".
         1. PLAN: Debate the best approach.
@@ -61,7 +55,7 @@ class Orchestrator:
         print("[Orchestrator] Convening Council of Wisdom...")
         await self.broadcast_thought("Orchestrator", f"Convening Council for goal: {goal}")
         
-        debate_result = await self.council.conduct_debate(goal, max_turns=2)
+        debate_result = await self.council.conduct_debate(goal, max_turns=2, token_callback=token_callback)
         final_verdict = debate_result["final_answer"]
         
         await self.broadcast_thought("Council Judge", f"Verdict Reached: {final_verdict[:100]}...")
@@ -7,18 +7,19 @@ import random
 import psutil
 import os
 import sys
-import pty
-import fcntl
-import struct
-import termios
-import signal
 import select 
-from typing import List, Dict
+from typing import List, Dict, Optional
 
 # Import the Brain
 # Ensure src modules are found
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../')))
 from src.ecy.orchestrator import Orchestrator
+from src.ecy.net.http_pool import close_async_session, close_sync_session
+from src.ecy.net.event_bus import default_bus
+from src.ecy.net.broadcast import ConnectionManager
+from src.ecy.net.telemetry import TelemetryPublisher
+from src.ecy.net.terminal_sessions import TerminalSessionRegistry
+from src.ecy.keybindings import get_action
 
 app = FastAPI()
 
@@ -31,76 +32,45 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-class ConnectionManager:
-    """
-    Manages active WebSocket connections (Neural Synapses).
-    Broadcasts telemetry and thought streams to all connected clients.
-    """
-    def __init__(self):
-        self.active_connections: List[WebSocket] = []
-
-    async def connect(self, websocket: WebSocket):
-        await websocket.accept()
-        self.active_connections.append(websocket)
-        print(f"[Neural Link] Synapse connected: {websocket.client}")
-
-    def disconnect(self, websocket: WebSocket):
-        self.active_connections.remove(websocket)
-        print(f"[Neural Link] Synapse disconnected: {websocket.client}")
-
-    async def broadcast(self, message: Dict):
-        """Send a JSON message to all connected clients."""
-        for connection in self.active_connections:
-            try:
-                await connection.send_json(message)
-            except Exception as e:
-                print(f"[Neural Link] Error broadcasting: {e}")
-
 manager = ConnectionManager()
+telemetry = TelemetryPublisher(manager, packet_type="TELEMETRY")
+terminals = TerminalSessionRegistry(grace=300.0)
 orchestrator = None # Will be initialized on startup
 
-# --- Telemetry Loop ---
-async def telemetry_loop():
-    """
-    Background task to stream hardware stats (CPU/RAM) every 1s.
-    """
-    while True:
-        try:
-            cpu_usage = psutil.cpu_percent(interval=None)
-            ram_usage = psutil.virtual_memory().percent
-            
-            # Mock "Agent Activity" score based on CPU load
-            agent_activity = min(100, int(cpu_usage * 1.5))
-            
-            packet = {
-                "type": "TELEMETRY",
-                "cpu": cpu_usage,
-                "ram": ram_usage,
-                "agents": 3, # Mock for now (Proposer, Critic, Judge)
-                "activity_score": agent_activity
-            }
-            
-            if manager.active_connections:
-                 await manager.broadcast(packet)
-                 
-        except Exception as e:
-            print(f"[Telemtry] Error: {e}")
-            
-        await asyncio.sleep(1)
+async def stream_token(agent: str, token: str):
+    """Forward one generated token to every /ws/brain subscriber."""
+    if manager.active_connections:
+        await manager.broadcast({"type": "TOKEN", "agent": agent, "token": token})
 
 @app.on_event("startup")
 async def startup_event():
-    # Start the telemetry background task
-    asyncio.create_task(telemetry_loop())
+    # Attach to the shared sampler (delta-encoded, adaptive rate)
+    telemetry.start()
     
     # Initialize the Orchestrator (The Brain)
     global orchestrator
     orchestrator = Orchestrator()
     print("[Neural Link] Orchestrator attached to Cortex.")
 
+    # Same process as the brain: thoughts skip HTTP and go straight to the sockets
+    loop = asyncio.get_running_loop()
+    def local_sink(batch):
+        asyncio.run_coroutine_threadsafe(broadcast_thoughts(batch), loop)
+    default_bus().attach_sink(local_sink)
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    telemetry.stop()
+    await terminals.close_all()
+    default_bus().attach_sink(None)
+    # Release pooled keep-alive connections held by the LLM clients
+    await close_async_session()
+    close_sync_session()
+
 @app.websocket("/ws/brain")
 async def websocket_endpoint(websocket: WebSocket):
     await manager.connect(websocket)
+    await telemetry.welcome(websocket)
     try:
         while True:
             # Receive raw text
@@ -110,19 +80,23 @@ async def websocket_endpoint(websocket: WebSocket):
                 message = json.loads(data)
                 
                 # ROUTING Logic
+                if await manager.handle_control(websocket, message):
+                    # SUBSCRIBE / UNSUBSCRIBE: topic filter for this synapse
+                    continue
+
                 if message.get("type") == "CODE_CONTEXT":
                     # Forward to Orchestrator for analysis
                     if orchestrator:
                         response = await orchestrator.process_code_context(message.get("payload", {}))
                         if response:
                              # Send Ghost Text back to editor
-                             await websocket.send_json(response)
+                             await manager.send(websocket, response)
                              
                 elif message.get("type") == "EXECUTE_PROMPT":
                      # Trigger full execution loop
                      prompt = message.get("payload", {}).get("prompt")
                      if orchestrator and prompt:
-                         await orchestrator.construct_feature(prompt)
+                         await orchestrator.construct_feature(prompt, token_callback=stream_token)
 
             except json.JSONDecodeError:
                 # Fallback for plain strings
@@ -132,104 +106,83 @@ async def websocket_endpoint(websocket: WebSocket):
         manager.disconnect(websocket)
 
 # --- TERMINAL BRIDGE (The Hands) ---
+def control_message(data: str) -> Optional[Dict]:
+    """
+    The control frame carried by a terminal text frame, or None for shell input.
+    Only JSON objects tagged {"type": "control"} are control frames, so pasted
+    JSON still reaches the shell.
+    """
+    if not data.startswith('{'):
+        return None
+    try:
+        message = json.loads(data)
+    except json.JSONDecodeError:
+        return None
+    if isinstance(message, dict) and message.get("type") == "control":
+        return message
+    return None
+
 @app.websocket("/ws/terminal")
 async def terminal_endpoint(websocket: WebSocket):
     await websocket.accept()
-    print("[Terminal] Client connected")
-
-    # Spawn PTY
-    # Use 'zsh' as default shell, fallback to 'bash' or 'sh'
-    shell = os.environ.get('SHELL', 'sh')
-    master_fd, slave_fd = pty.openpty()
-    
-    # Create child process
-    pid = os.fork()
-    
-    if pid == 0:
-        # Child process: Set up session leader and file descriptors
-        os.setsid()
-        os.dup2(slave_fd, 0)
-        os.dup2(slave_fd, 1)
-        os.dup2(slave_fd, 2)
-        
-        # Don't need slave_fd anymore in child
-        if slave_fd > 2:
-            os.close(slave_fd)
-            
-        # Execute Shell
-        # Set TERM to xterm-256color for nice formatting
-        os.environ['TERM'] = 'xterm-256color'
-        os.execv(shell, [shell])
-    
-    else:
-        # Parent process: Bridge WebSocket <-> PTY
-        os.close(slave_fd) # Close slave fd in parent
-        
-        loop = asyncio.get_running_loop()
-
-        # Reading from PTY and sending to WebSocket
-        async def read_from_pty():
-            while True:
-                try:
-                    # Non-blocking read from PTY
-                    data = await loop.run_in_executor(None, os.read, master_fd, 1024)
-                    if not data:
-                        break
-                    # Send binary or text to WS
-                    await websocket.send_text(data.decode('utf-8', errors='ignore'))
-                except OSError:
-                    break
-                except Exception as e:
-                    print(f"[Terminal] Read Error: {e}")
-                    break
-        
-        # Reading from WebSocket and writing to PTY
-        async def write_to_pty():
-            try:
-                while True:
-                    data = await websocket.receive_text()
-                    
-                    # Handle Resizing Protocol: {"cols": 80, "rows": 24}
-                    if data.startswith('{') and '"cols"' in data:
-                        try:
-                            resize_cmd = json.loads(data)
-                            if "cols" in resize_cmd and "rows" in resize_cmd:
-                                # Set Terminal Size
-                                rows, cols = resize_cmd["rows"], resize_cmd["cols"]
-                                # struct winsize { unsigned short ws_row; unsigned short ws_col; ... }
-                                winsize = struct.pack("HHHH", rows, cols, 0, 0)
-                                fcntl.ioctl(master_fd, termios.TIOCSWINSZ, winsize)
-                                continue
-                        except:
-                            pass # If not valid json, treat as input (risky but okay for now)
-
-                    # Write input to PTY
-                    os.write(master_fd, data.encode())
-            except WebSocketDisconnect:
-                print("[Terminal] Client disconnected")
-            except Exception as e:
-                print(f"[Terminal] Write Error: {e}")
-        
-        # Run reader and writer concurrently
-        ptemp_reader = asyncio.create_task(read_from_pty())
-        ptemp_writer = asyncio.create_task(write_to_pty())
 
-        # Wait for either to finish (likely WebSocket disconnect or Shell exit)
-        done, pending = await asyncio.wait(
-            [ptemp_reader, ptemp_writer], 
-            return_when=asyncio.FIRST_COMPLETED
-        )
-
-        for task in pending:
-            task.cancel()
-
-        # Cleanup
-        os.close(master_fd)
+    # Binary frames by default; ?mode=text for clients that want decoded text
+    binary = websocket.query_params.get("mode", "binary") != "text"
+
+    # Reattach to ?session=<id> if its shell is still alive, else spawn one
+    session, reattached = terminals.open(websocket.query_params.get("session"))
+    if session is None:
+        await websocket.close(code=1013)  # Too many sessions: try again later
+        return
+    print(f"[Terminal] Client {'reattached to' if reattached else 'opened'} session {session.id}")
+    if binary:
+        # Text frames are control messages; binary frames are PTY output
+        await websocket.send_text(json.dumps({"type": "session", "id": session.id, "reattached": reattached}))
+    await session.attach(websocket, binary)
+
+    # Reading from WebSocket and writing to PTY
+    async def write_to_pty():
         try:
-             os.kill(pid, signal.SIGTERM)
-        except:
-             pass
-        print("[Terminal] Session closed")
+            while True:
+                data = await websocket.receive_text()
+
+                # Control Protocol: {"type": "control", "cols": 80, "rows": 24}
+                # / {"type": "control", "action": "detach_session"} / {"type": "control", "key": "C-b d"}
+                command = control_message(data)
+                if command is not None:
+                    if "cols" in command and "rows" in command:
+                        session.resize(command["rows"], command["cols"])
+                    action = command.get("action") or get_action(command.get("key"))
+                    if action == "detach_session":
+                        return  # Shell keeps running for the grace period
+                    if action == "close_pane":
+                        session.close()
+                        return
+                    continue
+
+                # Write input to PTY
+                await session.write(data.encode())
+        except WebSocketDisconnect:
+            print("[Terminal] Client disconnected")
+        except Exception as e:
+            print(f"[Terminal] Write Error: {e}")
+
+    # Wait for either side to finish (viewer leaves or Shell exit)
+    ptemp_reader = asyncio.create_task(session.closed.wait())
+    ptemp_writer = asyncio.create_task(write_to_pty())
+    done, pending = await asyncio.wait(
+        [ptemp_reader, ptemp_writer],
+        return_when=asyncio.FIRST_COMPLETED
+    )
+    for task in pending:
+        task.cancel()
+
+    # Detach only: the shell survives for a reattach until its grace period ends
+    session.detach(websocket)
+    try:
+        await websocket.close()
+    except Exception:
+        pass  # Already gone
 
 
 # --- API Endpoints to Inject Thoughts ---
@@ -243,20 +196,41 @@ class ThoughtSignal(BaseModel):
     content: str
     role: str = "assistant"
 
+def thought_packet(agent: str, content: str) -> Dict:
+    return {
+        "type": "THOUGHT",
+        "agent": agent,
+        "content": content,
+        "timestamp": psutil.time.time()
+    }
+
+async def broadcast_thoughts(events: List[Dict]):
+    for event in events:
+        await manager.broadcast(thought_packet(event.get("agent", "System"), event.get("content", "")))
+
 @app.post("/api/inject_thought")
 async def inject_thought(signal: ThoughtSignal):
     """
     Called by the AI Brain to stream thoughts to the UI.
     """
-    packet = {
-        "type": "THOUGHT",
-        "agent": signal.agent,
-        "content": signal.content,
-        "timestamp": psutil.time.time()
-    }
-    await manager.broadcast(packet)
+    await manager.broadcast(thought_packet(signal.agent, signal.content))
     return {"status": "broadcasted"}
 
+@app.post("/api/inject_thoughts")
+async def inject_thoughts(signals: List[ThoughtSignal]):
+    """
+    Batched variant used by the event bus: one request per flush.
+    """
+    await broadcast_thoughts([signal.dict() for signal in signals])
+    return {"status": "broadcasted", "count": len(signals)}
+
+@app.get("/api/terminals")
+async def terminal_stats():
+    """
+    Live terminal sessions with per-viewer output counters (bytes in / sent / dropped).
+    """
+    return terminals.stats()
+
 if __name__ == "__main__":
     import uvicorn
     # Run on 8000
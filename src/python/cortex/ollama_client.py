@@ -1,23 +1,81 @@
 
 import json
-import urllib.request
-import urllib.error
+import http.client
+import threading
+import urllib.parse
 import logging
 
+# Raised when a kept-alive connection was closed by the server; retry once on a fresh one
+_STALE_CONNECTION = (
+    http.client.RemoteDisconnected,
+    http.client.CannotSendRequest,
+    http.client.ResponseNotReady,
+    ConnectionResetError,
+    BrokenPipeError,
+)
+
+class OllamaHTTPError(OSError):
+    """Non-2xx status from the Ollama server."""
+
 class OllamaClient:
     """
     A Zero-Dependency Python Client for Ollama.
-    Uses standard library `urllib` to ensure portability without `pip install`.
+    Uses standard library `http.client` to ensure portability without `pip install`.
+    Connections are kept alive and reused (one per thread), so only the first
+    request pays TCP setup.
     """
     def __init__(self, base_url="http://localhost:11434"):
         self.base_url = base_url
         self.logger = logging.getLogger("OllamaClient")
+        parsed = urllib.parse.urlsplit(base_url)
+        self._host = parsed.hostname or "localhost"
+        self._port = parsed.port or 11434
+        self._local = threading.local()
+
+    def _connection(self) -> http.client.HTTPConnection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = http.client.HTTPConnection(self._host, self._port)
+        return conn
+
+    def _reset(self):
+        """Drop this thread's connection (e.g. after a timeout mid-response)."""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def _post(self, path: str, payload: dict, timeout=None) -> http.client.HTTPResponse:
+        """
+        POST `payload` as JSON over the kept-alive connection.
+        The caller must read the response to the end before the next request.
+        """
+        body = json.dumps(payload).encode('utf-8')
+        for attempt in range(2):
+            conn = self._connection()
+            conn.timeout = timeout
+            if conn.sock is not None:
+                conn.sock.settimeout(timeout)
+            try:
+                conn.request("POST", path, body=body, headers={'Content-Type': 'application/json'})
+                response = conn.getresponse()
+            except _STALE_CONNECTION:
+                conn.close()
+                if attempt:
+                    raise
+                continue
+            except OSError:
+                conn.close()
+                raise
+            if response.status >= 400:
+                detail = response.read().decode('utf-8', 'replace')
+                raise OllamaHTTPError(f"HTTP {response.status}: {detail}")
+            return response
 
     def generate(self, model: str, prompt: str, system: str = None, stream: bool = False, format: str = None) -> dict:
         """
         Generate a response from a model.
         """
-        url = f"{self.base_url}/api/generate"
         payload = {
             "model": model,
             "prompt": prompt,
@@ -29,28 +87,16 @@ class OllamaClient:
             payload["format"] = format
 
         try:
-            data = json.dumps(payload).encode('utf-8')
-            req = urllib.request.Request(url, data=data, headers={'Content-Type': 'application/json'})
-            
             # 1-second timeout for rapid failover
-            with urllib.request.urlopen(req, timeout=1) as response:
-                if stream:
-                    # For streaming, we would need a generator. 
-                    # For now, simplistic full read if stream=False logic is implicitly enforced by return type.
-                    # If stream=True, this implementation acts as if it consumes all.
-                    full_response = ""
-                    for line in response:
-                        if line:
-                            obj = json.loads(line)
-                            full_response += obj.get("response", "")
-                            if obj.get("done"):
-                                break
-                    return {"response": full_response, "done": True}
-                else:
-                    body = response.read().decode('utf-8')
-                    return json.loads(body)
+            if stream:
+                text = "".join(self._iter_ndjson("/api/generate", payload, lambda obj: obj.get("response", ""), timeout=1))
+                return {"response": text, "done": True}
+            response = self._post("/api/generate", payload, timeout=1)
+            body = response.read().decode('utf-8')
+            return json.loads(body)
                     
-        except (urllib.error.URLError, TimeoutError) as e:
+        except OSError as e:
+            self._reset()
             self.logger.warning(f"Ollama Connection Failed ({e}). Switching to Simulation Mode.")
             return {
                 "response": f"[Simulated Output] {prompt[:50]}... (Reason: Ollama Offline)",
@@ -58,14 +104,66 @@ class OllamaClient:
                 "mode": "simulated"
             }
         except Exception as e:
+            self._reset()
             self.logger.error(f"Ollama Error: {e}")
             return {"error": str(e)}
 
+    def _iter_ndjson(self, path: str, payload: dict, key, timeout=None):
+        """
+        Yield the text of each chunk of an NDJSON streaming response as it arrives.
+        key(obj) extracts the text from one chunk.
+        """
+        response = self._post(path, payload, timeout=timeout)
+        try:
+            for line in response:
+                if not line.strip():
+                    continue
+                obj = json.loads(line)
+                text = key(obj)
+                if text:
+                    yield text
+                if obj.get("done"):
+                    break
+            response.read()  # Drain so the connection can be reused
+        except BaseException:
+            # Abandoned or failed mid-stream: the connection is unusable
+            self._reset()
+            raise
+
+    def generate_stream(self, model: str, prompt: str, system: str = None, format: str = None):
+        """
+        Generate a response token by token (generator of text chunks).
+        Falls back to a single simulated chunk when Ollama is offline.
+        """
+        payload = {"model": model, "prompt": prompt, "stream": True}
+        if system:
+            payload["system"] = system
+        if format:
+            payload["format"] = format
+        produced = False
+        try:
+            # Same 1-second failover as generate(); applies per read, not to the whole stream
+            for text in self._iter_ndjson("/api/generate", payload, lambda obj: obj.get("response", ""), timeout=1):
+                produced = True
+                yield text
+        except OSError as e:
+            if produced:
+                self.logger.warning(f"Ollama stream interrupted ({e}).")
+                return
+            self.logger.warning(f"Ollama Connection Failed ({e}). Switching to Simulation Mode.")
+            yield f"[Simulated Output] {prompt[:50]}... (Reason: Ollama Offline)"
+
+    def chat_stream(self, model: str, messages: list):
+        """
+        Chat completion token by token (generator of text chunks).
+        """
+        payload = {"model": model, "messages": messages, "stream": True}
+        yield from self._iter_ndjson("/api/chat", payload, lambda obj: obj.get("message", {}).get("content", ""))
+
     def chat(self, model: str, messages: list, stream: bool = False) -> dict:
         """
         Chat completion.
         """
-        url = f"{self.base_url}/api/chat"
         payload = {
             "model": model,
             "messages": messages,
@@ -73,23 +171,13 @@ class OllamaClient:
         }
         
         try:
-            data = json.dumps(payload).encode('utf-8')
-            req = urllib.request.Request(url, data=data, headers={'Content-Type': 'application/json'})
-            
-            with urllib.request.urlopen(req) as response:
-                 if stream:
-                    full_content = ""
-                    for line in response:
-                        if line:
-                            obj = json.loads(line)
-                            if "message" in obj:
-                                full_content += obj["message"].get("content", "")
-                            if obj.get("done"):
-                                break
-                    return {"message": {"role": "assistant", "content": full_content}, "done": True}
-                 else:
-                    body = response.read().decode('utf-8')
-                    return json.loads(body)
+            if stream:
+                text = "".join(self.chat_stream(model, messages))
+                return {"message": {"role": "assistant", "content": text}, "done": True}
+            response = self._post("/api/chat", payload)
+            body = response.read().decode('utf-8')
+            return json.loads(body)
 
-        except urllib.error.URLError as e:
+        except OSError as e:
+            self._reset()
             return {"error": str(e)}
@@ -5,17 +5,31 @@ This module acts as the bridge between the Electron/Node.js orchestrator
 and the Python computational layer. It reads JSON commands from stdin
 and writes JSON responses to stdout.
 
+Commands are dispatched concurrently: CPU-bound actions run in a process
+pool, I/O-bound actions in a thread pool, and PING is answered inline by
+the reader. Responses are written as they complete, so they can arrive
+out of order; callers match them to requests by 'id'.
+
 Copyright 2026 Antigravity Project.
 """
 
+import os
 import sys
 import json
 import logging
+import threading
+import multiprocessing
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
 from typing import Dict, Any, Optional
 
 # Configure logging to stderr to not corrupt stdout JSON stream
 logging.basicConfig(stream=sys.stderr, level=logging.INFO)
 
+# Actions that burn CPU in pure Python: run in worker processes (no GIL contention)
+CPU_ACTIONS = {'MATH_HEAVY', 'ANALYZE_TEXT', 'PREDICT_TREND', 'AUDIT_CODE', 'MATH_EXEC'}
+# Everything else waits on the network, disk or subprocesses: threads are enough
+IO_WORKERS = 8
+
 def process_command(command: Dict[str, Any]) -> Dict[str, Any]:
     """Processes a single command from the orchestrator.
 
@@ -75,27 +89,100 @@ def process_command(command: Dict[str, Any]) -> Dict[str, Any]:
         logging.error(f"Error processing {action}: {e}")
         return {'id': request_id, 'status': 'error', 'error': str(e)}
 
+class Dispatcher:
+    """Runs commands concurrently and writes each response when it completes.
+
+    Args:
+        io_workers: Threads for I/O-bound actions.
+        cpu_workers: Processes for CPU-bound actions (defaults to the core count).
+    """
+
+    def __init__(self, io_workers: int = IO_WORKERS, cpu_workers: Optional[int] = None):
+        self.io_pool = ThreadPoolExecutor(max_workers=io_workers, thread_name_prefix='cortex-io')
+        self.cpu_workers = cpu_workers or os.cpu_count() or 1
+        self.cpu_pool: Optional[ProcessPoolExecutor] = None
+        self.pool_lock = threading.Lock()
+        self.write_lock = threading.Lock()
+        # Fork the worker processes off the reader thread so PING never waits on it
+        threading.Thread(target=self._warm_up, name='cortex-warmup', daemon=True).start()
+
+    def emit(self, response: Dict[str, Any]) -> None:
+        """Writes one JSON response line; safe to call from any thread."""
+        line = json.dumps(response) + '\n'
+        with self.write_lock:
+            sys.stdout.write(line)
+            sys.stdout.flush()
+
+    def _cpu(self) -> ProcessPoolExecutor:
+        with self.pool_lock:
+            if self.cpu_pool is None:
+                # 'spawn': forking while the reader thread sits in stdin can deadlock the child
+                context = multiprocessing.get_context('spawn')
+                self.cpu_pool = ProcessPoolExecutor(max_workers=self.cpu_workers, mp_context=context)
+            return self.cpu_pool
+
+    def _warm_up(self) -> None:
+        try:
+            pool = self._cpu()
+            for future in [pool.submit(os.getpid) for _ in range(self.cpu_workers)]:
+                future.result()
+        except Exception as e:
+            logging.error(f"Process pool warm-up failed: {e}")
+
+    def _pool_for(self, action: Optional[str]):
+        return self._cpu() if action in CPU_ACTIONS else self.io_pool
+
+    def submit(self, command: Dict[str, Any]) -> None:
+        """Answers PING inline; queues everything else on the matching pool."""
+        action = command.get('action')
+        request_id = command.get('id')
+        if action == 'PING':
+            self.emit({'id': request_id, 'status': 'ok', 'result': 'PONG'})
+            return
+
+        try:
+            future = self._pool_for(action).submit(process_command, command)
+        except Exception as e:
+            # e.g. a broken process pool: fall back to a thread
+            logging.error(f"Falling back to thread pool for {action}: {e}")
+            with self.pool_lock:
+                self.cpu_pool = None
+            future = self.io_pool.submit(process_command, command)
+        future.add_done_callback(lambda f: self._done(f, action, request_id))
+
+    def _done(self, future: Future, action: Optional[str], request_id: Any) -> None:
+        try:
+            response = future.result()
+        except Exception as e:
+            logging.error(f"Worker failed on {action}: {e}")
+            response = {'id': request_id, 'status': 'error', 'error': str(e)}
+        self.emit(response)
+
+    def shutdown(self) -> None:
+        """Waits for in-flight commands so every request gets its response."""
+        self.io_pool.shutdown(wait=True)
+        if self.cpu_pool is not None:
+            self.cpu_pool.shutdown(wait=True)
+
+
 def main() -> None:
     """Main event loop listening on stdin."""
     logging.info("Python Cortex Started. Waiting for input...")
-    
+    dispatcher = Dispatcher()
+
     for line in sys.stdin:
         try:
             line = line.strip()
             if not line:
                 continue
-            
-            command = json.loads(line)
-            response = process_command(command)
-            
-            # Print JSON response followed by newline
-            print(json.dumps(response))
-            sys.stdout.flush()
-            
+
+            dispatcher.submit(json.loads(line))
+
         except json.JSONDecodeError:
             logging.error("Failed to decode JSON input.")
-            print(json.dumps({'status': 'error', 'error': 'Invalid JSON'}))
-            sys.stdout.flush()
+            dispatcher.emit({'status': 'error', 'error': 'Invalid JSON'})
+
+    dispatcher.shutdown()
 
 if __name__ == '__main__':
     main()
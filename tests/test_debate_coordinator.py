@@ -0,0 +1,47 @@
+import asyncio
+
+from ecy.intelligence.debate_coordinator import DebateCoordinator
+from ecy.intelligence.model_router import ModelRouter
+from ecy.intelligence.unified_provider import UnifiedIntelligenceProvider
+
+
+class _StubProvider:
+    """Proposer/Judge answer normally; critics answer from *critic_replies*."""
+
+    def __init__(self, critic_replies):
+        self.critic_replies = critic_replies
+        self.calls = []
+
+    async def chat_complete_async(self, model, messages, temperature=0.7):
+        self.calls.append(messages[0]["content"].split("(")[0].strip())
+        if "CRITIC" in messages[0]["content"]:
+            return self.critic_replies[model]
+        return "verdict" if "JUDGE" in messages[0]["content"] else "solution"
+
+
+def _debate(critic_replies, max_turns=2):
+    critics = ModelRouter().get_models_for_role("Critic", len(critic_replies))
+    provider = _StubProvider(dict(zip(critics, critic_replies)))
+    result = asyncio.run(DebateCoordinator(provider=provider).conduct_debate(
+        "query", max_turns=max_turns, num_critics=len(critic_replies)))
+    critiques = [e["content"] for e in result["history"] if e["role"] == "Critic" and e["kind"] == "message"]
+    return result, critiques, provider
+
+
+def test_critic_panel_routes_to_the_cloud():
+    for model in ModelRouter().get_models_for_role("Critic", 10):
+        assert not UnifiedIntelligenceProvider._is_local_model(model), model
+
+
+def test_error_replies_are_not_critiques():
+    result, critiques, _ = _debate(["NO FURTHER OBJECTIONS", "[Error] Failed to connect to Local Cortex: refused"])
+    assert result["rounds_completed"] == 1
+    assert len(critiques) == 1 and "[Error]" not in critiques[0]
+
+
+def test_only_error_replies_leave_the_solution_unchanged():
+    result, critiques, provider = _debate(["[Error] Local Cortex returned status 404", "[Error] timed out"])
+    assert critiques == []
+    assert result["rounds_completed"] == 2
+    # The initial proposal only: no refinement was asked for
+    assert provider.calls.count("You are the PROPOSER") == 1
@@ -0,0 +1,27 @@
+import inspect
+
+from ecy import evolve
+from ecy.intelligence.unified_provider import UnifiedIntelligenceProvider
+
+
+class _StubProvider:
+    """Answers like the real provider, rejecting calls its signature would reject."""
+
+    def __init__(self):
+        self.calls = []
+
+    def chat_complete(self, *args, **kwargs):
+        bound = inspect.signature(UnifiedIntelligenceProvider.chat_complete).bind(self, *args, **kwargs)
+        self.calls.append(bound.arguments)
+        return "```python\nx = 1\n```"
+
+
+def test_propose_evolution_calls_provider_deterministically(tmp_path, monkeypatch):
+    monkeypatch.setattr(evolve, "UnifiedIntelligenceProvider", _StubProvider)
+    source = tmp_path / "module.py"
+    source.write_text("x=1\n", encoding="utf-8")
+    engine = evolve.SelfEvolutionEngine(project_root=str(tmp_path))
+    assert engine.propose_evolution(str(source)) == "x = 1"
+    (call,) = engine.brain.calls
+    assert call["model_alias"] == "openai/gpt-4o"
+    assert call["temperature"] == 0
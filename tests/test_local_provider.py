@@ -0,0 +1,69 @@
+import asyncio
+import http.server
+import socket
+import threading
+
+import pytest
+
+from ecy.intelligence.local_provider import LocalProvider
+from ecy.net import http_pool
+
+
+class _NotJson(http.server.BaseHTTPRequestHandler):
+    def do_GET(self):
+        self._reply(b"ok")
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self._reply(b"not json\n")
+
+    def _reply(self, body):
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def not_json_url():
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), _NotJson)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+
+
+@pytest.fixture
+def dead_url():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    return f"http://127.0.0.1:{port}"
+
+
+def _stream_async(provider):
+    async def collect():
+        try:
+            return [token async for token in provider.stream_chat_async([{"role": "user", "content": "hi"}])]
+        finally:
+            await http_pool.close_async_session()
+    return asyncio.run(collect())
+
+
+def test_malformed_stream_yields_error_instead_of_raising(not_json_url):
+    provider = LocalProvider(base_url=not_json_url)
+    tokens = list(provider.stream_chat([{"role": "user", "content": "hi"}]))
+    assert len(tokens) == 1 and tokens[0].startswith("[Error]")
+    tokens = _stream_async(provider)
+    assert len(tokens) == 1 and tokens[0].startswith("[Error]")
+
+
+def test_connection_failure_is_recorded(dead_url):
+    provider = LocalProvider(base_url=dead_url)
+    failures = []
+    provider.health.record_failure = lambda: failures.append(1)
+    assert list(provider.stream_chat([{"role": "user", "content": "hi"}]))[0].startswith("[Error]")
+    assert _stream_async(provider)[0].startswith("[Error]")
+    assert len(failures) == 2
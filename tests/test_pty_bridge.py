@@ -0,0 +1,59 @@
+import asyncio
+import os
+
+from ecy.net.pty_bridge import PtyBridge, utf8_split
+
+
+def test_utf8_split_holds_only_incomplete_characters():
+    euro = "€".encode()  # e2 82 ac
+    assert utf8_split(b"abc") == 3
+    assert utf8_split(b"abc" + euro) == 6
+    assert utf8_split(b"abc" + euro[:1]) == 3
+    assert utf8_split(b"abc" + euro[:2]) == 3
+    assert utf8_split("😀".encode()[:3]) == 0
+    # Bytes that can never complete a character are not held back
+    assert utf8_split(b"\xff") == 1
+    assert utf8_split(b"abc\xff") == 4
+    assert utf8_split(b"\xc0") == 1
+    assert utf8_split(b"\x80\x80\x80") == 3
+
+
+async def _pump(chunks, settle=0.3):
+    read_fd, write_fd = os.pipe()
+    frames = []
+
+    async def sink(frame):
+        frames.append(frame)
+
+    bridge = PtyBridge(read_fd, sink, binary=True)
+    takes = 0
+    take = bridge._take
+
+    def counting_take(final=False):
+        nonlocal takes
+        takes += 1
+        return take(final)
+
+    bridge._take = counting_take
+    bridge.start()
+    for chunk in chunks:
+        os.write(write_fd, chunk)
+        await asyncio.sleep(0.02)
+    await asyncio.sleep(settle)
+    idle_from = takes
+    await asyncio.sleep(0.3)
+    idle_takes = takes - idle_from
+    bridge.close()
+    os.close(write_fd)
+    return frames, idle_takes
+
+
+def test_every_byte_is_delivered_and_the_loop_goes_idle():
+    euro = "€".encode()
+    chunks = [b"abc\xff", b"x" + euro[:2], euro[2:], b"hello" + euro[:1]]
+    frames, idle_takes = asyncio.run(_pump(chunks))
+    data = b"".join(frames)
+    assert data == b"".join(chunks)
+    # The split character arrived in one frame, not torn across two
+    assert any(euro in frame for frame in frames)
+    assert idle_takes == 0
@@ -0,0 +1,36 @@
+from ecy.intelligence.semantic_cache import SemanticCache
+
+
+class _Archive:
+    def __init__(self, debates):
+        self.debates = debates
+
+    def load_debates(self, limit=1000):
+        return self.debates[-limit:]
+
+
+def test_newest_verdict_replaces_a_matching_entry():
+    cache = SemanticCache()
+    cache.add("What is eCy?", "old verdict")
+    cache.add("what is  eCy?", "new verdict")
+    assert len(cache) == 1
+    assert cache.lookup("WHAT IS ECY?")["final_answer"] == "new verdict"
+
+
+def test_archive_loads_oldest_first_and_keeps_the_newest():
+    archive = _Archive([
+        {"query": "Q one", "final_answer": "first"},
+        {"query": "Q two", "final_answer": "other"},
+        {"query": "q one", "final_answer": "second"},
+    ])
+    cache = SemanticCache(archive)
+    assert len(cache) == 2
+    assert cache.lookup("q one")["final_answer"] == "second"
+    assert cache.lookup("q two")["final_answer"] == "other"
+
+
+def test_index_grows_past_its_initial_capacity():
+    cache = SemanticCache()
+    cache.add_many([f"question {i}" for i in range(40)], [f"verdict {i}" for i in range(40)])
+    assert len(cache) == 40
+    assert cache.lookup("question 37")["final_answer"] == "verdict 37"
@@ -0,0 +1,40 @@
+import asyncio
+
+from ecy.net import terminal_output
+from ecy.net.terminal_output import OutputPipeline
+
+
+async def _deliver(monkeypatch, chunks):
+    frames = []
+    calls = 0
+    split = terminal_output.utf8_split
+
+    def counting_split(data):
+        nonlocal calls
+        calls += 1
+        return split(data)
+
+    monkeypatch.setattr(terminal_output, "utf8_split", counting_split)
+
+    async def send(frame):
+        frames.append(frame)
+
+    pipeline = OutputPipeline(send)
+    for chunk in chunks:
+        pipeline.write(chunk)
+        await asyncio.sleep(0.03)
+    await asyncio.sleep(0.2)
+    idle_from = calls
+    await asyncio.sleep(0.3)
+    idle_calls = calls - idle_from
+    pipeline.close()
+    return frames, idle_calls
+
+
+def test_invalid_and_split_bytes_are_delivered_without_ticking(monkeypatch):
+    euro = "€".encode()
+    chunks = [b"abc\xff", b"x" + euro[:2], euro[2:], b"tail" + euro[:1]]
+    frames, idle_calls = asyncio.run(_deliver(monkeypatch, chunks))
+    assert b"".join(frames) == b"".join(chunks)
+    assert any(euro in frame for frame in frames)
+    assert idle_calls == 0
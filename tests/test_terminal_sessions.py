@@ -0,0 +1,30 @@
+import asyncio
+
+from ecy.net.terminal_sessions import TerminalSessionRegistry
+
+
+def test_watcher_is_kept_and_finished_when_sessions_close():
+    async def run():
+        registry = TerminalSessionRegistry(grace=60.0)
+        session, reattached = registry.open()
+        assert not reattached
+        watcher = session._watcher
+        assert isinstance(watcher, asyncio.Task) and not watcher.done()
+        await registry.close_all()
+        assert watcher.done() and session.finished
+        assert registry.sessions == {}
+
+    asyncio.run(run())
+
+
+def test_session_whose_shell_exits_is_pruned():
+    async def run():
+        registry = TerminalSessionRegistry(grace=60.0)
+        session, _ = registry.open()
+        await session.write(b"exit\n")
+        await asyncio.wait_for(session.closed.wait(), 5)
+        await asyncio.sleep(0)
+        assert session.finished
+        assert registry.stats()["sessions"] == 0
+
+    asyncio.run(run())
@@ -64,20 +64,35 @@ const TerminalPanel: React.FC<TerminalPanelProps> = ({ className, onClose }) =>
         fitAddonRef.current = fitAddon;
 
         // 2. Connect to WebSocket PTY Bridge
-        const ws = new WebSocket('ws://localhost:8000/ws/terminal');
+        // Reattach to the previous shell (survives reloads for the server's grace period)
+        const sessionId = sessionStorage.getItem('ecy.terminal.session');
+        const query = sessionId ? `?session=${encodeURIComponent(sessionId)}` : '';
+        const ws = new WebSocket(`ws://localhost:8000/ws/terminal${query}`);
+        // PTY output arrives as binary UTF-8 frames
+        ws.binaryType = 'arraybuffer';
         wsRef.current = ws;
 
         ws.onopen = () => {
             setIsConnected(true);
             term.writeln('\x1b[32m[SYSTEM] Uplink established. Accessing Neural Shell...\x1b[0m');
             
-            // Send initial resize
-            const dims = { cols: term.cols, rows: term.rows };
+            // Send initial resize (tagged as control so it never reaches the shell as input)
+            const dims = { type: 'control', cols: term.cols, rows: term.rows };
             ws.send(JSON.stringify(dims));
         };
 
         ws.onmessage = (event) => {
-            term.write(event.data);
+            if (typeof event.data === 'string') {
+                // Text frames are control messages, e.g. {"type": "session", "id": "..."}
+                try {
+                    const msg = JSON.parse(event.data);
+                    if (msg.type === 'session') sessionStorage.setItem('ecy.terminal.session', msg.id);
+                } catch {
+                    term.write(event.data);
+                }
+                return;
+            }
+            term.write(new Uint8Array(event.data));
         };
 
         ws.onclose = () => {
@@ -101,7 +116,7 @@ const TerminalPanel: React.FC<TerminalPanelProps> = ({ className, onClose }) =>
         const handleResize = () => {
             fitAddon.fit();
             if (ws.readyState === WebSocket.OPEN) {
-                ws.send(JSON.stringify({ cols: term.cols, rows: term.rows }));
+                ws.send(JSON.stringify({ type: 'control', cols: term.cols, rows: term.rows }));
             }
         };
         window.addEventListener('resize', handleResize);
@@ -123,6 +138,7 @@ const TerminalPanel: React.FC<TerminalPanelProps> = ({ className, onClose }) =>
                 // Send new size to backend
                 if (xtermRef.current && wsRef.current?.readyState === WebSocket.OPEN) {
                      wsRef.current.send(JSON.stringify({ 
+                         type: 'control',
                          cols: xtermRef.current.cols, 
                          rows: xtermRef.current.rows 
                      }));
@@ -1,6 +1,7 @@
 import useWebSocket, { ReadyState } from 'react-use-websocket';
 import { useEffect } from 'react';
 import { useCortexStore } from '../stores';
+import type { Telemetry } from '../stores';
 
 const SOCKET_URL = 'ws://localhost:8000/ws/brain';
 
@@ -64,12 +65,14 @@ export const useBrainLink = () => {
             }
 
             // 3. Telemetry (Backend sends "TELEMETRY")
+            // Packets are deltas: only fields that changed are present
             if (type === 'TELEMETRY') {
-                updateTelemetry({ 
-                    cpu: msg.cpu || 0, 
-                    ram: msg.ram ? `${msg.ram}%` : msg.memory ? `${msg.memory}%` : "0%",
-                    agents: msg.agents || 0
-                });
+                const update: Partial<Telemetry> = {};
+                if (msg.cpu !== undefined) update.cpu = msg.cpu;
+                if (msg.ram !== undefined) update.ram = `${msg.ram}%`;
+                else if (msg.memory !== undefined) update.ram = `${msg.memory}%`;
+                if (msg.agents !== undefined) update.agents = msg.agents;
+                updateTelemetry(update);
             }
 
             // 4. Terminal Output